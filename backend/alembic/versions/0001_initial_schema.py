@@ -0,0 +1,129 @@
+"""initial schema
+
+Matches the tables previously created by Base.metadata.create_all, so
+existing databases are stamped at this revision instead of re-created.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column(
+            "user_type",
+            sa.Enum("COMPANY", "CANDIDATE", "NBFC", "ADMIN", name="usertype"),
+            nullable=False,
+        ),
+        sa.Column("is_verified", sa.Boolean()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "companies",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("company_name", sa.String(), nullable=False),
+        sa.Column("industry", sa.String()),
+        sa.Column(
+            "size",
+            sa.Enum("STARTUP", "SMALL", "MEDIUM", "LARGE", "ENTERPRISE", name="companysize"),
+        ),
+        sa.Column("gstin", sa.String(), unique=True),
+        sa.Column("cin", sa.String(), unique=True),
+        sa.Column("website", sa.String()),
+        sa.Column("address", sa.String()),
+        sa.Column("city", sa.String()),
+        sa.Column("state", sa.String()),
+        sa.Column("country", sa.String()),
+        sa.Column("phone", sa.String()),
+        sa.Column("verified_at", sa.DateTime(timezone=True)),
+        sa.Column("verification_documents", sa.JSON()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_companies_id", "companies", ["id"])
+    op.create_index("ix_companies_company_name", "companies", ["company_name"])
+
+    op.create_table(
+        "candidates",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=False),
+        sa.Column("date_of_birth", sa.Date()),
+        sa.Column("current_company", sa.String()),
+        sa.Column("current_designation", sa.String()),
+        sa.Column("current_ctc", sa.Numeric(12, 2)),
+        sa.Column("notice_period_days", sa.Integer()),
+        sa.Column("skills", sa.JSON()),
+        sa.Column("experience_years", sa.Numeric(4, 1)),
+        sa.Column("highest_education", sa.String()),
+        sa.Column("resume_url", sa.String()),
+        sa.Column("kyc_documents", sa.JSON()),
+        sa.Column("kyc_verified_at", sa.DateTime(timezone=True)),
+        sa.Column("expected_ctc", sa.Numeric(12, 2)),
+        sa.Column("preferred_locations", sa.JSON()),
+        sa.Column("job_type_preference", sa.String()),
+        sa.Column("open_to_buyout", sa.String()),
+        sa.Column("city", sa.String()),
+        sa.Column("state", sa.String()),
+        sa.Column("country", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_candidates_id", "candidates", ["id"])
+    op.create_index("ix_candidates_full_name", "candidates", ["full_name"])
+
+    op.create_table(
+        "nbfc_partners",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("users.id"), nullable=False, unique=True),
+        sa.Column("nbfc_name", sa.String(), nullable=False),
+        sa.Column("license_number", sa.String(), nullable=False, unique=True),
+        sa.Column("website", sa.String()),
+        sa.Column("contact_person", sa.String()),
+        sa.Column("phone", sa.String()),
+        sa.Column("address", sa.String()),
+        sa.Column("city", sa.String()),
+        sa.Column("state", sa.String()),
+        sa.Column("country", sa.String()),
+        sa.Column("interest_rate_min", sa.Numeric(5, 2)),
+        sa.Column("interest_rate_max", sa.Numeric(5, 2)),
+        sa.Column("max_loan_amount", sa.Numeric(12, 2)),
+        sa.Column("min_loan_amount", sa.Numeric(12, 2)),
+        sa.Column("max_tenure_months", sa.String()),
+        sa.Column("min_tenure_months", sa.String()),
+        sa.Column("verified_at", sa.DateTime(timezone=True)),
+        sa.Column("is_active", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_nbfc_partners_id", "nbfc_partners", ["id"])
+    op.create_index("ix_nbfc_partners_nbfc_name", "nbfc_partners", ["nbfc_name"])
+
+
+def downgrade() -> None:
+    op.drop_table("nbfc_partners")
+    op.drop_table("candidates")
+    op.drop_table("companies")
+    op.drop_table("users")
+    sa.Enum(name="companysize").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="usertype").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""candidate search indexes
+
+Backs GET /companies/candidates/search: the keyset order (created_at, id),
+the city filter under that order, notice/experience ranges, expected CTC
+and, on Postgres, a GIN index for skills containment.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_candidates_created_at_id", "candidates",
+        [sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_candidates_city_created_at_id", "candidates",
+        ["city", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index("ix_candidates_notice_experience", "candidates", ["notice_period_days", "experience_years"])
+    op.create_index("ix_candidates_expected_ctc", "candidates", ["expected_ctc"])
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX ix_candidates_skills_gin "
+            "ON candidates USING gin ((skills::jsonb) jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_candidates_skills_gin")
+    op.drop_index("ix_candidates_expected_ctc", table_name="candidates")
+    op.drop_index("ix_candidates_notice_experience", table_name="candidates")
+    op.drop_index("ix_candidates_city_created_at_id", table_name="candidates")
+    op.drop_index("ix_candidates_created_at_id", table_name="candidates")
@@ -0,0 +1,35 @@
+"""candidate text search
+
+Trigram index for fuzzy search over candidate name, designation and
+company (GET /companies/candidates/text-search). Postgres only; the
+indexed expression must match SEARCH_DOCUMENT in
+app/services/candidate_text_search.py.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute(
+        "CREATE INDEX ix_candidates_search_trgm ON candidates USING gin ("
+        "(coalesce(candidates.full_name, '') || ' ' || "
+        "coalesce(candidates.current_designation, '') || ' ' || "
+        "coalesce(candidates.current_company, '')) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP INDEX IF EXISTS ix_candidates_search_trgm")
@@ -0,0 +1,63 @@
+"""candidate facet counts
+
+Per-combination candidate counts behind GET /companies/candidates/facets,
+backfilled from the existing candidates. The bucket boundaries must match
+app/services/candidate_facets.py.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "candidate_facet_counts",
+        sa.Column("city", sa.String(), primary_key=True),
+        sa.Column("notice_bucket", sa.String(), primary_key=True),
+        sa.Column("experience_band", sa.String(), primary_key=True),
+        sa.Column("open_to_buyout", sa.String(), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        """
+        INSERT INTO candidate_facet_counts (city, notice_bucket, experience_band, open_to_buyout, count)
+        SELECT city, notice_bucket, experience_band, open_to_buyout, count(*)
+        FROM (
+            SELECT
+                coalesce(nullif(trim(city), ''), 'unknown') AS city,
+                CASE
+                    WHEN notice_period_days IS NULL THEN 'unknown'
+                    WHEN notice_period_days <= 0 THEN '0'
+                    WHEN notice_period_days <= 30 THEN '30'
+                    WHEN notice_period_days <= 60 THEN '60'
+                    ELSE '90+'
+                END AS notice_bucket,
+                CASE
+                    WHEN experience_years IS NULL THEN 'unknown'
+                    WHEN experience_years < 2 THEN '0-2'
+                    WHEN experience_years < 5 THEN '2-5'
+                    WHEN experience_years < 10 THEN '5-10'
+                    ELSE '10+'
+                END AS experience_band,
+                CASE
+                    WHEN open_to_buyout IN ('yes', 'true', 'True', '1') THEN 'yes'
+                    WHEN open_to_buyout IN ('no', 'false', 'False', '0') THEN 'no'
+                    ELSE 'unknown'
+                END AS open_to_buyout
+            FROM candidates
+        ) AS cells
+        GROUP BY city, notice_bucket, experience_band, open_to_buyout
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("candidate_facet_counts")
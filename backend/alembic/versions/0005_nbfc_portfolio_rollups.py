@@ -0,0 +1,98 @@
+"""loans, repayments and NBFC portfolio rollups
+
+The loans and loan_repayments tables from the spec, and the per-NBFC
+daily rollups behind GET /nbfc/portfolio-analytics with the watermark
+their incremental refresh starts from. The rollups start empty; the
+first refresh builds them (or run `python init_db.py --rebuild-portfolio`).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "loans",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("nbfc_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("nbfc_partners.id"), nullable=False),
+        sa.Column("candidate_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("candidates.id"), nullable=False),
+        sa.Column("principal_amount", sa.Numeric(12, 2), nullable=False),
+        sa.Column("interest_rate", sa.Numeric(5, 2), nullable=False),
+        sa.Column("tenure_months", sa.Integer(), nullable=False),
+        sa.Column("emi_amount", sa.Numeric(12, 2)),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("disbursement_date", sa.Date()),
+        sa.Column("first_emi_date", sa.Date()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_loans_id", "loans", ["id"])
+    op.create_index("ix_loans_nbfc_disbursement_date", "loans", ["nbfc_id", "disbursement_date"])
+    op.create_index("ix_loans_updated_at", "loans", ["updated_at"])
+
+    op.create_table(
+        "loan_repayments",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("loan_id", postgresql.UUID(as_uuid=True), sa.ForeignKey("loans.id"), nullable=False),
+        sa.Column("emi_number", sa.Integer(), nullable=False),
+        sa.Column("due_date", sa.Date(), nullable=False),
+        sa.Column("paid_date", sa.Date()),
+        sa.Column("amount_due", sa.Numeric(12, 2), nullable=False),
+        sa.Column("interest_due", sa.Numeric(12, 2), nullable=False),
+        sa.Column("amount_paid", sa.Numeric(12, 2)),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("payment_method", sa.String()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_loan_repayments_id", "loan_repayments", ["id"])
+    op.create_index("ix_loan_repayments_loan_id_emi_number", "loan_repayments", ["loan_id", "emi_number"], unique=True)
+    op.create_index("ix_loan_repayments_due_date", "loan_repayments", ["due_date"])
+    op.create_index("ix_loan_repayments_updated_at", "loan_repayments", ["updated_at"])
+
+    op.create_table(
+        "nbfc_portfolio_daily",
+        sa.Column("nbfc_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        *(
+            sa.Column(name, sa.Integer(), nullable=False, server_default="0")
+            for name in ("loans_disbursed", "loans_closed", "loans_defaulted")
+        ),
+        *(
+            sa.Column(name, sa.BigInteger(), nullable=False, server_default="0")
+            for name in (
+                "principal_disbursed", "principal_defaulted", "amount_due", "amount_collected",
+                "amount_outstanding", "principal_collected", "interest_income", "defaulted_due",
+                "defaulted_collected",
+            )
+        ),
+    )
+
+    op.create_table(
+        "rollup_watermarks",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("watermark", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("rollup_watermarks")
+    op.drop_table("nbfc_portfolio_daily")
+    op.drop_index("ix_loan_repayments_updated_at", table_name="loan_repayments")
+    op.drop_index("ix_loan_repayments_due_date", table_name="loan_repayments")
+    op.drop_index("ix_loan_repayments_loan_id_emi_number", table_name="loan_repayments")
+    op.drop_index("ix_loan_repayments_id", table_name="loan_repayments")
+    op.drop_table("loan_repayments")
+    op.drop_index("ix_loans_updated_at", table_name="loans")
+    op.drop_index("ix_loans_nbfc_disbursement_date", table_name="loans")
+    op.drop_index("ix_loans_id", table_name="loans")
+    op.drop_table("loans")
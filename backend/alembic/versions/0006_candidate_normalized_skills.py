@@ -0,0 +1,67 @@
+"""candidate normalized skills
+
+candidates.skills_normalized holds the candidate's skills lower-cased with
+whitespace collapsed (app.core.skills.normalize_skills), never NULL, so SQL
+skill filters match the same candidates as the in-memory skills index,
+including under NOT. Backfilled from skills; on Postgres the GIN index
+for skill containment moves from skills to it.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.skills import normalize_skills
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    op.add_column(
+        "candidates",
+        sa.Column("skills_normalized", sa.JSON(), nullable=False, server_default="[]"),
+    )
+
+    bind = op.get_bind()
+    candidates = sa.table(
+        "candidates",
+        sa.column("id"),
+        sa.column("skills", sa.JSON()),
+        sa.column("skills_normalized", sa.JSON()),
+    )
+    rows = bind.execute(sa.select(candidates.c.id, candidates.c.skills)).all()
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = [
+            {"candidate_id": row.id, "normalized": normalize_skills(row.skills)}
+            for row in rows[start:start + BATCH_SIZE]
+        ]
+        bind.execute(
+            candidates.update()
+            .where(candidates.c.id == sa.bindparam("candidate_id"))
+            .values(skills_normalized=sa.bindparam("normalized", type_=sa.JSON())),
+            batch,
+        )
+
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_candidates_skills_gin")
+        op.execute(
+            "CREATE INDEX ix_candidates_skills_normalized_gin "
+            "ON candidates USING gin ((skills_normalized::jsonb) jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_candidates_skills_normalized_gin")
+        op.execute(
+            "CREATE INDEX ix_candidates_skills_gin "
+            "ON candidates USING gin ((skills::jsonb) jsonb_path_ops)"
+        )
+    op.drop_column("candidates", "skills_normalized")
@@ -0,0 +1,30 @@
+"""portfolio principal repaid
+
+nbfc_portfolio_daily.principal_repaid totals the principal repaid on the
+loans disbursed that day, so outstanding principal subtracts repayments
+of the same loans it counts as disbursed. Clearing the watermark makes
+the next refresh rebuild every row, filling the column.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "nbfc_portfolio_daily",
+        sa.Column("principal_repaid", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.execute("DELETE FROM rollup_watermarks WHERE name = 'nbfc_portfolio'")
+
+
+def downgrade() -> None:
+    op.drop_column("nbfc_portfolio_daily", "principal_repaid")
@@ -1,6 +1,6 @@
 """
 API package - exports all routers
 """
-from app.api import auth, companies, candidates, nbfc
+from app.api import auth, companies, candidates, loans, nbfc
 
-__all__ = ["auth", "companies", "candidates", "nbfc"]
+__all__ = ["auth", "companies", "candidates", "loans", "nbfc"]
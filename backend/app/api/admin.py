@@ -1,14 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Dict, Any
 
-from app.core.database import get_db
-from app.core.security import get_password_hash
+from app.api.auth import get_current_principal
+from app.core.config import settings
+from app.core.database import get_db, get_read_db, get_pool_stats, replica_router
+from app.core.security import get_password_hash_async
+from app.core.principal_cache import principal_cache_stats
+from app.core.profile_cache import profile_cache_stats
+from app.core.responses import FastJSONRoute
+from app.core.security import token_cache
+from app.core.throttle import login_throttle
 from app.models import User, Company, Candidate, NBFCPartner, UserType
 from app.models.company import CompanySize
+from app.services.amortization import schedule_cache
+from app.services.bulk_import import import_users, parse_csv, parse_ndjson
+from app.services.candidate_facets import rebuild_facet_counts
+from app.services.loan_offers import offer_index
+from app.services.matching import match_pool
+from app.services.portfolio_rollups import rebuild_portfolio_rollups
+from app.services.skills_index import skills_index
 
-router = APIRouter(prefix="/admin", tags=["Admin"])
+router = APIRouter(prefix="/admin", tags=["Admin"], route_class=FastJSONRoute)
 
 
 @router.post("/cleanup-orphaned", response_model=Dict[str, Any])
@@ -28,6 +42,7 @@ async def cleanup_orphaned_profiles(db: AsyncSession = Depends(get_db)):
         deleted_nbfcs = nbfc_result.fetchall()
         
         await db.commit()
+        await rebuild_facet_counts(db)
         
         return {
             "message": "Orphaned profiles cleaned up",
@@ -119,7 +134,7 @@ async def test_user_creation(db: AsyncSession = Depends(get_db)):
     try:
         # Try to create just one admin user
         test_password = "test123"
-        password_hash = get_password_hash(test_password)
+        password_hash = await get_password_hash_async(test_password)
         
         test_user = User(
             email="test@90tozero.com",
@@ -158,6 +173,10 @@ async def force_seed_simple(db: AsyncSession = Depends(get_db)):
         from sqlalchemy import text
         
         # First clean everything
+        await db.execute(text("DELETE FROM loan_repayments"))
+        await db.execute(text("DELETE FROM loans"))
+        await db.execute(text("DELETE FROM nbfc_portfolio_daily"))
+        await db.execute(text("DELETE FROM rollup_watermarks"))
         await db.execute(text("DELETE FROM companies"))
         await db.execute(text("DELETE FROM candidates"))
         await db.execute(text("DELETE FROM nbfc_partners"))
@@ -193,7 +212,7 @@ async def force_seed_simple(db: AsyncSession = Depends(get_db)):
         # Create users only first
         for user_data in demo_users:
             try:
-                password_hash = get_password_hash(user_data["password"])
+                password_hash = await get_password_hash_async(user_data["password"])
                 
                 user = User(
                     email=user_data["email"],
@@ -284,6 +303,7 @@ async def force_seed_simple(db: AsyncSession = Depends(get_db)):
                 user_info["profile_error"] = str(e)
         
         await db.commit()
+        await rebuild_facet_counts(db)
         
         return {
             "message": f"Simple force-created {len(created_users)} demo users",
@@ -375,7 +395,7 @@ async def force_seed_demo_users(db: AsyncSession = Depends(get_db)):
         
         for user_data in demo_users:
             try:
-                password_hash = get_password_hash(user_data["password"])
+                password_hash = await get_password_hash_async(user_data["password"])
                 
                 user = User(
                     email=user_data["email"],
@@ -481,6 +501,7 @@ async def force_seed_demo_users(db: AsyncSession = Depends(get_db)):
                 continue
         
         await db.commit()
+        await rebuild_facet_counts(db)
         
         return {
             "message": f"Force-created {len(created_users)} demo users",
@@ -543,7 +564,7 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
                 print(f"Creating user: {user_data['email']}")
                 
                 # Hash password safely
-                password_hash = get_password_hash(user_data["password"])
+                password_hash = await get_password_hash_async(user_data["password"])
                 print(f"Password hashed successfully for {user_data['email']}")
                 
                 user = User(
@@ -579,6 +600,7 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
                 continue
         
         await db.commit()
+        await rebuild_facet_counts(db)
         
         response = {
             "message": f"Successfully created {len(created_users)} users",
@@ -597,8 +619,74 @@ async def seed_database(db: AsyncSession = Depends(get_db)):
         )
 
 
+@router.post("/users/bulk", response_model=Dict[str, Any])
+async def bulk_import_users(
+    request: Request,
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Bulk create users (and optionally their profiles) from CSV or NDJSON.
+    
+    Admin only. Send the file as the request body with Content-Type text/csv
+    or application/x-ndjson. Invalid rows are reported and skipped.
+    """
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can bulk import users"
+        )
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    body = (await request.body()).decode("utf-8-sig")
+    
+    if content_type == "text/csv":
+        rows = parse_csv(body)
+    elif content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        rows = parse_ndjson(body)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson"
+        )
+    
+    return await import_users(db, rows, batch_size=settings.BULK_IMPORT_BATCH_SIZE)
+
+
+@router.post("/facets/rebuild", response_model=Dict[str, Any])
+async def rebuild_candidate_facets(
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recount candidate facet counts from the candidates table (admin only)"""
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can rebuild candidate facets"
+        )
+    
+    rows = await rebuild_facet_counts(db)
+    return {"message": "Candidate facet counts rebuilt", "rows": rows}
+
+
+@router.post("/portfolio/rebuild", response_model=Dict[str, Any])
+async def rebuild_nbfc_portfolio_rollups(
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_db)
+):
+    """Recompute NBFC portfolio rollups from the loans and repayments tables (admin only)"""
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can rebuild portfolio rollups"
+        )
+    
+    rows = await rebuild_portfolio_rollups(db)
+    return {"message": "NBFC portfolio rollups rebuilt", "rows": rows}
+
+
 @router.get("/users/count", response_model=Dict[str, int])
-async def get_user_counts(db: AsyncSession = Depends(get_db)):
+async def get_user_counts(db: AsyncSession = Depends(get_read_db)):
     """Get count of users by type"""
     try:
         result = await db.execute(select(User.user_type, func.count(User.id)).group_by(User.user_type))
@@ -615,4 +703,52 @@ async def get_user_counts(db: AsyncSession = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get user counts: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats(current_user: User = Depends(get_current_principal)):
+    """Get hit/miss counters for the application caches (admin only)"""
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can view cache statistics"
+        )
+    
+    return {
+        "principal": principal_cache_stats(),
+        "profile": profile_cache_stats(),
+        "token": token_cache.stats(),
+        "skills_index": skills_index.stats(),
+        "match_pool": match_pool.stats(),
+        "loan_schedule": schedule_cache.stats(),
+        "loan_offers": offer_index.stats()
+    }
+
+
+@router.get("/throttle/stats", response_model=Dict[str, Any])
+async def get_throttle_stats(current_user: User = Depends(get_current_principal)):
+    """Get counters for throttled login attempts (admin only)"""
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can view throttle statistics"
+        )
+    
+    if login_throttle is None:
+        return {"login": None}
+    return {"login": login_throttle.stats()}
+
+
+@router.get("/db/pool", response_model=Dict[str, Any])
+async def get_db_pool_stats(current_user: User = Depends(get_current_principal)):
+    """Get connection pool and read replica statistics (admin only)"""
+    if current_user.user_type != UserType.ADMIN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admin users can view database pool statistics"
+        )
+    
+    return {
+        **get_pool_stats(),
+        "replicas": replica_router.stats()
+    }
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Optional
 from uuid import UUID
 
-from app.core.database import get_db
+from app.core.database import get_db, insert_if_absent, replica_router
+from app.core.responses import FastJSONRoute
 from app.core.security import (
-    verify_password,
-    get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token
 )
+from app.core.config import settings
+from app.core.principal_cache import get_cached_user, cache_user
+from app.core.revocation import current_token_version, is_token_revoked
+from app.core.throttle import login_throttle
 from app.models import User, UserType
 from app.schemas.user import (
     UserCreate,
@@ -22,7 +28,7 @@ from app.schemas.user import (
     TokenRefresh
 )
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=FastJSONRoute)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
 
@@ -32,18 +38,34 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     return result.scalar_one_or_none()
 
 
+def access_token_claims(user: User) -> dict:
+    """Claims for a user's access token (role claims only when ACCESS_TOKEN_CLAIMS is on)"""
+    claims = {"sub": str(user.id)}
+    if settings.ACCESS_TOKEN_CLAIMS:
+        claims.update({
+            "user_type": user.user_type.value,
+            "is_active": user.is_active,
+            "ver": current_token_version()
+        })
+    return claims
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Get current authenticated user"""
+    return await _load_user(decode_token(token), db)
+
+
+async def _load_user(payload: Optional[dict], db: AsyncSession) -> User:
+    """User named by a decoded token's sub claim, from the principal cache or the database"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_token(token)
     if payload is None:
         raise credentials_exception
     
@@ -57,42 +79,114 @@ async def get_current_user(
     except (ValueError, AttributeError):
         raise credentials_exception
     
+    user = await get_cached_user(user_id)
+    if user is not None:
+        return user
+    
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
         raise credentials_exception
     
+    await cache_user(user)
     return user
 
 
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Get current user from the token's signed claims without a database query.
+    
+    The returned User is detached and only carries id, user_type and is_active.
+    Tokens issued without claims fall back to get_current_user's lookup,
+    reusing the payload decoded here.
+    """
+    payload = decode_token(token)
+    if payload is None or payload.get("type") != "access" or "user_type" not in payload:
+        return await _load_user(payload, db)
+    
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    try:
+        user_id = UUID(payload.get("sub"))
+        user_type = UserType(payload["user_type"])
+    except (ValueError, TypeError, AttributeError):
+        raise credentials_exception
+    
+    if not payload.get("is_active") or await is_token_revoked(str(user_id), payload.get("ver")):
+        raise credentials_exception
+    
+    return User(id=user_id, user_type=user_type, is_active=True)
+
+
+async def get_user_read_db(current_user: User = Depends(get_current_principal)) -> AsyncSession:
+    """
+    Read-only session for the current user's own data.
+    
+    Uses a read replica unless the user wrote recently, so a read right after
+    a PUT still sees the new values.
+    """
+    pin_primary = await replica_router.wrote_recently(current_user.id)
+    async with replica_router.session_maker(pin_primary)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
 async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
-    """Register a new user"""
-    # Check if user already exists
-    existing_user = await get_user_by_email(db, user_data.email)
-    if existing_user:
+    """
+    Register a new user.
+    
+    Duplicate emails are looked up before the password is hashed: the SELECT
+    is one extra round trip (about a millisecond) for new users, while
+    hashing first would spend ~200 ms of bcrypt CPU on every duplicate. The
+    response says when an email is taken anyway, so there is no timing to
+    hide. The insert still skips an email registered since the check.
+    """
+    existing = await db.execute(select(User.id).where(User.email == user_data.email))
+    if existing.first() is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create new user
-    hashed_password = get_password_hash(user_data.password)
-    new_user = User(
-        email=user_data.email,
-        password_hash=hashed_password,
-        user_type=user_data.user_type,
-        is_verified=False,
-        is_active=True
+    # Create new user; an email registered since the check makes the RETURNING come back empty
+    hashed_password = await get_password_hash_async(user_data.password)
+    result = await db.execute(
+        insert_if_absent(
+            db,
+            User,
+            {
+                "email": user_data.email,
+                "password_hash": hashed_password,
+                "user_type": user_data.user_type,
+                "is_verified": False,
+                "is_active": True
+            },
+            User.email
+        )
     )
+    new_user = result.scalar_one_or_none()
+    
+    if new_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
-    db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
     
     # Generate tokens
-    access_token = create_access_token(data={"sub": str(new_user.id)})
+    access_token = create_access_token(data=access_token_claims(new_user))
     refresh_token = create_refresh_token(data={"sub": str(new_user.id)})
     
     user_response = UserResponse.model_validate(new_user)
@@ -105,11 +199,22 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
+async def login(credentials: UserLogin, request: Request, db: AsyncSession = Depends(get_db)):
     """Login user and return tokens"""
+    # Reject throttled clients before any database or bcrypt work
+    if login_throttle is not None:
+        client_ip = request.client.host if request.client else None
+        retry_after = await login_throttle.check(client_ip, credentials.email)
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please try again later",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))}
+            )
+    
     # Find user
     user = await get_user_by_email(db, credentials.email)
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await verify_password_async(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -121,8 +226,13 @@ async def login(credentials: UserLogin, db: AsyncSession = Depends(get_db)):
             detail="User account is inactive"
         )
     
+    # Upgrade (or downgrade) hashes made with a different bcrypt cost
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await get_password_hash_async(credentials.password)
+        await db.commit()
+    
     # Generate tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=access_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     user_response = UserResponse.model_validate(user)
@@ -156,7 +266,7 @@ async def refresh_token(token_data: TokenRefresh, db: AsyncSession = Depends(get
         )
     
     # Generate new tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=access_token_claims(user))
     new_refresh_token = create_refresh_token(data={"sub": str(user.id)})
     
     user_response = UserResponse.model_validate(user)
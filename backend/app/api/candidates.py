@@ -1,26 +1,42 @@
+import json
+
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from decimal import Decimal
+from sqlalchemy import select, update
 
-from app.core.database import get_db
-from app.api.auth import get_current_user
+from app.core.database import get_db, insert_if_absent, replica_router
+from app.api.auth import get_current_principal, get_user_read_db
+from app.core.profile_cache import fill_profile, get_cached_profile, store_profile
+from app.core.skills import normalize_skills
+from app.core.responses import FastJSONRoute
 from app.models import User, Candidate, UserType
+from app.services.candidate_facets import (
+    SOURCE_COLUMNS as FACET_SOURCE_COLUMNS,
+    SOURCE_FIELDS as FACET_SOURCE_FIELDS,
+    apply_facet_change,
+    facet_cell,
+    invalidate_facet_cache
+)
+from app.services.loan_math import buyout_quote_batch, calculate_buyout_paise, format_paise_array
+from app.services.matching import match_pool
+from app.services.skills_index import skills_index
 from app.schemas.candidate import (
     CandidateCreate,
     CandidateUpdate,
     CandidateResponse,
     BuyoutCalculation,
-    BuyoutCalculationResponse
+    BuyoutCalculationResponse,
+    BuyoutBatchRequest
 )
 
-router = APIRouter(prefix="/candidates", tags=["Candidates"])
+router = APIRouter(prefix="/candidates", tags=["Candidates"], route_class=FastJSONRoute)
 
 
 @router.post("/profile", response_model=CandidateResponse, status_code=status.HTTP_201_CREATED)
 async def create_candidate_profile(
     candidate_data: CandidateCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create candidate profile"""
@@ -30,35 +46,39 @@ async def create_candidate_profile(
             detail="Only candidate users can create candidate profiles"
         )
     
-    # Check if profile already exists
+    # Create profile; the unique user_id turns a duplicate into an empty RETURNING
     result = await db.execute(
-        select(Candidate).where(Candidate.user_id == current_user.id)
+        insert_if_absent(
+            db,
+            Candidate,
+            {"user_id": current_user.id, **candidate_data.model_dump()},
+            Candidate.user_id
+        )
     )
-    existing_profile = result.scalar_one_or_none()
+    candidate = result.scalar_one_or_none()
     
-    if existing_profile:
+    if candidate is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Candidate profile already exists"
         )
     
-    # Create profile
-    candidate = Candidate(
-        user_id=current_user.id,
-        **candidate_data.model_dump()
-    )
-    
-    db.add(candidate)
+    await apply_facet_change(db, None, facet_cell(candidate))
     await db.commit()
-    await db.refresh(candidate)
+    await replica_router.mark_write(current_user.id)
+    invalidate_facet_cache()
+    skills_index.upsert(candidate.id, candidate.skills)
+    match_pool.upsert(candidate)
     
-    return CandidateResponse.model_validate(candidate)
+    response = CandidateResponse.model_validate(candidate)
+    await store_profile("candidate", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.get("/profile", response_model=CandidateResponse)
 async def get_candidate_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """Get candidate profile"""
     if current_user.user_type != UserType.CANDIDATE:
@@ -67,6 +87,10 @@ async def get_candidate_profile(
             detail="Only candidate users can access candidate profiles"
         )
     
+    cached = await get_cached_profile("candidate", current_user.id)
+    if cached is not None:
+        return CandidateResponse.model_validate(cached)
+    
     result = await db.execute(
         select(Candidate).where(Candidate.user_id == current_user.id)
     )
@@ -78,13 +102,15 @@ async def get_candidate_profile(
             detail="Candidate profile not found"
         )
     
-    return CandidateResponse.model_validate(candidate)
+    response = CandidateResponse.model_validate(candidate)
+    await fill_profile("candidate", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.put("/profile", response_model=CandidateResponse)
 async def update_candidate_profile(
     candidate_data: CandidateUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update candidate profile"""
@@ -94,9 +120,34 @@ async def update_candidate_profile(
             detail="Only candidate users can update candidate profiles"
         )
     
-    result = await db.execute(
-        select(Candidate).where(Candidate.user_id == current_user.id)
-    )
+    # Update and read back the row in one statement
+    update_data = candidate_data.model_dump(exclude_unset=True)
+    
+    # Facet counts need the old values; lock the row so concurrent updates move it once
+    old_facet_cell = None
+    if FACET_SOURCE_FIELDS.intersection(update_data):
+        result = await db.execute(
+            select(*FACET_SOURCE_COLUMNS)
+            .where(Candidate.user_id == current_user.id)
+            .with_for_update()
+        )
+        old_row = result.one_or_none()
+        old_facet_cell = facet_cell(old_row) if old_row else None
+    
+    if "skills" in update_data:
+        update_data["skills_normalized"] = normalize_skills(update_data["skills"])
+    
+    if update_data:
+        statement = (
+            update(Candidate)
+            .where(Candidate.user_id == current_user.id)
+            .values(**update_data)
+            .returning(Candidate)
+        )
+    else:
+        statement = select(Candidate).where(Candidate.user_id == current_user.id)
+    
+    result = await db.execute(statement)
     candidate = result.scalar_one_or_none()
     
     if not candidate:
@@ -105,26 +156,98 @@ async def update_candidate_profile(
             detail="Candidate profile not found"
         )
     
-    # Update fields
-    update_data = candidate_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(candidate, field, value)
-    
+    if old_facet_cell is not None:
+        await apply_facet_change(db, old_facet_cell, facet_cell(candidate))
     await db.commit()
-    await db.refresh(candidate)
+    await replica_router.mark_write(current_user.id)
+    if old_facet_cell is not None:
+        invalidate_facet_cache()
+    skills_index.upsert(candidate.id, candidate.skills)
+    match_pool.upsert(candidate)
     
-    return CandidateResponse.model_validate(candidate)
+    response = CandidateResponse.model_validate(candidate)
+    await store_profile("candidate", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.post("/calculate-buyout", response_model=BuyoutCalculationResponse)
 async def calculate_buyout(calculation: BuyoutCalculation):
     """Calculate buyout amount based on salary and notice period"""
-    daily_salary = calculation.current_monthly_salary / Decimal("30")
-    buyout_amount = daily_salary * Decimal(str(calculation.notice_period_days))
+    buyout_amount, daily_salary = calculate_buyout_paise(
+        calculation.current_monthly_salary, calculation.notice_period_days
+    )
     
     return BuyoutCalculationResponse(
-        buyout_amount=round(buyout_amount, 2),
+        buyout_amount=buyout_amount,
         notice_period_days=calculation.notice_period_days,
         monthly_salary=calculation.current_monthly_salary,
-        daily_salary=round(daily_salary, 2)
+        daily_salary=daily_salary
     )
+
+
+BATCH_CHUNK_ROWS = 2000
+
+
+def _buyout_batch_lines(request: BuyoutBatchRequest):
+    rows = request.rows
+    tenures = request.tenures
+    quotes = buyout_quote_batch(
+        [row.current_monthly_salary for row in rows],
+        [row.notice_period_days for row in rows],
+        tenures,
+        request.annual_interest_rate
+    )
+    interest = quotes["emi"] * tenures - quotes["buyout"][:, None]
+    ratios = quotes["emi_ratio"].round(4)
+
+    for start in range(0, len(rows), BATCH_CHUNK_ROWS):
+        chunk = slice(start, start + BATCH_CHUNK_ROWS)
+        # One list of rendered EMI options per tenure, joined row-wise below
+        options = []
+        for column, months in enumerate(tenures):
+            ratio = ["null" if value != value else str(value) for value in ratios[chunk, column].tolist()]
+            affordable = ["true" if value else "false" for value in quotes["affordable"][chunk, column].tolist()]
+            options.append([
+                f'{{"tenure_months":{months},"emi":"{emi}","total_interest":"{total}",'
+                f'"emi_to_salary":{share},"affordable":{fits}}}'
+                for emi, total, share, fits in zip(
+                    format_paise_array(quotes["emi"][chunk, column]),
+                    format_paise_array(interest[chunk, column]),
+                    ratio,
+                    affordable
+                )
+            ])
+        yield "".join(
+            f'{{"ref":{json.dumps(row.ref)},"buyout_amount":"{buyout}",'
+            f'"notice_period_days":{row.notice_period_days},'
+            f'"monthly_salary":"{row.current_monthly_salary}",'
+            f'"daily_salary":"{daily}","emi_options":[{",".join(row_options)}]}}\n'
+            for row, buyout, daily, row_options in zip(
+                rows[chunk],
+                format_paise_array(quotes["buyout"][chunk]),
+                format_paise_array(quotes["daily"][chunk]),
+                zip(*options)
+            )
+        )
+
+
+@router.post("/calculate-buyout/batch")
+async def calculate_buyout_batch(
+    request: BuyoutBatchRequest,
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Calculate buyouts for up to 100,000 candidates, with the EMI of financing
+    each buyout over every requested tenure.
+
+    Company and admin users only. Streams one JSON object per input row
+    (application/x-ndjson), in input order. Amounts match /calculate-buyout
+    to the paisa.
+    """
+    if current_user.user_type not in (UserType.COMPANY, UserType.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only company and admin users can calculate buyouts in batch"
+        )
+    
+    return StreamingResponse(_buyout_batch_lines(request), media_type="application/x-ndjson")
@@ -1,19 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.core.database import get_db
-from app.api.auth import get_current_user
-from app.models import User, Company, UserType
+from app.core.database import get_db, get_read_db, insert_if_absent, replica_router
+from app.api.auth import get_current_principal, get_user_read_db
+from app.core.profile_cache import fill_profile, get_cached_profile, store_profile
+from app.core.responses import FastJSONRoute
+from app.models import User, Company, Candidate, UserType
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse
+from app.schemas.candidate import (
+    CandidateSearchResult,
+    CandidateSearchResponse,
+    CandidateTextSearchResult,
+    CandidateTextSearchResponse,
+    JobMatchRequest,
+    CandidateMatchResult,
+    CandidateMatchResponse,
+    CandidateFacetsResponse
+)
+from app.services.candidate_facets import get_facet_counts
+from app.services.candidate_search import RESULT_COLUMNS, InvalidCursor, build_search_query, page_from_rows
+from app.services.candidate_text_search import search_candidates_text
+from app.services.matching import match_pool
+from app.services.skills_index import InvalidSkillsQuery
 
-router = APIRouter(prefix="/companies", tags=["Companies"])
+router = APIRouter(prefix="/companies", tags=["Companies"], route_class=FastJSONRoute)
 
 
 @router.post("/profile", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
 async def create_company_profile(
     company_data: CompanyCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create company profile"""
@@ -24,35 +44,35 @@ async def create_company_profile(
             detail="Only company users can create company profiles"
         )
     
-    # Check if profile already exists
+    # Create profile; the unique user_id turns a duplicate into an empty RETURNING
     result = await db.execute(
-        select(Company).where(Company.user_id == current_user.id)
+        insert_if_absent(
+            db,
+            Company,
+            {"user_id": current_user.id, **company_data.model_dump()},
+            Company.user_id
+        )
     )
-    existing_profile = result.scalar_one_or_none()
+    company = result.scalar_one_or_none()
     
-    if existing_profile:
+    if company is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Company profile already exists"
         )
     
-    # Create profile
-    company = Company(
-        user_id=current_user.id,
-        **company_data.model_dump()
-    )
-    
-    db.add(company)
     await db.commit()
-    await db.refresh(company)
+    await replica_router.mark_write(current_user.id)
     
-    return CompanyResponse.model_validate(company)
+    response = CompanyResponse.model_validate(company)
+    await store_profile("company", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.get("/profile", response_model=CompanyResponse)
 async def get_company_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """Get company profile"""
     if current_user.user_type != UserType.COMPANY:
@@ -61,6 +81,10 @@ async def get_company_profile(
             detail="Only company users can access company profiles"
         )
     
+    cached = await get_cached_profile("company", current_user.id)
+    if cached is not None:
+        return CompanyResponse.model_validate(cached)
+    
     result = await db.execute(
         select(Company).where(Company.user_id == current_user.id)
     )
@@ -72,13 +96,15 @@ async def get_company_profile(
             detail="Company profile not found"
         )
     
-    return CompanyResponse.model_validate(company)
+    response = CompanyResponse.model_validate(company)
+    await fill_profile("company", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.put("/profile", response_model=CompanyResponse)
 async def update_company_profile(
     company_data: CompanyUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update company profile"""
@@ -88,9 +114,19 @@ async def update_company_profile(
             detail="Only company users can update company profiles"
         )
     
-    result = await db.execute(
-        select(Company).where(Company.user_id == current_user.id)
-    )
+    # Update and read back the row in one statement
+    update_data = company_data.model_dump(exclude_unset=True)
+    if update_data:
+        statement = (
+            update(Company)
+            .where(Company.user_id == current_user.id)
+            .values(**update_data)
+            .returning(Company)
+        )
+    else:
+        statement = select(Company).where(Company.user_id == current_user.id)
+    
+    result = await db.execute(statement)
     company = result.scalar_one_or_none()
     
     if not company:
@@ -99,12 +135,153 @@ async def update_company_profile(
             detail="Company profile not found"
         )
     
-    # Update fields
-    update_data = company_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(company, field, value)
-    
     await db.commit()
-    await db.refresh(company)
+    await replica_router.mark_write(current_user.id)
+    
+    response = CompanyResponse.model_validate(company)
+    await store_profile("company", current_user.id, response.model_dump(mode="json"))
+    return response
+
+
+@router.get("/candidates/search", response_model=CandidateSearchResponse)
+async def search_candidates(
+    skills: Optional[List[str]] = Query(None, description="Candidate must have every listed skill"),
+    skills_query: Optional[str] = Query(
+        None, max_length=500, description="Boolean skills query, e.g. Python AND (Kafka OR Go) AND NOT PHP"
+    ),
+    city: Optional[str] = None,
+    min_experience: Optional[Decimal] = Query(None, ge=0),
+    max_experience: Optional[Decimal] = Query(None, ge=0),
+    max_notice_period_days: Optional[int] = Query(None, ge=0),
+    max_current_ctc: Optional[Decimal] = Query(None, ge=0),
+    max_expected_ctc: Optional[Decimal] = Query(None, ge=0),
+    open_to_buyout: Optional[bool] = None,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Search candidates, newest first, paged by cursor"""
+    if current_user.user_type != UserType.COMPANY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only company users can search candidates"
+        )
+    
+    try:
+        query = build_search_query(
+            db.bind.dialect.name,
+            skills=skills,
+            skills_query=skills_query,
+            city=city,
+            min_experience=min_experience,
+            max_experience=max_experience,
+            max_notice_period_days=max_notice_period_days,
+            max_current_ctc=max_current_ctc,
+            max_expected_ctc=max_expected_ctc,
+            open_to_buyout=open_to_buyout,
+            cursor=cursor,
+            limit=limit
+        )
+    except (InvalidCursor, InvalidSkillsQuery) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    result = await db.execute(query)
+    page, next_cursor = page_from_rows(result.all(), limit)
+    
+    return CandidateSearchResponse(
+        results=[CandidateSearchResult.model_validate(row) for row in page],
+        next_cursor=next_cursor
+    )
+
+
+@router.get("/candidates/text-search", response_model=CandidateTextSearchResponse)
+async def text_search_candidates(
+    q: str = Query(..., min_length=2, max_length=100, description="Name, designation or company; typos are tolerated"),
+    limit: int = Query(20, ge=1, le=50),
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Fuzzy search candidates by name, designation and company, best match first"""
+    if current_user.user_type != UserType.COMPANY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only company users can search candidates"
+        )
+    
+    matches = await search_candidates_text(db, q, limit)
+    
+    return CandidateTextSearchResponse(
+        results=[
+            CandidateTextSearchResult.model_validate({**row._mapping, "score": round(score, 4)})
+            for row, score in matches
+        ]
+    )
+
+
+@router.post("/candidates/match", response_model=CandidateMatchResponse)
+async def match_candidates(
+    job: JobMatchRequest,
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Score every candidate against an opening and return the best matches"""
+    if current_user.user_type != UserType.COMPANY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only company users can match candidates"
+        )
+    
+    if not match_pool.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Candidate matching is warming up, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    best = match_pool.top_k(job, job.limit)
+    if not best:
+        return CandidateMatchResponse(results=[])
+    
+    # Scoring runs in memory; only the k result cards come from the database
+    result = await db.execute(
+        select(*RESULT_COLUMNS).where(Candidate.id.in_([candidate_id for candidate_id, _ in best]))
+    )
+    cards = {row.id: row for row in result.all()}
+    
+    return CandidateMatchResponse(
+        results=[
+            CandidateMatchResult.model_validate({**cards[candidate_id]._mapping, "score": round(score, 4)})
+            for candidate_id, score in best
+            if candidate_id in cards
+        ]
+    )
+
+
+@router.get("/candidates/facets", response_model=CandidateFacetsResponse)
+async def get_candidate_facets(
+    city: Optional[str] = None,
+    notice_bucket: Optional[str] = Query(None, description="0, 30, 60, 90+ or unknown"),
+    experience_band: Optional[str] = Query(None, description="0-2, 2-5, 5-10, 10+ or unknown"),
+    open_to_buyout: Optional[str] = Query(None, description="yes, no or unknown"),
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Candidate counts per city, notice bucket, experience band and buyout preference"""
+    if current_user.user_type != UserType.COMPANY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only company users can search candidates"
+        )
+    
+    counts = await get_facet_counts(db, {
+        "city": city,
+        "notice_bucket": notice_bucket,
+        "experience_band": experience_band,
+        "open_to_buyout": open_to_buyout
+    })
     
-    return CompanyResponse.model_validate(company)
+    return CandidateFacetsResponse(**counts)
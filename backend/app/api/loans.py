@@ -0,0 +1,142 @@
+from decimal import Decimal
+from typing import Literal
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import get_current_principal, get_user_read_db
+from app.core.config import settings
+from app.core.money import Paise
+from app.core.responses import FastJSONRoute
+from app.models import Candidate, Loan, NBFCPartner, User, UserType
+from app.schemas.loan import LoanPortfolioRequest, LoanQuoteRequest, LoanQuoteResponse
+from app.services.amortization import (
+    PortfolioRow,
+    ScheduleRow,
+    aggregate_term_counts,
+    amortization_schedule,
+    count_terms,
+    render_csv,
+    render_ndjson,
+    schedule_months
+)
+from app.services.loan_offers import offer_index
+
+router = APIRouter(prefix="/loans", tags=["Loans"], route_class=FastJSONRoute)
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _stream(rows, fields, output: str) -> StreamingResponse:
+    body = render_csv(rows, fields) if output == "csv" else render_ndjson(rows)
+    return StreamingResponse(body, media_type=MEDIA_TYPES[output])
+
+
+@router.get("/schedule")
+async def get_loan_schedule(
+    principal: Paise = Query(...),
+    annual_interest_rate: Decimal = Query(..., ge=0, le=100),
+    tenure_months: int = Query(..., ge=1, le=360),
+    output: Literal["ndjson", "csv"] = Query("ndjson", alias="format")
+):
+    """
+    Stream the EMI amortization schedule for a quote, one row per month:
+    opening balance, EMI, principal and interest paid, closing balance.
+    """
+    rows = amortization_schedule(principal, annual_interest_rate, tenure_months)
+    return _stream(rows, ScheduleRow._fields, output)
+
+
+@router.get("/{loan_id}/schedule")
+async def get_stored_loan_schedule(
+    loan_id: UUID,
+    output: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    Stream the amortization schedule of a stored loan. Visible to the
+    borrowing candidate, the lending NBFC and admins.
+    """
+    result = await db.execute(
+        select(
+            Loan.principal_amount,
+            Loan.interest_rate,
+            Loan.tenure_months,
+            Candidate.user_id.label("candidate_user_id"),
+            NBFCPartner.user_id.label("nbfc_user_id"),
+        )
+        .join(Candidate, Candidate.id == Loan.candidate_id)
+        .join(NBFCPartner, NBFCPartner.id == Loan.nbfc_id)
+        .where(Loan.id == loan_id)
+    )
+    loan = result.one_or_none()
+    
+    # Someone else's loan is reported as missing, not forbidden
+    if loan is None or (
+        current_user.user_type != UserType.ADMIN
+        and current_user.id not in (loan.candidate_user_id, loan.nbfc_user_id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Loan not found"
+        )
+    
+    rows = amortization_schedule(loan.principal_amount, loan.interest_rate, loan.tenure_months)
+    return _stream(rows, ScheduleRow._fields, output)
+
+
+@router.post("/schedule/portfolio")
+async def get_portfolio_schedule(
+    request: LoanPortfolioRequest,
+    output: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Stream month-by-month totals over the schedules of up to 100,000 loans:
+    loans still repaying, opening balance, EMI, principal, interest and
+    closing balance.
+    
+    NBFC and admin users only. Loans with identical terms are walked once;
+    the distinct loans' tenures may add up to LOAN_PORTFOLIO_MAX_MONTHS.
+    """
+    if current_user.user_type not in (UserType.NBFC, UserType.ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only NBFC and admin users can aggregate portfolio schedules"
+        )
+    
+    counts = count_terms(
+        (loan.principal, loan.annual_interest_rate, loan.tenure_months) for loan in request.loans
+    )
+    months = schedule_months(counts)
+    if months > settings.LOAN_PORTFOLIO_MAX_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                f"Distinct loans add up to {months} schedule months; "
+                f"split the portfolio into requests of at most {settings.LOAN_PORTFOLIO_MAX_MONTHS}"
+            )
+        )
+    return _stream(aggregate_term_counts(counts), PortfolioRow._fields, output)
+
+
+@router.post("/quotes", response_model=LoanQuoteResponse)
+async def get_loan_quotes(request: LoanQuoteRequest):
+    """
+    Offers from every active NBFC partner that lends the amount over the
+    tenure, lowest EMI first. Served from memory; no database access.
+    """
+    if not offer_index.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Loan quoting is warming up, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    return LoanQuoteResponse(
+        offers=offer_index.quote(request.amount, request.tenure_months, request.monthly_salary)
+    )
@@ -1,19 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import secrets
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.core.database import get_db
-from app.api.auth import get_current_user
+from app.core.database import get_db, insert_if_absent, replica_router
+from app.api.auth import get_current_principal, get_user_read_db
+from app.core.profile_cache import fill_profile, get_cached_profile, store_profile
+from app.core.responses import FastJSONRoute
 from app.models import User, NBFCPartner, UserType
-from app.schemas.nbfc import NBFCCreate, NBFCUpdate, NBFCResponse
+from app.services.loan_offers import offer_index
+from app.services.portfolio_rollups import get_portfolio_analytics
+from app.services.risk_simulation import RiskSimulationBusy, build_portfolio, risk_simulator, sample_loan_terms
+from app.schemas.nbfc import (
+    NBFCCreate,
+    NBFCUpdate,
+    NBFCResponse,
+    PortfolioAnalyticsResponse,
+    RiskSimulationRequest,
+    RiskSimulationJob,
+)
 
-router = APIRouter(prefix="/nbfc", tags=["NBFC Partners"])
+router = APIRouter(prefix="/nbfc", tags=["NBFC Partners"], route_class=FastJSONRoute)
 
 
 @router.post("/profile", response_model=NBFCResponse, status_code=status.HTTP_201_CREATED)
 async def create_nbfc_profile(
     nbfc_data: NBFCCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Create NBFC profile"""
@@ -23,35 +39,36 @@ async def create_nbfc_profile(
             detail="Only NBFC users can create NBFC profiles"
         )
     
-    # Check if profile already exists
+    # Create profile; the unique user_id turns a duplicate into an empty RETURNING
     result = await db.execute(
-        select(NBFCPartner).where(NBFCPartner.user_id == current_user.id)
+        insert_if_absent(
+            db,
+            NBFCPartner,
+            {"user_id": current_user.id, **nbfc_data.model_dump()},
+            NBFCPartner.user_id
+        )
     )
-    existing_profile = result.scalar_one_or_none()
+    nbfc = result.scalar_one_or_none()
     
-    if existing_profile:
+    if nbfc is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="NBFC profile already exists"
         )
     
-    # Create profile
-    nbfc = NBFCPartner(
-        user_id=current_user.id,
-        **nbfc_data.model_dump()
-    )
-    
-    db.add(nbfc)
     await db.commit()
-    await db.refresh(nbfc)
+    await replica_router.mark_write(current_user.id)
+    offer_index.upsert(nbfc)
     
-    return NBFCResponse.model_validate(nbfc)
+    response = NBFCResponse.model_validate(nbfc)
+    await store_profile("nbfc", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.get("/profile", response_model=NBFCResponse)
 async def get_nbfc_profile(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_user_read_db)
 ):
     """Get NBFC profile"""
     if current_user.user_type != UserType.NBFC:
@@ -60,6 +77,10 @@ async def get_nbfc_profile(
             detail="Only NBFC users can access NBFC profiles"
         )
     
+    cached = await get_cached_profile("nbfc", current_user.id)
+    if cached is not None:
+        return NBFCResponse.model_validate(cached)
+    
     result = await db.execute(
         select(NBFCPartner).where(NBFCPartner.user_id == current_user.id)
     )
@@ -71,13 +92,15 @@ async def get_nbfc_profile(
             detail="NBFC profile not found"
         )
     
-    return NBFCResponse.model_validate(nbfc)
+    response = NBFCResponse.model_validate(nbfc)
+    await fill_profile("nbfc", current_user.id, response.model_dump(mode="json"))
+    return response
 
 
 @router.put("/profile", response_model=NBFCResponse)
 async def update_nbfc_profile(
     nbfc_data: NBFCUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_principal),
     db: AsyncSession = Depends(get_db)
 ):
     """Update NBFC profile"""
@@ -87,9 +110,19 @@ async def update_nbfc_profile(
             detail="Only NBFC users can update NBFC profiles"
         )
     
-    result = await db.execute(
-        select(NBFCPartner).where(NBFCPartner.user_id == current_user.id)
-    )
+    # Update and read back the row in one statement
+    update_data = nbfc_data.model_dump(exclude_unset=True)
+    if update_data:
+        statement = (
+            update(NBFCPartner)
+            .where(NBFCPartner.user_id == current_user.id)
+            .values(**update_data)
+            .returning(NBFCPartner)
+        )
+    else:
+        statement = select(NBFCPartner).where(NBFCPartner.user_id == current_user.id)
+    
+    result = await db.execute(statement)
     nbfc = result.scalar_one_or_none()
     
     if not nbfc:
@@ -98,12 +131,122 @@ async def update_nbfc_profile(
             detail="NBFC profile not found"
         )
     
-    # Update fields
-    update_data = nbfc_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(nbfc, field, value)
-    
     await db.commit()
-    await db.refresh(nbfc)
+    await replica_router.mark_write(current_user.id)
+    offer_index.upsert(nbfc)
+    
+    response = NBFCResponse.model_validate(nbfc)
+    await store_profile("nbfc", current_user.id, response.model_dump(mode="json"))
+    return response
+
+
+@router.get("/portfolio-analytics", response_model=PortfolioAnalyticsResponse)
+async def get_nbfc_portfolio_analytics(
+    from_date: Optional[date] = Query(None, description="Loans disbursed and EMIs due on or after this day"),
+    to_date: Optional[date] = Query(None, description="Loans disbursed and EMIs due on or before this day"),
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    Default rate, recovery rate, interest income and portfolio health of the
+    NBFC's loans. Served from daily rollups refreshed every
+    PORTFOLIO_ROLLUP_REFRESH_SECONDS; as_of tells how fresh they are.
+    """
+    if current_user.user_type != UserType.NBFC:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only NBFC users can access portfolio analytics"
+        )
+    
+    cached = await get_cached_profile("nbfc", current_user.id)
+    if cached is not None:
+        nbfc_id = NBFCResponse.model_validate(cached).id
+    else:
+        nbfc_id = await db.scalar(select(NBFCPartner.id).where(NBFCPartner.user_id == current_user.id))
     
-    return NBFCResponse.model_validate(nbfc)
+    if nbfc_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="NBFC profile not found"
+        )
+    
+    analytics = await get_portfolio_analytics(db, nbfc_id, from_date, to_date)
+    if analytics is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Portfolio analytics are being built, please retry shortly",
+            headers={"Retry-After": "5"}
+        )
+    return analytics
+
+
+@router.post("/risk-simulations", response_model=RiskSimulationJob, status_code=status.HTTP_202_ACCEPTED)
+async def start_risk_simulation(
+    request: RiskSimulationRequest,
+    current_user: User = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_user_read_db)
+):
+    """
+    Start a Monte Carlo loss simulation over the given loans, or over
+    sample_loans drawn from the NBFC's loan amount, rate and tenure ranges.
+    Runs in the background; poll GET /nbfc/risk-simulations/{id} for
+    progress and the loss distribution.
+    """
+    if current_user.user_type != UserType.NBFC:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only NBFC users can run risk simulations"
+        )
+    
+    seed = request.seed if request.seed is not None else secrets.randbits(32)
+    if request.loans is not None:
+        principal = [loan.principal for loan in request.loans]
+        rates = [float(loan.annual_interest_rate) for loan in request.loans]
+        tenure = [loan.tenure_months for loan in request.loans]
+        default_probability = [
+            request.default_probability if loan.default_probability is None else loan.default_probability
+            for loan in request.loans
+        ]
+        loss_given_default = [
+            request.loss_given_default if loan.loss_given_default is None else loan.loss_given_default
+            for loan in request.loans
+        ]
+    else:
+        nbfc = await db.scalar(select(NBFCPartner).where(NBFCPartner.user_id == current_user.id))
+        if nbfc is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="NBFC profile not found"
+            )
+        try:
+            principal, rates, tenure = sample_loan_terms(nbfc, request.sample_loans, seed)
+        except ValueError as exc:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+        default_probability = [request.default_probability] * len(principal)
+        loss_given_default = [request.loss_given_default] * len(principal)
+    
+    portfolio = build_portfolio(principal, rates, tenure, default_probability, loss_given_default)
+    try:
+        job = await risk_simulator.submit(current_user.id, portfolio, request.correlation, request.scenarios, seed)
+    except RiskSimulationBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many risk simulations running, please retry shortly",
+            headers={"Retry-After": "10"}
+        )
+    return RiskSimulationJob.model_validate(job)
+
+
+@router.get("/risk-simulations/{job_id}", response_model=RiskSimulationJob)
+async def get_risk_simulation(
+    job_id: str,
+    current_user: User = Depends(get_current_principal)
+):
+    """Progress of a risk simulation and, once completed, its loss distribution"""
+    job = await risk_simulator.get(job_id)
+    if job is None or job.get("owner") != str(current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Risk simulation not found"
+        )
+    return RiskSimulationJob.model_validate(job)
@@ -6,6 +6,8 @@ from app.core.database import get_db, init_db
 from app.core.security import (
     verify_password,
     get_password_hash,
+    verify_password_async,
+    get_password_hash_async,
     create_access_token,
     create_refresh_token,
     decode_token
@@ -17,6 +19,8 @@ __all__ = [
     "init_db",
     "verify_password",
     "get_password_hash",
+    "verify_password_async",
+    "get_password_hash_async",
     "create_access_token",
     "create_refresh_token",
     "decode_token"
@@ -0,0 +1,199 @@
+"""
+Small cache layer with pluggable backends
+
+MemoryCache is a bounded TTL + LRU map local to the worker process.
+RedisCache stores JSON values under a key prefix using settings.REDIS_URL so
+that every worker sees the same entries and the same invalidations. Both
+backends keep hit/miss counters. Backend errors are treated as misses so a
+Redis outage degrades to database reads instead of failing requests.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+class MemoryCache:
+    """In-process TTL + LRU cache"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self.get_nowait(key)
+
+    def get_nowait(self, key: str) -> Optional[Any]:
+        """Synchronous get, usable from non-async code"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.set_nowait(key, value, ttl)
+
+    def set_nowait(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Synchronous set, usable from ORM event hooks"""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set key only if it holds no live entry; returns whether it was set"""
+        entry = self._data.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return False
+        self.set_nowait(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self.delete_nowait(key)
+
+    def delete_nowait(self, key: str) -> None:
+        """Synchronous delete, usable from ORM event hooks"""
+        self.invalidations += 1
+        self._data.pop(key, None)
+
+    async def clear(self) -> None:
+        self.clear_nowait()
+
+    def clear_nowait(self) -> None:
+        """Synchronous clear, usable from ORM event hooks"""
+        self.invalidations += 1
+        self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class RedisCache:
+    """Redis-backed cache shared across workers; values are stored as JSON"""
+
+    def __init__(self, prefix: str, ttl_seconds: float = 60, client=None, url: Optional[str] = None):
+        if client is None:
+            import redis.asyncio as redis
+            client = redis.from_url(url or settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+        self._pending = set()
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            raw = await self.client.get(self._key(key))
+        except Exception:
+            self.errors += 1
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl_seconds if ttl is None else ttl
+        try:
+            await self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)))
+        except Exception:
+            self.errors += 1
+
+    async def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set key only if it does not exist; returns whether it was set"""
+        ttl = self.ttl_seconds if ttl is None else ttl
+        try:
+            return bool(await self.client.set(self._key(key), json.dumps(value), px=max(1, int(ttl * 1000)), nx=True))
+        except Exception:
+            self.errors += 1
+            return False
+
+    async def delete(self, key: str) -> None:
+        self.invalidations += 1
+        try:
+            await self.client.delete(self._key(key))
+        except Exception:
+            self.errors += 1
+
+    def _schedule(self, coro) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            coro.close()
+            return
+        task = loop.create_task(coro)
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def set_nowait(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Schedule a set from synchronous code running on the event loop"""
+        self._schedule(self.set(key, value, ttl))
+
+    def delete_nowait(self, key: str) -> None:
+        """Schedule a delete from synchronous code running on the event loop"""
+        self._schedule(self.delete(key))
+
+    def clear_nowait(self) -> None:
+        """Schedule a clear from synchronous code running on the event loop"""
+        self.invalidations += 1
+        self._schedule(self.clear())
+
+    async def clear(self) -> None:
+        try:
+            async for key in self.client.scan_iter(match=f"{self.prefix}:*"):
+                await self.client.delete(key)
+        except Exception:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis",
+            "prefix": self.prefix,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def create_cache(backend: str, prefix: str, max_size: int, ttl_seconds: float):
+    """Build a cache for the configured backend name ("memory" or "redis")"""
+    if backend == "redis":
+        return RedisCache(prefix=prefix, ttl_seconds=ttl_seconds)
+    if backend == "memory":
+        return MemoryCache(max_size=max_size, ttl_seconds=ttl_seconds)
+    raise ValueError(f"Unknown cache backend: {backend}")
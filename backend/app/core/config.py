@@ -13,16 +13,108 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    # SQL logging: echo prints every statement; otherwise only slow or sampled ones are logged
+    SQL_ECHO: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    SQL_TRACE_SAMPLE_RATE: float = 0.0  # fraction of statements logged as traces
+    # Apply pending migrations at startup instead of refusing to start
+    DB_AUTO_MIGRATE: bool = False
+    
+    # Read replicas (comma-separated URLs; empty means all reads use the primary)
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_HEALTH_CHECK_INTERVAL: float = 10
+    REPLICA_HEALTH_CHECK_TIMEOUT: float = 2
+    REPLICA_READ_YOUR_WRITES_SECONDS: int = 10  # keep reads on the primary after a user's write
+    REPLICA_WRITE_MARKER_BACKEND: str = "memory"  # memory or redis (use redis with several workers)
     
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Sign user_type/is_active/ver into access tokens so role checks skip the database
+    ACCESS_TOKEN_CLAIMS: bool = False
+    TOKEN_REVOCATION_BACKEND: str = "memory"  # memory or redis (use redis with several workers)
+    # Verified JWT payloads kept in memory until their exp (0 disables)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    
+    # Password hashing: bcrypt cost factor (hashes at other costs are rehashed on login)
+    BCRYPT_ROUNDS: int = 12
+    
+    # Password hashing pool
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread or process
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 256
+    
+    # Login throttling (token buckets checked before bcrypt)
+    LOGIN_THROTTLE_BACKEND: str = "memory"  # memory, redis or none
+    LOGIN_THROTTLE_IP_BURST: int = 30
+    LOGIN_THROTTLE_IP_PER_MINUTE: int = 30
+    LOGIN_THROTTLE_EMAIL_BURST: int = 5  # per email from one IP
+    LOGIN_THROTTLE_EMAIL_PER_MINUTE: int = 5
+    LOGIN_THROTTLE_ACCOUNT_BURST: int = 50  # per email from all IPs
+    LOGIN_THROTTLE_ACCOUNT_PER_MINUTE: int = 20
+    
+    # Bulk user import
+    BULK_IMPORT_BATCH_SIZE: int = 500
+    
+    # Watermarked refreshes (skills index, match pool, portfolio rollups) re-read rows
+    # changed this long before the watermark, so rows committed late are not missed
+    REFRESH_OVERLAP_SECONDS: float = 60
+    
+    # Skills index (in-memory, per worker) for boolean skill queries
+    SKILLS_INDEX_ENABLED: bool = True
+    SKILLS_INDEX_REFRESH_SECONDS: float = 30  # pick up other workers' writes
+    SKILLS_INDEX_MAX_IDS: int = 5000  # larger match sets are filtered in SQL instead
+    
+    # Candidate-to-job match scoring (in-memory feature pool, per worker)
+    MATCHING_ENABLED: bool = True
+    MATCHING_REFRESH_SECONDS: float = 30
+    
+    # Candidate facet counts: how long a worker reuses its copy (bounds staleness)
+    FACET_CACHE_TTL_SECONDS: float = 5
+    
+    # Fuzzy candidate search (pg_trgm word similarity, 0-1; lower is more typo tolerant)
+    CANDIDATE_TEXT_SEARCH_THRESHOLD: float = 0.4
+    
+    # Memoized EMI amortization schedules per worker, bounded by total schedule rows
+    LOAN_SCHEDULE_CACHE_ROWS: int = 50000
+    # Portfolio schedules: cap on schedule rows walked per request (tenure months over distinct loans)
+    LOAN_PORTFOLIO_MAX_MONTHS: int = 200000
+    
+    # Loan offer quoting (in-memory NBFC product index, per worker)
+    LOAN_QUOTES_ENABLED: bool = True
+    LOAN_QUOTES_REFRESH_SECONDS: float = 30
+    
+    # NBFC portfolio analytics (daily rollups in the database, refreshed from a watermark)
+    PORTFOLIO_ROLLUP_ENABLED: bool = True
+    PORTFOLIO_ROLLUP_REFRESH_SECONDS: float = 60
+    
+    # NBFC portfolio risk simulation (Monte Carlo jobs on a process pool, per worker)
+    RISK_SIMULATION_WORKERS: int = 0  # processes; 0 uses one per CPU
+    RISK_SIMULATION_MAX_JOBS: int = 1  # simulations running at once (each uses every process)
+    RISK_SIMULATION_MAX_QUEUE: int = 4
+    RISK_SIMULATION_JOB_BACKEND: str = "memory"  # memory or redis (use redis with several workers)
+    RISK_SIMULATION_JOB_TTL_SECONDS: int = 3600
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Principal cache (get_current_user)
+    PRINCIPAL_CACHE_BACKEND: str = "memory"  # memory, redis or none
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_SIZE: int = 10000
+    
+    # Profile cache (GET /companies|candidates|nbfc/profile); memory is per worker
+    PROFILE_CACHE_BACKEND: str = "memory"  # memory, redis or none
+    PROFILE_CACHE_TTL_SECONDS: int = 30
+    PROFILE_CACHE_MAX_SIZE: int = 10000
+    
     # Email
     SMTP_HOST: Optional[str] = None
     SMTP_PORT: Optional[int] = None
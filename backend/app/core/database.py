@@ -1,18 +1,123 @@
+import asyncio
+import itertools
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.cache import create_cache
 from app.core.config import settings
+from app.core.sql_log import install_query_logging
+
+
+def _async_url(url: str) -> str:
+    """Ensure we use asyncpg driver for async connections"""
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+database_url = _async_url(settings.DATABASE_URL)
+
+
+class PoolStats:
+    """Connection pool counters and a checkout wait-time histogram"""
+    
+    # Upper bounds of the wait histogram buckets, in milliseconds
+    WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        self.connections_created = 0
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+        self.wait_histogram = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+    
+    def observe_wait(self, wait_ms: float):
+        self.checkouts += 1
+        self.wait_total_ms += wait_ms
+        self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+        self.wait_histogram[bisect_left(self.WAIT_BUCKETS_MS, wait_ms)] += 1
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection"""
+    
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            pool_stats.checkout_timeouts += 1
+            raise
+        finally:
+            pool_stats.observe_wait((time.perf_counter() - start) * 1000)
+
+
+def _engine_options(url: str, instrumented: bool = True) -> dict:
+    """Pool settings; SQLite (used for local testing) keeps SQLAlchemy's default pool"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "poolclass": InstrumentedPool if instrumented else AsyncAdaptedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
 
-# Ensure we use asyncpg driver for async connections
-database_url = settings.DATABASE_URL
-if database_url.startswith("postgresql://"):
-    database_url = database_url.replace("postgresql://", "postgresql+asyncpg://", 1)
 
 # Create async engine
 engine = create_async_engine(
     database_url,
-    echo=settings.DEBUG,
-    future=True
+    echo=settings.SQL_ECHO,
+    future=True,
+    **_engine_options(database_url)
 )
+install_query_logging(engine)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _count_new_connection(dbapi_connection, connection_record):
+    pool_stats.connections_created += 1
+
+
+def get_pool_stats() -> dict:
+    """Snapshot of the engine's pool, usable from the API and from load tests"""
+    pool = engine.sync_engine.pool
+    histogram = {
+        f"le_{bound}ms": count
+        for bound, count in zip(pool_stats.WAIT_BUCKETS_MS, pool_stats.wait_histogram)
+    }
+    histogram["gt_5000ms"] = pool_stats.wait_histogram[-1]
+    stats = {
+        "pool_class": type(pool).__name__,
+        "connections_created": pool_stats.connections_created,
+        "checkouts": pool_stats.checkouts,
+        "checkout_timeouts": pool_stats.checkout_timeouts,
+        "checkout_wait_avg_ms": round(pool_stats.wait_total_ms / pool_stats.checkouts, 3) if pool_stats.checkouts else 0.0,
+        "checkout_wait_max_ms": round(pool_stats.wait_max_ms, 3),
+        "checkout_wait_histogram": histogram,
+    }
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+        })
+    return stats
+
 
 # Create async session factory
 async_session_maker = async_sessionmaker(
@@ -23,6 +128,98 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+
+class ReplicaRouter:
+    """
+    Routes read-only sessions to healthy read replicas, round-robin.
+    
+    Replicas are pinged every REPLICA_HEALTH_CHECK_INTERVAL seconds; when none
+    is healthy (or none is configured) reads go to the primary. Users who
+    wrote recently are pinned to the primary for REPLICA_READ_YOUR_WRITES_SECONDS
+    so they always read their own writes despite replication lag.
+    """
+    
+    def __init__(self, urls):
+        self.urls = urls
+        self.engines = [
+            create_async_engine(url, echo=settings.SQL_ECHO, future=True, **_engine_options(url, instrumented=False))
+            for url in urls
+        ]
+        for replica in self.engines:
+            install_query_logging(replica)
+        self.session_makers = [
+            async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+            for replica in self.engines
+        ]
+        self.healthy = [True] * len(self.engines)
+        self._counter = itertools.count()
+        self.recent_writes = create_cache(
+            settings.REPLICA_WRITE_MARKER_BACKEND,
+            prefix="recent-write",
+            max_size=100000,
+            ttl_seconds=settings.REPLICA_READ_YOUR_WRITES_SECONDS,
+        )
+        self.replica_reads = 0
+        self.primary_reads = 0
+    
+    def session_maker(self, pin_primary: bool = False) -> async_sessionmaker:
+        """Pick a session factory for a read-only unit of work"""
+        healthy = [index for index, ok in enumerate(self.healthy) if ok]
+        if pin_primary or not healthy:
+            self.primary_reads += 1
+            return async_session_maker
+        self.replica_reads += 1
+        return self.session_makers[healthy[next(self._counter) % len(healthy)]]
+    
+    async def mark_write(self, key) -> None:
+        """Pin reads for key (usually a user id) to the primary for a while"""
+        if self.engines:
+            await self.recent_writes.set(str(key), 1)
+    
+    async def wrote_recently(self, key) -> bool:
+        if not self.engines:
+            return False
+        return await self.recent_writes.get(str(key)) is not None
+    
+    async def check_health(self) -> None:
+        for index, replica in enumerate(self.engines):
+            try:
+                async with replica.connect() as conn:
+                    await asyncio.wait_for(conn.execute(text("SELECT 1")), timeout=settings.REPLICA_HEALTH_CHECK_TIMEOUT)
+                if not self.healthy[index]:
+                    print(f"Read replica {index} is healthy again")
+                self.healthy[index] = True
+            except Exception as e:
+                if self.healthy[index]:
+                    print(f"Read replica {index} failed health check, reading from primary: {e}")
+                self.healthy[index] = False
+    
+    async def run_health_checks(self) -> None:
+        """Background loop started from the application lifespan"""
+        while True:
+            await self.check_health()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL)
+    
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+    
+    def stats(self) -> dict:
+        return {
+            "replicas": len(self.engines),
+            "healthy": self.healthy,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+replica_router = ReplicaRouter([
+    _async_url(url.strip())
+    for url in settings.DATABASE_REPLICA_URLS.split(",")
+    if url.strip()
+])
+
+
 # Create base class for models
 Base = declarative_base()
 
@@ -36,7 +233,35 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_read_db() -> AsyncSession:
+    """Dependency to get a read-only session (replica when one is healthy)"""
+    async with replica_router.session_maker()() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def insert_if_absent(db: AsyncSession, model, values: dict, *conflict_columns):
+    """
+    INSERT ... ON CONFLICT (conflict_columns) DO NOTHING RETURNING model.
+    
+    Executing it yields the new row, or None if a row with the same
+    conflict_columns already exists, in a single round trip.
+    """
+    if db.bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return (
+        insert(model)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=list(conflict_columns))
+        .returning(model)
+    )
+
+
 async def init_db():
-    """Initialize database - create all tables"""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """Initialize database - apply all pending schema migrations"""
+    from app.core.migrations import upgrade_database
+    await upgrade_database()
@@ -0,0 +1,112 @@
+"""
+Bounded worker pool for CPU-heavy password work (bcrypt hashing/verification)
+
+bcrypt blocks for ~200 ms per call, so running it inline in an async handler
+stalls the whole event loop. Every password call goes through this pool
+instead: at most PASSWORD_HASH_WORKERS hashes run at once and at most
+PASSWORD_HASH_MAX_QUEUE callers may wait for a slot before we shed load.
+"""
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional
+
+from app.core.config import settings
+
+
+class PasswordHashQueueFull(Exception):
+    """Raised when too many password operations are already waiting"""
+    pass
+
+
+class PasswordExecutor:
+    """Runs password work on a thread or process pool with a bounded queue"""
+
+    def __init__(self, kind: str = "thread", workers: int = 4, max_queue: int = 256):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown password executor kind: {kind}")
+        self.kind = kind
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="password-hash"
+                )
+        return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.workers)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run func(*args) on the pool, waiting for a free slot if needed"""
+        semaphore = self._get_semaphore()
+        if semaphore.locked() and self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHashQueueFull("Too many concurrent password operations")
+
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), func, *args)
+        finally:
+            semaphore.release()
+            self.completed += 1
+
+    async def map(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        """
+        Run func over items in parallel, keeping at most `workers` of them
+        queued at a time so large batches never trip the queue-depth limit.
+        """
+        limit = asyncio.Semaphore(self.workers)
+
+        async def run_one(item):
+            async with limit:
+                return await self.run(func, item)
+
+        return await asyncio.gather(*(run_one(item) for item in items))
+
+    def stats(self) -> dict:
+        """Current pool statistics"""
+        in_flight = 0
+        if self._semaphore is not None:
+            in_flight = self.workers - self._semaphore._value
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": in_flight,
+            "waiting": self._waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the underlying pool (called on application shutdown)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._semaphore = None
+
+
+password_executor = PasswordExecutor(
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,89 @@
+"""
+Schema migrations (Alembic) and the startup schema check
+
+Migrations live in backend/alembic and are applied by `python init_db.py`
+(or the deploy start script). Application startup only compares the stored
+alembic_version with the newest migration on disk, which is two cheap
+queries, instead of running create_all and reflecting every table per
+process.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+
+from app.core.config import settings
+from app.core.database import engine
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Revision matching the tables the old create_all-based init_db produced
+BASELINE_REVISION = "0001"
+
+
+def _alembic_config(connection=None) -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    config.attributes["configure_logger"] = False
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """Newest migration revision shipped with this code"""
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+async def current_revision() -> Optional[str]:
+    """Revision stored in the database, or None if it was never migrated"""
+    async with engine.connect() as conn:
+        # Only a missing alembic_version table means "never migrated"; any other
+        # database error (unreachable, no permission) must stop startup
+        if not await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("alembic_version")):
+            return None
+        result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+        return result.scalar_one_or_none()
+
+
+def _upgrade(connection) -> None:
+    config = _alembic_config(connection)
+    tables = inspect(connection).get_table_names()
+    if "alembic_version" not in tables and "users" in tables:
+        # Database created by create_all before migrations existed
+        command.stamp(config, BASELINE_REVISION)
+    command.upgrade(config, "head")
+
+
+async def upgrade_database() -> None:
+    """Apply all pending migrations"""
+    async with engine.begin() as conn:
+        await conn.run_sync(_upgrade)
+
+
+async def check_schema_version() -> None:
+    """
+    Startup check: make sure the database is at the newest migration.
+
+    Runs pending migrations when DB_AUTO_MIGRATE is set, otherwise refuses
+    to start against an out-of-date schema.
+    """
+    current = await current_revision()
+    head = head_revision()
+    if current == head:
+        return
+
+    if settings.DB_AUTO_MIGRATE:
+        print(f"Migrating database schema from {current} to {head}...")
+        await upgrade_database()
+        return
+
+    raise RuntimeError(
+        f"Database schema is at revision {current}, expected {head}. "
+        f"Run `python init_db.py --no-seed` to apply migrations."
+    )
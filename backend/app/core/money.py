@@ -0,0 +1,153 @@
+"""
+Money as integer paise
+
+Paise is an int subclass holding an amount in paise (1/100 rupee), so
+calculators and bulk paths do exact integer arithmetic instead of Decimal.
+Amounts cross the API and the database as rupees:
+
+- Pydantic fields typed Paise accept rupees (number or string) and convert
+  exactly; more than two decimal places, negative amounts and amounts a
+  NUMERIC(12, 2) column cannot hold are rejected, never rounded. JSON
+  output is rupees with two decimals, as Decimal fields were.
+- Money columns (a TypeDecorator over NUMERIC(12, 2), so the schema is
+  unchanged) load as Paise. Paise values are bound as rupees; any other
+  value (e.g. a Decimal filter bound or a literal in seed data) is already
+  rupees and passes through.
+
+Sums and differences of Paise and ints, and Paise multiplied, floor-divided
+or reduced modulo a plain int, are Paise again, so `a + b` of two loaded
+amounts binds as rupees rather than being read as a rupee int. Paise times
+or over Paise, true division and mixing with Decimal or float give plain
+numbers. Computed amounts (a daily salary, an EMI) are rounded
+half-even with round_paise, as round(x, 2) does for Decimal.
+"""
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+
+from pydantic_core import core_schema
+from sqlalchemy.types import Numeric, TypeDecorator
+
+# Largest amount a NUMERIC(12, 2) column holds
+MAX_PAISE = 10 ** 12 - 1
+PAISA = Decimal("0.01")
+
+
+class Paise(int):
+    """An amount of money in paise"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_rupees(cls, value) -> "Paise":
+        """Exact conversion from rupees; raises ValueError if it would round"""
+        if isinstance(value, Paise):
+            return value
+        if isinstance(value, bool):
+            raise ValueError("Amount must be a number")
+        try:
+            # str() keeps a float's shortest repr (12.3, not 12.2999...)
+            rupees = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+        except InvalidOperation:
+            raise ValueError("Amount must be a number")
+        if not rupees.is_finite():
+            raise ValueError("Amount must be a finite number")
+        paise = rupees.scaleb(2)
+        if paise != paise.to_integral_value():
+            raise ValueError("Amount must have at most two decimal places")
+        if paise < 0:
+            raise ValueError("Amount must not be negative")
+        if paise > MAX_PAISE:
+            raise ValueError("Amount is too large")
+        return cls(paise)
+
+    def to_rupees(self) -> Decimal:
+        return Decimal(int(self)).scaleb(-2)
+
+    def __add__(self, other):
+        return _paise(int.__add__(self, other))
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return _paise(int.__sub__(self, other))
+
+    def __rsub__(self, other):
+        return _paise(int.__rsub__(self, other))
+
+    # Scaling by a count stays money; a product or ratio of two amounts is not
+    def __mul__(self, other):
+        result = int.__mul__(self, other)
+        return result if isinstance(other, Paise) else _paise(result)
+
+    __rmul__ = __mul__
+
+    def __floordiv__(self, other):
+        result = int.__floordiv__(self, other)
+        return result if isinstance(other, Paise) else _paise(result)
+
+    def __mod__(self, other):
+        return _paise(int.__mod__(self, other))
+
+    def __neg__(self):
+        return Paise(-int(self))
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Paise(abs(int(self)))
+
+    def __repr__(self) -> str:
+        return f"Paise({int(self)})"
+
+    def __str__(self) -> str:
+        return format_paise(self)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return core_schema.no_info_plain_validator_function(
+            cls.from_rupees,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda paise: paise.to_rupees(), when_used="json"
+            ),
+        )
+
+    @classmethod
+    def __get_pydantic_json_schema__(cls, schema, handler):
+        return {
+            "anyOf": [{"type": "number"}, {"type": "string"}],
+            "description": "Amount in rupees, at most two decimal places",
+        }
+
+
+def _paise(result):
+    # NotImplemented (e.g. for a Decimal operand) passes through
+    return Paise(result) if type(result) is int else result
+
+
+def round_paise(rupees: Decimal) -> Paise:
+    """Round a computed rupee amount to the paisa, half to even"""
+    return Paise(rupees.quantize(PAISA, rounding=ROUND_HALF_EVEN).scaleb(2))
+
+
+def format_paise(paise: int) -> str:
+    """Paise as a rupee string with two decimals"""
+    sign = "-" if paise < 0 else ""
+    rupees, paise = divmod(abs(int(paise)), 100)
+    return f"{sign}{rupees}.{paise:02d}"
+
+
+class Money(TypeDecorator):
+    """NUMERIC(12, 2) rupee column exposed as Paise"""
+
+    impl = Numeric(12, 2)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, Paise):
+            return value.to_rupees()
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return Paise(Decimal(value).quantize(PAISA).scaleb(2))
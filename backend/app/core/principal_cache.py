@@ -0,0 +1,134 @@
+"""
+Principal cache for get_current_user
+
+Authenticated requests look up the same users row over and over. This keeps
+a short-lived copy of the user's columns keyed by user id so most requests
+skip that query. Entries otherwise expire after PRINCIPAL_CACHE_TTL_SECONDS.
+
+Entries are dropped when a user's is_active or user_type changes (or the
+user is deleted) through the ORM. The flush only notes the user id on the
+session; the entry is dropped once the transaction commits, so a request
+that reads the user between flush and commit can't cache the old row again
+after the drop, and a rollback drops nothing. update(User) and
+delete(User) statements run through a session bypass the per-object hooks
+and can't say which rows they touched, so they empty the whole cache on
+commit. Statements run on a bare connection bypass the session too; call
+invalidate_principal after committing those.
+"""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.models import User, UserType
+
+# Columns that change what a principal is allowed to do
+AUTHZ_FIELDS = ("is_active", "user_type")
+
+principal_cache = None
+if settings.PRINCIPAL_CACHE_BACKEND != "none":
+    principal_cache = create_cache(
+        settings.PRINCIPAL_CACHE_BACKEND,
+        prefix="principal",
+        max_size=settings.PRINCIPAL_CACHE_MAX_SIZE,
+        ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    )
+
+
+def user_to_principal(user: User) -> dict:
+    """Serialize the user columns needed by request handlers (no password hash)"""
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "user_type": user.user_type.value if user.user_type else None,
+        "is_verified": user.is_verified,
+        "is_active": user.is_active,
+        "created_at": user.created_at.isoformat() if user.created_at else None,
+        "updated_at": user.updated_at.isoformat() if user.updated_at else None,
+    }
+
+
+def principal_to_user(data: dict) -> User:
+    """Rebuild a detached User from a cached principal"""
+    return User(
+        id=UUID(data["id"]),
+        email=data["email"],
+        user_type=UserType(data["user_type"]) if data["user_type"] else None,
+        is_verified=data["is_verified"],
+        is_active=data["is_active"],
+        created_at=datetime.fromisoformat(data["created_at"]) if data["created_at"] else None,
+        updated_at=datetime.fromisoformat(data["updated_at"]) if data["updated_at"] else None,
+    )
+
+
+async def get_cached_user(user_id: UUID) -> Optional[User]:
+    """Return the cached user for user_id, or None on a miss"""
+    if principal_cache is None:
+        return None
+    data = await principal_cache.get(str(user_id))
+    if data is None:
+        return None
+    return principal_to_user(data)
+
+
+async def cache_user(user: User) -> None:
+    """Store a freshly loaded user"""
+    if principal_cache is not None:
+        await principal_cache.set(str(user.id), user_to_principal(user))
+
+
+async def invalidate_principal(user_id) -> None:
+    """Drop a cached principal, e.g. after deactivating a user"""
+    if principal_cache is not None:
+        await principal_cache.delete(str(user_id))
+
+
+def principal_cache_stats() -> dict:
+    if principal_cache is None:
+        return {"backend": "none"}
+    return principal_cache.stats()
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault("principal_invalidations", set())
+
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_authz_change(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in AUTHZ_FIELDS):
+        _pending(object_session(target)).add(str(target.id))
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target):
+    _pending(object_session(target)).add(str(target.id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_write(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and mapper is not None and mapper.class_ is User:
+        # None stands for every user
+        _pending(orm_execute_state.session).add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_invalidations(session):
+    pending = session.info.pop("principal_invalidations", None)
+    if not pending or principal_cache is None:
+        return
+    if None in pending:
+        principal_cache.clear_nowait()
+        return
+    for user_id in pending:
+        principal_cache.delete_nowait(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session):
+    session.info.pop("principal_invalidations", None)
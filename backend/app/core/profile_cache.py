@@ -0,0 +1,84 @@
+"""
+Profile cache for the GET /profile endpoints
+
+Dashboards poll the signed-in user's company, candidate or NBFC profile.
+This keeps the serialized response keyed by profile kind and user id, so
+a hit skips the profile query (the user itself comes from the principal
+cache).
+
+Writes go through the cache: the create and update handlers store the new
+response after their commit. GET only fills a missing entry (add, never
+set), so a read that loaded the row before a concurrent update cannot
+overwrite the newer write-through value. Profiles deleted through the ORM
+are dropped.
+
+With the redis backend every worker shares entries and write-throughs.
+The memory backend is per worker: a write made through one worker reaches
+the others' copies only when they expire, so with several workers keep
+PROFILE_CACHE_TTL_SECONDS short or use redis.
+"""
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.models import Candidate, Company, NBFCPartner
+
+PROFILE_KINDS = {Company: "company", Candidate: "candidate", NBFCPartner: "nbfc"}
+
+profile_cache = None
+if settings.PROFILE_CACHE_BACKEND != "none":
+    profile_cache = create_cache(
+        settings.PROFILE_CACHE_BACKEND,
+        prefix="profile",
+        max_size=settings.PROFILE_CACHE_MAX_SIZE,
+        ttl_seconds=settings.PROFILE_CACHE_TTL_SECONDS,
+    )
+
+_write_throughs = 0
+
+
+def _key(kind: str, user_id) -> str:
+    return f"{kind}:{user_id}"
+
+
+async def get_cached_profile(kind: str, user_id) -> Optional[dict]:
+    """Return the cached profile response, or None on a miss"""
+    if profile_cache is None:
+        return None
+    return await profile_cache.get(_key(kind, user_id))
+
+
+async def fill_profile(kind: str, user_id, data: dict) -> None:
+    """Cache a profile loaded by a GET unless a newer entry is already there"""
+    if profile_cache is not None:
+        await profile_cache.add(_key(kind, user_id), data)
+
+
+async def store_profile(kind: str, user_id, data: dict) -> None:
+    """Write through a profile just committed by a create or update"""
+    global _write_throughs
+    if profile_cache is not None:
+        _write_throughs += 1
+        await profile_cache.set(_key(kind, user_id), data)
+
+
+async def invalidate_profile(kind: str, user_id) -> None:
+    if profile_cache is not None:
+        await profile_cache.delete(_key(kind, user_id))
+
+
+def profile_cache_stats() -> dict:
+    if profile_cache is None:
+        return {"backend": "none"}
+    return {**profile_cache.stats(), "write_throughs": _write_throughs}
+
+
+def _invalidate_on_delete(mapper, connection, target):
+    if profile_cache is not None:
+        profile_cache.delete_nowait(_key(PROFILE_KINDS[mapper.class_], target.user_id))
+
+
+for _model in PROFILE_KINDS:
+    event.listen(_model, "after_delete", _invalidate_on_delete)
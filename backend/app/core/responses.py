@@ -0,0 +1,77 @@
+"""
+Single-validation JSON responses
+
+With response_model set, FastAPI dumps whatever a handler returns to a dict,
+validates that into the response model again, serializes it back to Python
+primitives, runs jsonable_encoder over those and finally json.dumps them:
+two Pydantic passes and three walks over a response the handler usually
+built with XResponse.model_validate(row) already.
+
+FastJSONRoute replaces that with one TypeAdapter for the response model:
+instances of the model pass through untouched, ORM rows and dicts are
+validated once, and pydantic-core writes the result straight to JSON bytes,
+encoding UUID, Decimal, datetime and Paise natively. Status codes,
+response_model_* options, ResponseValidationError and the OpenAPI schema
+behave as before. Results without a response model (plain dicts) are
+encoded by FastJSONResponse, the app's default response class, with
+pydantic_core.to_json instead of the json module.
+"""
+import asyncio
+from typing import Any, Callable
+
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.exceptions import ResponseValidationError
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
+from starlette.responses import Response
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded by pydantic-core; bytes content is sent as is"""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+class FastJSONRoute(APIRoute):
+    """APIRoute that validates a handler's result once and renders it to bytes directly"""
+
+    def get_route_handler(self) -> Callable:
+        response_class = self.response_class
+        if isinstance(response_class, DefaultPlaceholder):
+            response_class = response_class.value
+        if (
+            self.response_field is not None
+            and issubclass(response_class, JSONResponse)
+            and asyncio.iscoroutinefunction(self.dependant.call)
+        ):
+            self.dependant.call = self._render_once(self.dependant.call)
+        return super().get_route_handler()
+
+    def _render_once(self, endpoint: Callable) -> Callable:
+        adapter = TypeAdapter(self.response_model)
+        status_code = self.status_code or 200
+        options = {
+            "include": self.response_model_include,
+            "exclude": self.response_model_exclude,
+            "by_alias": self.response_model_by_alias,
+            "exclude_unset": self.response_model_exclude_unset,
+            "exclude_defaults": self.response_model_exclude_defaults,
+            "exclude_none": self.response_model_exclude_none,
+        }
+
+        async def render(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            if isinstance(result, Response):
+                return result
+            try:
+                value = adapter.validate_python(result, from_attributes=True)
+            except ValidationError as exc:
+                raise ResponseValidationError(exc.errors(), body=result)
+            return FastJSONResponse(adapter.dump_json(value, **options), status_code=status_code)
+
+        return render
@@ -0,0 +1,141 @@
+"""
+Compact revocation list for claims-carrying access tokens
+
+When ACCESS_TOKEN_CLAIMS is on, access tokens carry user_type, is_active and
+a "ver" claim (issue time in milliseconds) so role-gated endpoints can
+authorize without reading the users table. To keep deactivation effective,
+every change to a user's is_active or user_type records a per-user
+watermark here; tokens whose ver is older than the watermark are rejected.
+Watermarks only need to outlive the access token TTL, so the list stays
+small and entries expire on their own.
+
+Changes made through a session are revoked once the transaction commits
+(a login between flush and commit would otherwise get a token newer than
+the watermark while still reading the old row). update(User) and
+delete(User) statements bypass the per-object hooks, so the users their
+WHERE clause matches are looked up before the statement runs and revoked
+too, whichever columns it sets. Statements run on a bare connection
+bypass the session; call revoke_user_tokens after committing those.
+
+A watermark must never leave before it expires: dropping one early would
+silently un-revoke that user's tokens. So the memory backend is not an LRU
+cache with a size cap; it holds every watermark for exactly the token TTL,
+and its size is bounded by the revocations made within one TTL. Redis
+entries likewise carry only the TTL.
+"""
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import RedisCache
+from app.core.config import settings
+from app.models import User
+
+
+class MemoryRevocations:
+    """Per-process watermarks that are only ever dropped once they expire"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._data: Dict[str, Tuple[float, int]] = {}
+        # Every entry has the same TTL, so appending keeps this in expiry order
+        self._expiry: "deque[Tuple[float, str]]" = deque()
+
+    def set_nowait(self, key: str, value: int) -> None:
+        now = time.monotonic()
+        self._purge(now)
+        expires_at = now + self.ttl_seconds
+        self._data[key] = (expires_at, value)
+        self._expiry.append((expires_at, key))
+
+    async def get(self, key: str) -> Optional[int]:
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def _purge(self, now: float) -> None:
+        while self._expiry and self._expiry[0][0] <= now:
+            expires_at, key = self._expiry.popleft()
+            # A later revocation of the same user replaced this entry
+            if self._data.get(key, (None,))[0] == expires_at:
+                del self._data[key]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def create_revocations(backend: str, ttl_seconds: float):
+    if backend == "redis":
+        return RedisCache(prefix="revoked", ttl_seconds=ttl_seconds)
+    if backend == "memory":
+        return MemoryRevocations(ttl_seconds)
+    raise ValueError(f"Unknown token revocation backend: {backend}")
+
+
+token_revocations = create_revocations(settings.TOKEN_REVOCATION_BACKEND, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def current_token_version() -> int:
+    """Version stamped into newly issued access tokens"""
+    return int(time.time() * 1000)
+
+
+def revoke_user_tokens(user_id) -> None:
+    """Invalidate every access token issued to user_id before now"""
+    token_revocations.set_nowait(str(user_id), current_token_version())
+
+
+async def is_token_revoked(user_id: str, version: Optional[int]) -> bool:
+    """Whether a token with this ver claim was issued before a revocation"""
+    watermark = await token_revocations.get(user_id)
+    if watermark is None:
+        return False
+    return version is None or version < watermark
+
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault("token_revocations", set())
+
+
+@event.listens_for(User, "after_update")
+def _revoke_on_authz_change(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in ("is_active", "user_type")):
+        _pending(object_session(target)).add(target.id)
+
+
+@event.listens_for(User, "after_delete")
+def _revoke_on_delete(mapper, connection, target):
+    _pending(object_session(target)).add(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _revoke_on_bulk_write(orm_execute_state):
+    mapper = orm_execute_state.bind_mapper
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete) or mapper is None or mapper.class_ is not User:
+        return
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, list):
+        # Bulk UPDATE by primary key: one parameter set per user
+        user_ids = [row["id"] for row in parameters]
+    else:
+        matched = select(User.id)
+        if orm_execute_state.statement.whereclause is not None:
+            matched = matched.where(orm_execute_state.statement.whereclause)
+        user_ids = orm_execute_state.session.execute(matched, parameters).scalars().all()
+    _pending(orm_execute_state.session).update(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_revocations(session):
+    for user_id in session.info.pop("token_revocations", ()):
+        revoke_user_tokens(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_revocations(session):
+    session.info.pop("token_revocations", None)
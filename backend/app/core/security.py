@@ -1,10 +1,24 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
+import hashlib
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.cache import MemoryCache
+from app.core.executor import password_executor
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pin the bcrypt cost to BCRYPT_ROUNDS so needs_update flags hashes made at any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Verified token payloads keyed by token digest; each entry lives until the token's exp
+token_cache = MemoryCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -12,6 +26,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash was made with a different bcrypt cost than configured"""
+    return pwd_context.needs_update(hashed_password)
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password"""
     # Truncate password to 72 bytes to avoid bcrypt length limit
@@ -20,6 +39,21 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(truncated_password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the password pool without blocking the event loop"""
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the password pool without blocking the event loop"""
+    return await password_executor.run(get_password_hash, password)
+
+
+async def get_password_hashes_async(passwords: List[str]) -> List[str]:
+    """Hash many passwords in parallel on the password pool"""
+    return await password_executor.map(get_password_hash, passwords)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -42,10 +76,28 @@ def create_refresh_token(data: dict) -> str:
     return encoded_jwt
 
 
-def decode_token(token: str) -> Optional[dict]:
-    """Decode and verify a JWT token"""
+def verify_token(token: str) -> Optional[dict]:
+    """Decode and verify a JWT token without the cache"""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         return payload
     except JWTError:
         return None
+
+
+def decode_token(token: str) -> Optional[dict]:
+    """Decode and verify a JWT token, reusing earlier verifications of the same token"""
+    if token_cache.max_size <= 0:
+        return verify_token(token)
+    
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = token_cache.get_nowait(key)
+    if payload is None:
+        payload = verify_token(token)
+        if payload is None:
+            return None
+        ttl = payload.get("exp", 0) - time.time()
+        if ttl <= 0:
+            return payload
+        token_cache.set_nowait(key, payload, ttl)
+    return dict(payload)
@@ -0,0 +1,22 @@
+"""
+Skill name normalization shared by the skills index and SQL skill filters
+
+Skills are compared case-insensitively with runs of whitespace collapsed,
+so "Machine  Learning" and "machine learning" are the same skill. The
+candidates.skills_normalized column stores normalize_skills(skills) so the
+SQL fallback of a skills search matches exactly what the in-memory index
+matches.
+"""
+import sys
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+
+@lru_cache(maxsize=65536)
+def normalize_skill(skill: str) -> str:
+    return sys.intern(" ".join(str(skill).split()).lower())
+
+
+def normalize_skills(skills: Optional[Iterable]) -> List[str]:
+    """Sorted distinct normalized skills; NULL skills are an empty list"""
+    return sorted({normalize_skill(skill) for skill in skills or ()})
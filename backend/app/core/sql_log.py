@@ -0,0 +1,117 @@
+"""
+Slow-query log and sampled SQL tracing
+
+Replaces echo=DEBUG. Every statement is timed via engine events; statements
+slower than SLOW_QUERY_THRESHOLD_MS are logged as warnings, and a random
+SQL_TRACE_SAMPLE_RATE fraction of all statements is logged as a trace.
+Bound parameters are never logged, only their count. Each entry names the
+API route that issued the query (set per request by QueryRouteMiddleware).
+
+The app never configures logging, and uvicorn only sets up its own loggers,
+so install_query_logging gives "app.sql" a stderr handler at INFO unless a
+deployment has configured logging itself; otherwise the traces (INFO) would
+be dropped.
+"""
+import logging
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_current_scope: ContextVar[Optional[dict]] = ContextVar("sql_log_scope", default=None)
+_whitespace = re.compile(r"\s+")
+
+
+def current_route() -> str:
+    """Route template of the request being served (e.g. GET /api/v1/candidates/profile)"""
+    scope = _current_scope.get()
+    if scope is None:
+        return "-"
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+def _param_count(parameters) -> int:
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return sum(len(item) for item in parameters)
+        return len(parameters)
+    if isinstance(parameters, dict):
+        return len(parameters)
+    return 0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start_time"].pop()) * 1000
+    slow = elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+    sampled = not slow and settings.SQL_TRACE_SAMPLE_RATE > 0 and random.random() < settings.SQL_TRACE_SAMPLE_RATE
+    if not (slow or sampled):
+        return
+
+    sql = _whitespace.sub(" ", statement).strip()
+    if slow:
+        logger.warning(
+            "slow query %.1f ms route=%s params=%d%s sql=%s",
+            elapsed_ms, current_route(), _param_count(parameters),
+            " executemany" if executemany else "", sql
+        )
+    else:
+        logger.info(
+            "sql trace %.1f ms route=%s params=%d%s sql=%s",
+            elapsed_ms, current_route(), _param_count(parameters),
+            " executemany" if executemany else "", sql
+        )
+
+
+def _handle_error(exception_context):
+    # Keep the timing stack balanced when a statement fails
+    starts = exception_context.connection.info.get("query_start_time") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def _configure_logger() -> None:
+    if logger.handlers or logging.getLogger().handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def install_query_logging(async_engine) -> None:
+    """Attach timing hooks to an AsyncEngine"""
+    _configure_logger()
+    sync_engine = async_engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+class QueryRouteMiddleware:
+    """ASGI middleware that lets query logs know which route they belong to"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        token = _current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_scope.reset(token)
@@ -4,7 +4,10 @@ Models package - exports all models for easy import
 from app.models.user import User, UserType
 from app.models.company import Company, CompanySize
 from app.models.candidate import Candidate
+from app.models.candidate_facet import CandidateFacetCount
 from app.models.nbfc import NBFCPartner
+from app.models.loan import Loan, LoanRepayment
+from app.models.portfolio_rollup import NBFCPortfolioDaily, RollupWatermark
 
 __all__ = [
     "User",
@@ -12,5 +15,10 @@ __all__ = [
     "Company",
     "CompanySize",
     "Candidate",
+    "CandidateFacetCount",
     "NBFCPartner",
+    "Loan",
+    "LoanRepayment",
+    "NBFCPortfolioDaily",
+    "RollupWatermark",
 ]
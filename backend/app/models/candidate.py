@@ -1,14 +1,27 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Numeric, Date, JSON
+from sqlalchemy import Column, String, DateTime, ForeignKey, Integer, Numeric, Date, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 from app.core.database import Base
+from app.core.money import Money
+from app.core.skills import normalize_skills
+
+
+def _normalized_skills(context):
+    return normalize_skills(context.get_current_parameters().get("skills"))
 
 
 class Candidate(Base):
     """Candidate profile model"""
     __tablename__ = "candidates"
+    __table_args__ = (
+        # Company candidate search (migrations 0002, 0006); the GIN index on skills_normalized is Postgres-only
+        Index("ix_candidates_created_at_id", text("created_at DESC"), text("id DESC")),
+        Index("ix_candidates_city_created_at_id", "city", text("created_at DESC"), text("id DESC")),
+        Index("ix_candidates_notice_experience", "notice_period_days", "experience_years"),
+        Index("ix_candidates_expected_ctc", "expected_ctc"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), unique=True, nullable=False)
@@ -19,11 +32,14 @@ class Candidate(Base):
     # Current employment details
     current_company = Column(String)
     current_designation = Column(String)
-    current_ctc = Column(Numeric(12, 2))  # Annual CTC
+    current_ctc = Column(Money)  # Annual CTC
     notice_period_days = Column(Integer)  # Notice period in days
     
     # Professional details
     skills = Column(JSON)  # Array of skills
+    # normalize_skills(skills), what skill searches match in SQL (migration 0006); set on
+    # insert, and by whoever updates skills
+    skills_normalized = Column(JSON, nullable=False, default=_normalized_skills, server_default="[]")
     experience_years = Column(Numeric(4, 1))
     highest_education = Column(String)
     
@@ -33,7 +49,7 @@ class Candidate(Base):
     kyc_verified_at = Column(DateTime(timezone=True))
     
     # Preferences
-    expected_ctc = Column(Numeric(12, 2))
+    expected_ctc = Column(Money)
     preferred_locations = Column(JSON)  # Array of locations
     job_type_preference = Column(String)  # full_time, contract, etc.
     open_to_buyout = Column(String, default="yes")
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Integer
+from app.core.database import Base
+
+
+class CandidateFacetCount(Base):
+    """Number of candidates per facet combination (see app.services.candidate_facets)"""
+    __tablename__ = "candidate_facet_counts"
+    
+    city = Column(String, primary_key=True)
+    notice_bucket = Column(String, primary_key=True)
+    experience_band = Column(String, primary_key=True)
+    open_to_buyout = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,71 @@
+from sqlalchemy import Column, String, Date, DateTime, ForeignKey, Integer, Numeric, Index
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import uuid
+from app.core.database import Base
+from app.core.money import Money
+
+
+class Loan(Base):
+    """Buyout loan from an NBFC partner to a candidate"""
+    __tablename__ = "loans"
+    __table_args__ = (
+        # Portfolio rollup refresh (migration 0005): a lender's loans and rows changed since the watermark
+        Index("ix_loans_nbfc_disbursement_date", "nbfc_id", "disbursement_date"),
+        Index("ix_loans_updated_at", "updated_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    nbfc_id = Column(UUID(as_uuid=True), ForeignKey("nbfc_partners.id"), nullable=False)
+    candidate_id = Column(UUID(as_uuid=True), ForeignKey("candidates.id"), nullable=False)
+
+    # Terms
+    principal_amount = Column(Money, nullable=False)
+    interest_rate = Column(Numeric(5, 2), nullable=False)  # Annual percent
+    tenure_months = Column(Integer, nullable=False)
+    emi_amount = Column(Money)
+
+    # applied, under_review, approved, disbursed, active, closed, defaulted
+    status = Column(String, nullable=False, default="applied")
+    disbursement_date = Column(Date)
+    first_emi_date = Column(Date)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set on insert too: the rollup refresh reads rows changed since its watermark
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    nbfc = relationship("NBFCPartner", backref="loans", foreign_keys=[nbfc_id])
+    candidate = relationship("Candidate", backref="loans", foreign_keys=[candidate_id])
+
+
+class LoanRepayment(Base):
+    """One scheduled EMI of a loan and what was paid against it"""
+    __tablename__ = "loan_repayments"
+    __table_args__ = (
+        Index("ix_loan_repayments_loan_id_emi_number", "loan_id", "emi_number", unique=True),
+        Index("ix_loan_repayments_due_date", "due_date"),
+        Index("ix_loan_repayments_updated_at", "updated_at"),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    loan_id = Column(UUID(as_uuid=True), ForeignKey("loans.id"), nullable=False)
+    emi_number = Column(Integer, nullable=False)
+    due_date = Column(Date, nullable=False)
+    paid_date = Column(Date)
+
+    amount_due = Column(Money, nullable=False)
+    interest_due = Column(Money, nullable=False)  # Interest part of amount_due, from the amortization schedule
+    amount_paid = Column(Money)
+
+    # pending, paid, overdue, waived
+    status = Column(String, nullable=False, default="pending")
+    payment_method = Column(String)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set on insert too: the rollup refresh reads rows changed since its watermark
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationship
+    loan = relationship("Loan", backref="repayments", foreign_keys=[loan_id])
@@ -4,6 +4,7 @@ from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 from app.core.database import Base
+from app.core.money import Money
 
 
 class NBFCPartner(Base):
@@ -27,8 +28,8 @@ class NBFCPartner(Base):
     # Loan product configuration
     interest_rate_min = Column(Numeric(5, 2))  # e.g., 10.50%
     interest_rate_max = Column(Numeric(5, 2))  # e.g., 18.00%
-    max_loan_amount = Column(Numeric(12, 2))
-    min_loan_amount = Column(Numeric(12, 2))
+    max_loan_amount = Column(Money)
+    min_loan_amount = Column(Money)
     max_tenure_months = Column(String, default="24")
     min_tenure_months = Column(String, default="6")
     
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Date, DateTime, BigInteger, Integer
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class NBFCPortfolioDaily(Base):
+    """Per-NBFC daily loan and repayment totals (see app.services.portfolio_rollups)
+
+    Loan columns count loans disbursed on day (principal_repaid totals their
+    EMIs, whenever due); repayment columns total the EMIs due on day. Amounts are integer paise.
+    """
+    __tablename__ = "nbfc_portfolio_daily"
+
+    nbfc_id = Column(UUID(as_uuid=True), primary_key=True)
+    day = Column(Date, primary_key=True)
+
+    loans_disbursed = Column(Integer, nullable=False, default=0)
+    loans_closed = Column(Integer, nullable=False, default=0)
+    loans_defaulted = Column(Integer, nullable=False, default=0)
+    principal_disbursed = Column(BigInteger, nullable=False, default=0)
+    principal_defaulted = Column(BigInteger, nullable=False, default=0)
+    principal_repaid = Column(BigInteger, nullable=False, default=0)
+
+    amount_due = Column(BigInteger, nullable=False, default=0)
+    amount_collected = Column(BigInteger, nullable=False, default=0)
+    amount_outstanding = Column(BigInteger, nullable=False, default=0)
+    principal_collected = Column(BigInteger, nullable=False, default=0)
+    interest_income = Column(BigInteger, nullable=False, default=0)
+    defaulted_due = Column(BigInteger, nullable=False, default=0)
+    defaulted_collected = Column(BigInteger, nullable=False, default=0)
+
+
+class RollupWatermark(Base):
+    """Start time of the last refresh of a rollup; rows changed since then are applied next"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=False)
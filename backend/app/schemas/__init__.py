@@ -17,13 +17,37 @@ from app.schemas.candidate import (
     CandidateCreate,
     CandidateUpdate,
     CandidateResponse,
+    CandidateSearchResult,
+    CandidateSearchResponse,
+    CandidateTextSearchResult,
+    CandidateTextSearchResponse,
+    JobMatchRequest,
+    CandidateMatchResult,
+    CandidateMatchResponse,
+    CandidateFacetsResponse,
     BuyoutCalculation,
-    BuyoutCalculationResponse
+    BuyoutCalculationResponse,
+    BuyoutBatchRow,
+    BuyoutBatchRequest
+)
+from app.schemas.loan import (
+    LoanTerms,
+    LoanPortfolioRequest,
+    LoanQuoteRequest,
+    LoanOffer,
+    LoanQuoteResponse
 )
 from app.schemas.nbfc import (
     NBFCCreate,
     NBFCUpdate,
-    NBFCResponse
+    NBFCResponse,
+    PortfolioAnalyticsResponse,
+    RiskLoan,
+    RiskSimulationRequest,
+    RiskTailMetrics,
+    RiskHistogramBin,
+    RiskSimulationResult,
+    RiskSimulationJob
 )
 
 __all__ = [
@@ -38,9 +62,31 @@ __all__ = [
     "CandidateCreate",
     "CandidateUpdate",
     "CandidateResponse",
+    "CandidateSearchResult",
+    "CandidateSearchResponse",
+    "CandidateTextSearchResult",
+    "CandidateTextSearchResponse",
+    "JobMatchRequest",
+    "CandidateMatchResult",
+    "CandidateMatchResponse",
+    "CandidateFacetsResponse",
     "BuyoutCalculation",
     "BuyoutCalculationResponse",
+    "BuyoutBatchRow",
+    "BuyoutBatchRequest",
+    "LoanTerms",
+    "LoanPortfolioRequest",
+    "LoanQuoteRequest",
+    "LoanOffer",
+    "LoanQuoteResponse",
     "NBFCCreate",
     "NBFCUpdate",
     "NBFCResponse",
+    "PortfolioAnalyticsResponse",
+    "RiskLoan",
+    "RiskSimulationRequest",
+    "RiskTailMetrics",
+    "RiskHistogramBin",
+    "RiskSimulationResult",
+    "RiskSimulationJob",
 ]
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, Optional, List
 from datetime import datetime, date
 from uuid import UUID
 from decimal import Decimal
 
+from app.core.money import Paise
+
 
 class CandidateBase(BaseModel):
     """Base candidate schema"""
@@ -11,7 +13,7 @@ class CandidateBase(BaseModel):
     phone: str = Field(..., min_length=10, max_length=15)
     current_company: Optional[str] = None
     current_designation: Optional[str] = None
-    current_ctc: Optional[Decimal] = Field(None, ge=0)
+    current_ctc: Optional[Paise] = None
     notice_period_days: Optional[int] = Field(None, ge=0, le=365)
     experience_years: Optional[Decimal] = Field(None, ge=0, le=50)
     city: Optional[str] = None
@@ -23,7 +25,7 @@ class CandidateCreate(CandidateBase):
     date_of_birth: Optional[date] = None
     skills: Optional[List[str]] = []
     highest_education: Optional[str] = None
-    expected_ctc: Optional[Decimal] = Field(None, ge=0)
+    expected_ctc: Optional[Paise] = None
     preferred_locations: Optional[List[str]] = []
     open_to_buyout: bool = True
 
@@ -34,11 +36,11 @@ class CandidateUpdate(BaseModel):
     phone: Optional[str] = Field(None, min_length=10, max_length=15)
     current_company: Optional[str] = None
     current_designation: Optional[str] = None
-    current_ctc: Optional[Decimal] = Field(None, ge=0)
+    current_ctc: Optional[Paise] = None
     notice_period_days: Optional[int] = Field(None, ge=0, le=365)
     experience_years: Optional[Decimal] = Field(None, ge=0, le=50)
     skills: Optional[List[str]] = None
-    expected_ctc: Optional[Decimal] = Field(None, ge=0)
+    expected_ctc: Optional[Paise] = None
     preferred_locations: Optional[List[str]] = None
     city: Optional[str] = None
     state: Optional[str] = None
@@ -52,7 +54,7 @@ class CandidateResponse(CandidateBase):
     date_of_birth: Optional[date]
     skills: Optional[List[str]]
     highest_education: Optional[str]
-    expected_ctc: Optional[Decimal]
+    expected_ctc: Optional[Paise]
     preferred_locations: Optional[List[str]]
     kyc_verified_at: Optional[datetime]
     created_at: datetime
@@ -61,15 +63,99 @@ class CandidateResponse(CandidateBase):
         from_attributes = True
 
 
+class CandidateSearchResult(BaseModel):
+    """Candidate card shown in company search results"""
+    id: UUID
+    full_name: str
+    current_designation: Optional[str]
+    current_company: Optional[str]
+    city: Optional[str]
+    skills: Optional[List[str]]
+    experience_years: Optional[Decimal]
+    notice_period_days: Optional[int]
+    current_ctc: Optional[Paise]
+    expected_ctc: Optional[Paise]
+    open_to_buyout: Optional[bool]
+    
+    class Config:
+        from_attributes = True
+
+
+class CandidateSearchResponse(BaseModel):
+    """Schema for a page of candidate search results"""
+    results: List[CandidateSearchResult]
+    next_cursor: Optional[str] = None
+
+
+class CandidateTextSearchResult(CandidateSearchResult):
+    """Candidate card with its fuzzy-match score"""
+    score: float
+
+
+class CandidateTextSearchResponse(BaseModel):
+    """Schema for ranked name/designation/company search results"""
+    results: List[CandidateTextSearchResult]
+
+
+class JobMatchRequest(BaseModel):
+    """Schema for an opening to match candidates against"""
+    skills: List[str] = Field(default_factory=list, max_length=50)
+    min_ctc: Optional[Paise] = None
+    max_ctc: Optional[Paise] = None
+    max_notice_period_days: Optional[int] = Field(None, ge=0)
+    min_experience: Optional[Decimal] = Field(None, ge=0)
+    max_experience: Optional[Decimal] = Field(None, ge=0)
+    city: Optional[str] = None
+    limit: int = Field(20, ge=1, le=100)
+
+
+class CandidateMatchResult(CandidateSearchResult):
+    """Candidate card with its match score"""
+    score: float
+
+
+class CandidateMatchResponse(BaseModel):
+    """Schema for the best matches for an opening"""
+    results: List[CandidateMatchResult]
+
+
+class CandidateFacetsResponse(BaseModel):
+    """Schema for candidate counts per facet value"""
+    total: int
+    city: Dict[str, int]
+    notice_bucket: Dict[str, int]
+    experience_band: Dict[str, int]
+    open_to_buyout: Dict[str, int]
+
+
 class BuyoutCalculation(BaseModel):
     """Schema for buyout calculation request"""
-    current_monthly_salary: Decimal = Field(..., ge=0)
+    current_monthly_salary: Paise
     notice_period_days: int = Field(..., ge=0, le=365)
 
 
 class BuyoutCalculationResponse(BaseModel):
     """Schema for buyout calculation response"""
-    buyout_amount: Decimal
+    buyout_amount: Paise
     notice_period_days: int
-    monthly_salary: Decimal
-    daily_salary: Decimal
+    monthly_salary: Paise
+    daily_salary: Paise
+
+
+class BuyoutBatchRow(BuyoutCalculation):
+    """One row of a batch buyout calculation"""
+    ref: Optional[str] = Field(None, max_length=100)
+
+
+class BuyoutBatchRequest(BaseModel):
+    """Schema for batch buyout and EMI calculation"""
+    rows: List[BuyoutBatchRow] = Field(..., min_length=1, max_length=100_000)
+    tenures: List[int] = Field(default_factory=lambda: [6, 12, 18, 24, 36], min_length=1, max_length=12)
+    annual_interest_rate: Decimal = Field(Decimal("12"), ge=0, le=100)
+
+    @field_validator("tenures")
+    @classmethod
+    def validate_tenures(cls, tenures: List[int]) -> List[int]:
+        if any(months < 1 or months > 360 for months in tenures):
+            raise ValueError("Tenures must be between 1 and 360 months")
+        return tenures
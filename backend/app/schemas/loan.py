@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from uuid import UUID
+from decimal import Decimal
+
+from app.core.money import Paise
+
+
+class LoanTerms(BaseModel):
+    """Principal, annual interest rate and tenure of a loan"""
+    ref: Optional[str] = Field(None, max_length=100)
+    principal: Paise
+    annual_interest_rate: Decimal = Field(..., ge=0, le=100)
+    tenure_months: int = Field(..., ge=1, le=360)
+
+
+class LoanPortfolioRequest(BaseModel):
+    """Schema for aggregating the schedules of many loans"""
+    loans: List[LoanTerms] = Field(..., min_length=1, max_length=100_000)
+
+
+class LoanQuoteRequest(BaseModel):
+    """Schema for loan offers on a buyout amount"""
+    amount: Paise = Field(..., gt=0)
+    tenure_months: int = Field(12, ge=1, le=360)
+    monthly_salary: Optional[Paise] = Field(None, gt=0, description="Adds the EMI-to-salary ratio to each offer")
+
+
+class LoanOffer(BaseModel):
+    """One partner's offer"""
+    nbfc_id: UUID
+    nbfc_name: str
+    annual_interest_rate: Decimal
+    tenure_months: int
+    emi: Paise
+    total_interest: Paise
+    total_repayment: Paise
+    emi_to_salary: Optional[float] = None
+    affordable: Optional[bool] = None
+
+
+class LoanQuoteResponse(BaseModel):
+    """Schema for ranked loan offers, lowest EMI first"""
+    offers: List[LoanOffer]
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field
-from typing import Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+from datetime import date, datetime
 from uuid import UUID
 from decimal import Decimal
 
+from app.core.money import Paise
+
 
 class NBFCBase(BaseModel):
     """Base NBFC schema"""
@@ -21,8 +23,8 @@ class NBFCCreate(NBFCBase):
     """Schema for NBFC profile creation"""
     interest_rate_min: Optional[Decimal] = Field(None, ge=0, le=100)
     interest_rate_max: Optional[Decimal] = Field(None, ge=0, le=100)
-    max_loan_amount: Optional[Decimal] = Field(None, ge=0)
-    min_loan_amount: Optional[Decimal] = Field(None, ge=0)
+    max_loan_amount: Optional[Paise] = None
+    min_loan_amount: Optional[Paise] = None
 
 
 class NBFCUpdate(BaseModel):
@@ -36,8 +38,8 @@ class NBFCUpdate(BaseModel):
     state: Optional[str] = None
     interest_rate_min: Optional[Decimal] = Field(None, ge=0, le=100)
     interest_rate_max: Optional[Decimal] = Field(None, ge=0, le=100)
-    max_loan_amount: Optional[Decimal] = Field(None, ge=0)
-    min_loan_amount: Optional[Decimal] = Field(None, ge=0)
+    max_loan_amount: Optional[Paise] = None
+    min_loan_amount: Optional[Paise] = None
 
 
 class NBFCResponse(NBFCBase):
@@ -46,11 +48,106 @@ class NBFCResponse(NBFCBase):
     user_id: UUID
     interest_rate_min: Optional[Decimal]
     interest_rate_max: Optional[Decimal]
-    max_loan_amount: Optional[Decimal]
-    min_loan_amount: Optional[Decimal]
+    max_loan_amount: Optional[Paise]
+    min_loan_amount: Optional[Paise]
     verified_at: Optional[datetime]
     is_active: bool
     created_at: datetime
     
     class Config:
         from_attributes = True
+
+
+class PortfolioAnalyticsResponse(BaseModel):
+    """Loan performance of an NBFC's portfolio, from the daily rollups"""
+    nbfc_id: UUID
+    from_date: Optional[date]
+    to_date: Optional[date]
+    as_of: datetime  # Rollups include loan and repayment changes up to about this time
+    loans_disbursed: int
+    active_loans: int
+    loans_closed: int
+    loans_defaulted: int
+    principal_disbursed: Paise
+    outstanding_principal: Paise
+    interest_income: Paise
+    amount_due: Paise
+    amount_collected: Paise
+    overdue_amount: Paise
+    default_rate: Optional[float]
+    recovery_rate: Optional[float]
+    collection_efficiency: Optional[float]
+    health: str  # healthy, watch, at_risk or no_data
+
+
+class RiskLoan(BaseModel):
+    """One loan of a portfolio to simulate; assumptions left out use the request's"""
+    principal: Paise = Field(..., gt=0)
+    annual_interest_rate: Decimal = Field(..., ge=0, le=100)
+    tenure_months: int = Field(..., ge=1, le=360)
+    default_probability: Optional[float] = Field(None, ge=0, le=1)
+    loss_given_default: Optional[float] = Field(None, ge=0, le=1)
+
+
+class RiskSimulationRequest(BaseModel):
+    """Schema for a Monte Carlo loss simulation over explicit or sampled loans"""
+    loans: Optional[List[RiskLoan]] = Field(None, min_length=1, max_length=10_000)
+    sample_loans: Optional[int] = Field(
+        None, ge=1, le=10_000,
+        description="Simulate this many loans drawn from the NBFC's loan amount, rate and tenure ranges"
+    )
+    default_probability: float = Field(0.05, ge=0, le=1, description="Probability a loan defaults over its tenure")
+    loss_given_default: float = Field(0.6, ge=0, le=1, description="Share of the outstanding balance lost on default")
+    correlation: float = Field(0.15, ge=0, lt=1, description="Asset correlation with the systemic factor")
+    scenarios: int = Field(100_000, ge=1000, le=1_000_000)
+    seed: Optional[int] = Field(None, ge=0, le=2 ** 63 - 1, description="Repeat a run; random if not given")
+
+    @model_validator(mode="after")
+    def one_portfolio(self):
+        if (self.loans is None) == (self.sample_loans is None):
+            raise ValueError("Give either loans or sample_loans")
+        return self
+
+
+class RiskTailMetrics(BaseModel):
+    """Loss at a confidence level"""
+    confidence: float
+    value_at_risk: Paise  # Scenarios lose at most this much with the given confidence
+    expected_shortfall: Paise  # Average loss of the scenarios at or beyond value_at_risk
+
+
+class RiskHistogramBin(BaseModel):
+    """Scenarios losing between loss_from and loss_to"""
+    loss_from: Paise
+    loss_to: Paise
+    scenarios: int
+
+
+class RiskSimulationResult(BaseModel):
+    """Simulated loss distribution of a portfolio"""
+    exposure: Paise
+    expected_loss: Paise
+    loss_std_dev: Paise
+    expected_loss_rate: Optional[float]  # Expected loss over exposure
+    max_loss: Paise
+    tail: List[RiskTailMetrics]
+    histogram: List[RiskHistogramBin]
+    elapsed_seconds: float
+    workers: int
+
+
+class RiskSimulationJob(BaseModel):
+    """A background risk simulation and, once completed, its result"""
+    id: str
+    status: str  # queued, running, completed or failed
+    loans: int
+    scenarios: int
+    scenarios_done: int
+    progress: float  # 0-1
+    seed: int
+    correlation: float
+    created_at: datetime
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    error: Optional[str]
+    result: Optional[RiskSimulationResult]
@@ -0,0 +1,3 @@
+"""
+Services package - business logic shared by the API routers
+"""
@@ -0,0 +1,222 @@
+"""
+EMI amortization schedules
+
+amortization_schedule yields a loan's schedule one month at a time. Each
+month's interest is the opening balance times the monthly rate, rounded to
+the paisa, and the rest of the EMI repays principal; the final instalment
+absorbs the rounding so the loan closes at exactly zero. Balances are
+integer paise (app.core.money) and only the interest is computed in
+Decimal.
+
+Completed schedules are memoized per (principal, rate, tenure) in a
+per-worker LRU holding at most LOAN_SCHEDULE_CACHE_ROWS rows in total:
+calculator traffic asks for the same handful of quotes over and over. The
+bound is on rows, not schedules, because a 30-year schedule is 360 rows
+and the endpoint is public. A consumer that stops early simply leaves
+nothing in the cache.
+
+aggregate_schedules sums many loans' schedules month by month. Loans with
+identical terms share one schedule walk, and only one running total per
+month is held, never every loan's schedule. The work is one schedule row
+per month of each distinct loan (schedule_months), which callers cap
+before walking. It reuses memoized schedules but never adds to the memo,
+so a large portfolio of one-off terms cannot flush the quotes calculator
+traffic keeps asking for.
+"""
+import csv
+import io
+import json
+from collections import Counter, OrderedDict
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.core.money import Paise
+from app.services.loan_math import calculate_emi_paise
+
+Terms = Tuple[Paise, Decimal, int]
+
+
+class ScheduleRow(NamedTuple):
+    month: int
+    opening_balance: Paise
+    emi: Paise
+    principal: Paise
+    interest: Paise
+    closing_balance: Paise
+
+
+class PortfolioRow(NamedTuple):
+    month: int
+    active_loans: int
+    opening_balance: Paise
+    emi: Paise
+    principal: Paise
+    interest: Paise
+    closing_balance: Paise
+
+
+class ScheduleCache:
+    """LRU of completed schedules bounded by their total row count
+
+    Schedules never change for given terms, so entries only leave by
+    eviction; there is no TTL.
+    """
+
+    def __init__(self, max_rows: int):
+        self.max_rows = max_rows
+        self.rows = 0
+        self._data: "OrderedDict[str, Tuple[ScheduleRow, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_nowait(self, key: str) -> Optional[Tuple[ScheduleRow, ...]]:
+        schedule = self._data.get(key)
+        if schedule is None:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return schedule
+
+    def set_nowait(self, key: str, schedule: Tuple[ScheduleRow, ...]) -> None:
+        if len(schedule) > self.max_rows:
+            return
+        previous = self._data.pop(key, None)
+        if previous is not None:
+            self.rows -= len(previous)
+        self._data[key] = schedule
+        self.rows += len(schedule)
+        while self.rows > self.max_rows:
+            _, evicted = self._data.popitem(last=False)
+            self.rows -= len(evicted)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": "memory",
+            "size": len(self._data),
+            "rows": self.rows,
+            "max_rows": self.max_rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+schedule_cache = ScheduleCache(max_rows=settings.LOAN_SCHEDULE_CACHE_ROWS)
+
+
+def loan_terms(principal: Paise, annual_rate: Decimal, months: int) -> Terms:
+    """Canonical (principal, rate, tenure) used as the memoization key"""
+    if principal < 0:
+        raise ValueError("Principal must not be negative")
+    if months <= 0:
+        raise ValueError("Tenure must be at least one month")
+    return Paise(principal), Decimal(annual_rate).normalize(), int(months)
+
+
+def _amortize(principal: Paise, annual_rate: Decimal, months: int) -> Iterator[ScheduleRow]:
+    # Plain ints in the loop: Paise arithmetic goes through Python-level methods
+    emi = int(calculate_emi_paise(principal, annual_rate, months))
+    monthly_rate = annual_rate / Decimal(1200)
+    balance = int(principal)
+    for month in range(1, months + 1):
+        # Same half-even rounding to the paisa as round(rupees * rate, 2)
+        interest = int((balance * monthly_rate).to_integral_value(rounding=ROUND_HALF_EVEN))
+        if month == months:
+            repaid = balance
+        else:
+            repaid = min(emi - interest, balance)
+        closing = balance - repaid
+        yield ScheduleRow(
+            month, Paise(balance), Paise(repaid + interest), Paise(repaid), Paise(interest), Paise(closing)
+        )
+        balance = closing
+
+
+def amortization_schedule(
+    principal: Paise, annual_rate: Decimal, months: int, memoize: bool = True
+) -> Iterator[ScheduleRow]:
+    """Month-by-month schedule of a loan, computed lazily and (if memoize) memoized once complete"""
+    terms = loan_terms(principal, annual_rate, months)
+    key = ":".join(str(term) for term in terms)
+    cached = schedule_cache.get_nowait(key)
+    if cached is not None:
+        yield from cached
+        return
+    if not memoize:
+        yield from _amortize(*terms)
+        return
+
+    rows = []
+    for row in _amortize(*terms):
+        rows.append(row)
+        yield row
+    schedule_cache.set_nowait(key, tuple(rows))
+
+
+def count_terms(loans: Iterable[Terms]) -> "Counter[Terms]":
+    """Loans per distinct (canonical) terms"""
+    return Counter(loan_terms(*terms) for terms in loans)
+
+
+def schedule_months(counts: "Counter[Terms]") -> int:
+    """Schedule rows a portfolio walk computes: one per month of each distinct loan"""
+    return sum(months for _, _, months in counts)
+
+
+def aggregate_schedules(loans: Iterable[Terms]) -> Iterator[PortfolioRow]:
+    """Month-by-month totals over the schedules of many loans"""
+    return aggregate_term_counts(count_terms(loans))
+
+
+def aggregate_term_counts(counts: "Counter[Terms]") -> Iterator[PortfolioRow]:
+    """aggregate_schedules over terms already counted with count_terms"""
+    if not counts:
+        return
+    horizon = max(months for _, _, months in counts)
+    totals = [[0] * 6 for _ in range(horizon)]
+
+    for terms, count in counts.items():
+        for month, opening, emi, principal, interest, closing in amortization_schedule(*terms, memoize=False):
+            total = totals[month - 1]
+            # int() first: arithmetic on Paise goes through Python-level methods
+            total[0] += count
+            total[1] += int(opening) * count
+            total[2] += int(emi) * count
+            total[3] += int(principal) * count
+            total[4] += int(interest) * count
+            total[5] += int(closing) * count
+
+    for month, (active, *amounts) in enumerate(totals, start=1):
+        yield PortfolioRow(month, active, *(Paise(amount) for amount in amounts))
+
+
+def render_ndjson(rows: Iterable[NamedTuple], chunk_rows: int = 500) -> Iterator[str]:
+    """NDJSON lines in chunks; amounts become rupee strings as in the JSON API"""
+    chunk = []
+    for row in rows:
+        chunk.append(json.dumps({
+            field: str(value) if isinstance(value, (Paise, Decimal)) else value
+            for field, value in row._asdict().items()
+        }))
+        if len(chunk) == chunk_rows:
+            yield "\n".join(chunk) + "\n"
+            chunk = []
+    if chunk:
+        yield "\n".join(chunk) + "\n"
+
+
+def render_csv(rows: Iterable[NamedTuple], fields: Tuple[str, ...], chunk_rows: int = 500) -> Iterator[str]:
+    """CSV with a header row, in chunks"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(row)
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
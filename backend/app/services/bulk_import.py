@@ -0,0 +1,225 @@
+"""
+Bulk user provisioning
+
+Rows come from CSV or NDJSON. Each row holds email, password and user_type,
+plus optional profile columns for that user type (the same fields as
+CandidateCreate, CompanyCreate or NBFCCreate). Rows are validated in
+batches, passwords are hashed in parallel on the password pool, and users
+and profiles are written with multi-row INSERTs. A bad row is reported with
+its line number and skipped; it never aborts the rest of the import. Each
+batch commits on its own, so if the password pool sheds load mid-import
+only that batch's rows are reported as failed (safe to resend) and the
+import carries on with the next batch.
+"""
+import csv
+import io
+import json
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.executor import PasswordHashQueueFull
+from app.core.security import get_password_hashes_async
+from app.models import User, Company, Candidate, NBFCPartner, UserType
+from app.schemas.user import UserCreate
+from app.schemas.company import CompanyCreate
+from app.schemas.candidate import CandidateCreate
+from app.schemas.nbfc import NBFCCreate
+from app.services.candidate_facets import count_new_candidates, invalidate_facet_cache
+
+USER_FIELDS = ("email", "password", "user_type")
+LIST_FIELDS = ("skills", "preferred_locations")
+
+PROFILE_TYPES = {
+    UserType.COMPANY: (CompanyCreate, Company),
+    UserType.CANDIDATE: (CandidateCreate, Candidate),
+    UserType.NBFC: (NBFCCreate, NBFCPartner),
+}
+
+
+def parse_csv(text: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, row) pairs; list columns are separated by ';'"""
+    reader = csv.DictReader(io.StringIO(text))
+    for row in reader:
+        cleaned = {}
+        for key, value in row.items():
+            if key is None or value is None or value.strip() == "":
+                continue
+            key = key.strip()
+            value = value.strip()
+            if key in LIST_FIELDS:
+                cleaned[key] = [item.strip() for item in value.split(";") if item.strip()]
+            else:
+                cleaned[key] = value
+        yield reader.line_num, cleaned
+
+
+def parse_ndjson(text: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, row) pairs; malformed lines yield an error marker"""
+    for line_num, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            row = {"__error__": f"Invalid JSON: {e.msg}"}
+        if not isinstance(row, dict):
+            row = {"__error__": "Each line must be a JSON object"}
+        yield line_num, row
+
+
+def _format_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+def _validate_row(row: Dict[str, Any]) -> Tuple[Optional[UserCreate], Optional[BaseModel], List[str]]:
+    """Validate a row against UserCreate and, if profile columns are present, the profile schema"""
+    if "__error__" in row:
+        return None, None, [row["__error__"]]
+    try:
+        user = UserCreate(**{key: row.get(key) for key in USER_FIELDS})
+    except ValidationError as e:
+        return None, None, _format_errors(e)
+
+    profile_data = {key: value for key, value in row.items() if key not in USER_FIELDS}
+    if not profile_data or user.user_type not in PROFILE_TYPES:
+        return user, None, []
+
+    schema, _ = PROFILE_TYPES[user.user_type]
+    try:
+        return user, schema(**profile_data), []
+    except ValidationError as e:
+        return None, None, _format_errors(e)
+
+
+def _profile_values(profile: BaseModel, user_id: uuid.UUID) -> Dict[str, Any]:
+    values = profile.model_dump()
+    if "open_to_buyout" in values:
+        values["open_to_buyout"] = "yes" if values["open_to_buyout"] else "no"
+    values["id"] = uuid.uuid4()
+    values["user_id"] = user_id
+    return values
+
+
+async def _insert_batch(db: AsyncSession, user_rows: List[dict], profile_rows: Dict[type, List[dict]]) -> None:
+    await db.execute(insert(User), user_rows)
+    for model, rows in profile_rows.items():
+        if rows:
+            await db.execute(insert(model), rows)
+            if model is Candidate:
+                await count_new_candidates(db, rows)
+
+
+async def import_users(db: AsyncSession, rows: Iterator[Tuple[int, Dict[str, Any]]], batch_size: int = 500) -> Dict[str, Any]:
+    """Validate, hash and insert rows batch by batch, collecting per-row errors"""
+    summary = {"total": 0, "created": 0, "failed": 0, "errors": []}
+    seen_emails = set()
+
+    def fail(line: int, email: Optional[str], errors: List[str]) -> None:
+        summary["failed"] += 1
+        summary["errors"].append({"line": line, "email": email, "errors": errors})
+
+    batch = []
+    for line, row in rows:
+        summary["total"] += 1
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            await _import_batch(db, batch, seen_emails, summary, fail)
+            batch = []
+    if batch:
+        await _import_batch(db, batch, seen_emails, summary, fail)
+
+    invalidate_facet_cache()
+    summary["errors"].sort(key=lambda error: error["line"])
+    return summary
+
+
+async def _import_batch(db: AsyncSession, batch, seen_emails: set, summary: dict, fail) -> None:
+    valid = []
+    for line, row in batch:
+        user, profile, errors = _validate_row(row)
+        if errors:
+            fail(line, row.get("email"), errors)
+        elif user.email in seen_emails:
+            fail(line, user.email, ["email: Duplicate email in import"])
+        else:
+            seen_emails.add(user.email)
+            valid.append((line, user, profile))
+
+    if not valid:
+        return
+
+    # One query to find emails that are already registered
+    result = await db.execute(
+        select(User.email).where(User.email.in_([user.email for _, user, _ in valid]))
+    )
+    existing = set(result.scalars().all())
+    fresh = []
+    for line, user, profile in valid:
+        if user.email in existing:
+            fail(line, user.email, ["email: Email already registered"])
+        else:
+            fresh.append((line, user, profile))
+
+    if not fresh:
+        return
+
+    try:
+        hashes = await get_password_hashes_async([user.password for _, user, _ in fresh])
+    except PasswordHashQueueFull:
+        for line, user, _ in fresh:
+            fail(line, user.email, ["password: Server busy hashing passwords, retry this row"])
+        return
+
+    prepared = []
+    for (line, user, profile), password_hash in zip(fresh, hashes):
+        user_id = uuid.uuid4()
+        user_row = {
+            "id": user_id,
+            "email": user.email,
+            "password_hash": password_hash,
+            "user_type": user.user_type,
+            "is_verified": False,
+            "is_active": True,
+        }
+        profile_row = None
+        if profile is not None:
+            _, model = PROFILE_TYPES[user.user_type]
+            profile_row = (model, _profile_values(profile, user_id))
+        prepared.append((line, user.email, user_row, profile_row))
+
+    try:
+        async with db.begin_nested():
+            await _insert_batch(
+                db,
+                [user_row for _, _, user_row, _ in prepared],
+                _group_profiles(prepared)
+            )
+        summary["created"] += len(prepared)
+    except Exception:
+        # A constraint failed somewhere in the batch (e.g. duplicate GSTIN);
+        # retry row by row so only the offending rows are rejected
+        for line, email, user_row, profile_row in prepared:
+            try:
+                async with db.begin_nested():
+                    await _insert_batch(db, [user_row], _group_profiles([(line, email, user_row, profile_row)]))
+                summary["created"] += 1
+            except Exception as e:
+                fail(line, email, [str(getattr(e, "orig", e))])
+
+    await db.commit()
+
+
+def _group_profiles(prepared) -> Dict[type, List[dict]]:
+    grouped: Dict[type, List[dict]] = {}
+    for _, _, _, profile_row in prepared:
+        if profile_row is not None:
+            model, values = profile_row
+            grouped.setdefault(model, []).append(values)
+    return grouped
@@ -0,0 +1,218 @@
+"""
+Candidate facet counts for the search sidebar
+
+candidate_facet_counts holds one row per combination of city, notice
+bucket, experience band and open_to_buyout with the number of candidates
+in it. The candidate profile handlers move a candidate between rows in the
+same transaction as the profile write, so the table is always exact; a
+full rebuild (`python init_db.py --rebuild-facets` or
+POST /admin/facets/rebuild) repairs it after out-of-band changes.
+
+Serving counts reads the whole table (a few hundred rows at most) and
+sums it in memory. Counts for each facet apply every selected filter
+except that facet's own, so other values of a selected facet stay visible.
+
+Stale reads: a worker caches the table for FACET_CACHE_TTL_SECONDS and
+drops its copy after its own candidate writes, so counts lag writes made
+through another worker by at most FACET_CACHE_TTL_SECONDS, plus replica
+lag when DATABASE_REPLICA_URLS is set. Filters other than these four
+facets (skills, CTC) are not reflected in the counts.
+"""
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, delete, func, select, text
+
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.models import Candidate, CandidateFacetCount
+from app.services.candidate_search import BUYOUT_NO, BUYOUT_YES
+
+FACETS = ("city", "notice_bucket", "experience_band", "open_to_buyout")
+UNKNOWN = "unknown"
+NOTICE_BUCKETS = ("0", "30", "60", "90+")
+EXPERIENCE_BANDS = ("0-2", "2-5", "5-10", "10+")
+
+# Candidate fields that decide a candidate's facet row
+SOURCE_COLUMNS = (
+    Candidate.city,
+    Candidate.notice_period_days,
+    Candidate.experience_years,
+    Candidate.open_to_buyout,
+)
+SOURCE_FIELDS = frozenset(column.key for column in SOURCE_COLUMNS)
+
+Cell = Tuple[str, str, str, str]
+
+facet_cache = MemoryCache(max_size=1, ttl_seconds=settings.FACET_CACHE_TTL_SECONDS)
+
+
+def notice_bucket(days: Optional[int]) -> str:
+    if days is None:
+        return UNKNOWN
+    if days <= 0:
+        return "0"
+    if days <= 30:
+        return "30"
+    if days <= 60:
+        return "60"
+    return "90+"
+
+
+def experience_band(years) -> str:
+    if years is None:
+        return UNKNOWN
+    if years < 2:
+        return "0-2"
+    if years < 5:
+        return "2-5"
+    if years < 10:
+        return "5-10"
+    return "10+"
+
+
+def buyout_value(value) -> str:
+    if value is None:
+        return UNKNOWN
+    if str(value) in BUYOUT_YES:
+        return "yes"
+    if str(value) in BUYOUT_NO:
+        return "no"
+    return UNKNOWN
+
+
+def _cell(city, notice_period_days, experience_years, open_to_buyout) -> Cell:
+    return (
+        (city or "").strip() or UNKNOWN,
+        notice_bucket(notice_period_days),
+        experience_band(experience_years),
+        buyout_value(open_to_buyout),
+    )
+
+
+def facet_cell(row) -> Cell:
+    """Facet row of a candidate (ORM object or row with SOURCE_COLUMNS)"""
+    return _cell(row.city, row.notice_period_days, row.experience_years, row.open_to_buyout)
+
+
+def facet_cell_of_values(values: dict) -> Cell:
+    """Facet row of a candidate given as a dict of column values"""
+    return _cell(*(values.get(field) for field in ("city", "notice_period_days", "experience_years", "open_to_buyout")))
+
+
+def _upsert(db, rows: list):
+    if db.bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    statement = insert(CandidateFacetCount).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=list(FACETS),
+        set_={"count": CandidateFacetCount.count + statement.excluded.count}
+    )
+
+
+async def add_facet_counts(db, deltas: Dict[Cell, int]) -> None:
+    """Add deltas to facet rows in db's transaction, in one statement"""
+    rows = [{**dict(zip(FACETS, cell)), "count": delta} for cell, delta in deltas.items() if delta]
+    if rows:
+        await db.execute(_upsert(db, rows))
+
+
+async def apply_facet_change(db, old: Optional[Cell], new: Optional[Cell]) -> None:
+    """Move one candidate from facet row old to new (either may be None) in db's transaction"""
+    if old == new:
+        return
+    deltas = {}
+    if old is not None:
+        deltas[old] = -1
+    if new is not None:
+        deltas[new] = 1
+    await add_facet_counts(db, deltas)
+
+
+async def count_new_candidates(db, rows: Iterable[dict]) -> None:
+    """Count candidates inserted in bulk (dicts of column values)"""
+    await add_facet_counts(db, Counter(facet_cell_of_values(values) for values in rows))
+
+
+def invalidate_facet_cache() -> None:
+    facet_cache.delete_nowait("cells")
+
+
+async def rebuild_facet_counts(db) -> int:
+    """Recount every facet row from the candidates table; returns the number of rows"""
+    if db.bind.dialect.name == "postgresql":
+        # Profile writes queue behind the rebuild, then apply their deltas to the new counts
+        await db.execute(text("LOCK TABLE candidate_facet_counts IN EXCLUSIVE MODE"))
+
+    days, years = Candidate.notice_period_days, Candidate.experience_years
+    cells = select(
+        func.coalesce(func.nullif(func.trim(Candidate.city), ""), UNKNOWN).label("city"),
+        case(
+            (days.is_(None), UNKNOWN), (days <= 0, "0"), (days <= 30, "30"), (days <= 60, "60"),
+            else_="90+"
+        ).label("notice_bucket"),
+        case(
+            (years.is_(None), UNKNOWN), (years < 2, "0-2"), (years < 5, "2-5"), (years < 10, "5-10"),
+            else_="10+"
+        ).label("experience_band"),
+        case(
+            (Candidate.open_to_buyout.in_(BUYOUT_YES), "yes"), (Candidate.open_to_buyout.in_(BUYOUT_NO), "no"),
+            else_=UNKNOWN
+        ).label("open_to_buyout"),
+    ).subquery()
+    counts = select(*(cells.c[facet] for facet in FACETS), func.count()).group_by(
+        *(cells.c[facet] for facet in FACETS)
+    )
+
+    await db.execute(delete(CandidateFacetCount))
+    result = await db.execute(
+        CandidateFacetCount.__table__.insert().from_select([*FACETS, "count"], counts)
+    )
+    await db.commit()
+    invalidate_facet_cache()
+    return result.rowcount
+
+
+async def _load_cells(db) -> Dict[Cell, int]:
+    cells = facet_cache.get_nowait("cells")
+    if cells is None:
+        result = await db.execute(
+            select(*(getattr(CandidateFacetCount, facet) for facet in FACETS), CandidateFacetCount.count)
+            .where(CandidateFacetCount.count > 0)
+        )
+        cells = {tuple(row[:4]): row[4] for row in result.all()}
+        facet_cache.set_nowait("cells", cells)
+    return cells
+
+
+async def get_facet_counts(db, filters: Dict[str, Optional[str]]) -> dict:
+    """Counts per facet value under filters (facet name -> selected value or None)"""
+    cells = await _load_cells(db)
+    selected = [(position, filters.get(facet)) for position, facet in enumerate(FACETS)]
+    selected = [(position, value) for position, value in selected if value is not None]
+
+    counts = {facet: defaultdict(int) for facet in FACETS}
+    total = 0
+    for cell, count in cells.items():
+        mismatched = [position for position, value in selected if cell[position] != value]
+        if not mismatched:
+            total += count
+        if len(mismatched) > 1:
+            continue
+        for position, facet in enumerate(FACETS):
+            # A cell failing only this facet's own filter still counts toward its other values
+            if not mismatched or mismatched == [position]:
+                counts[facet][cell[position]] += count
+
+    return {"total": total, **{facet: _ordered(facet, values) for facet, values in counts.items()}}
+
+
+def _ordered(facet: str, values: Dict[str, int]) -> Dict[str, int]:
+    buckets = {"notice_bucket": NOTICE_BUCKETS, "experience_band": EXPERIENCE_BANDS}.get(facet)
+    if buckets:
+        keys = [key for key in (*buckets, UNKNOWN) if key in values]
+    else:
+        keys = sorted(values, key=lambda key: (-values[key], key))
+    return {key: values[key] for key in keys}
@@ -0,0 +1,151 @@
+"""
+Candidate search for companies
+
+Filters run against the candidates table and results are paged with a
+keyset (seek) cursor over (created_at DESC, id DESC), so page N costs the
+same as page 1. Only the columns of the result card are selected. Indexes
+backing these queries are created in migration 0002.
+
+Boolean skill queries (skills_query) are answered by the in-memory skills
+index when it is loaded and the match set is small enough to pass as an id
+list; otherwise they are translated to SQL over skills_normalized. Both
+paths compare normalized skills and treat NULL skills as none, so a query
+returns the same candidates whichever path answers it.
+"""
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, cast, exists, func, not_, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.core.config import settings
+from app.core.skills import normalize_skills
+from app.models import Candidate
+from app.services.skills_index import parse_skills_query, skills_index
+
+# open_to_buyout is stored as a string; these are the values meaning yes / no
+BUYOUT_YES = ("yes", "true", "True", "1")
+BUYOUT_NO = ("no", "false", "False", "0")
+
+RESULT_COLUMNS = (
+    Candidate.id,
+    Candidate.full_name,
+    Candidate.current_designation,
+    Candidate.current_company,
+    Candidate.city,
+    Candidate.skills,
+    Candidate.experience_years,
+    Candidate.notice_period_days,
+    Candidate.current_ctc,
+    Candidate.expected_ctc,
+    Candidate.open_to_buyout,
+    Candidate.created_at,
+)
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, candidate_id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(candidate_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, candidate_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(candidate_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+
+
+def _skills_filter(dialect: str, skills: List[str]) -> list:
+    """Clauses requiring every skill in skills (compared normalized)"""
+    skills = normalize_skills(skills)
+    if dialect == "postgresql":
+        # Served by the GIN index on (skills_normalized::jsonb)
+        return [cast(Candidate.skills_normalized, JSONB).contains(skills)]
+    clauses = []
+    for skill in skills:
+        values = func.json_each(Candidate.skills_normalized).table_valued("value").alias()
+        clauses.append(exists(select(1).select_from(values).where(values.c.value == skill)))
+    return clauses
+
+
+def _skills_query_clause(dialect: str, node):
+    kind = node[0]
+    if kind == "skill":
+        return and_(*_skills_filter(dialect, [node[1]]))
+    if kind == "not":
+        return not_(_skills_query_clause(dialect, node[1]))
+    clauses = [_skills_query_clause(dialect, child) for child in node[1]]
+    return and_(*clauses) if kind == "and" else or_(*clauses)
+
+
+def skills_query_filter(dialect: str, query: str):
+    """WHERE clause for a boolean skills query such as 'Python AND (Kafka OR Go)'"""
+    node = parse_skills_query(query)
+    if settings.SKILLS_INDEX_ENABLED and skills_index.ready:
+        numbers = skills_index.evaluate(node)
+        if len(numbers) <= settings.SKILLS_INDEX_MAX_IDS:
+            return Candidate.id.in_(skills_index.candidate_ids(numbers))
+    return _skills_query_clause(dialect, node)
+
+
+def build_search_query(
+    dialect: str,
+    skills: Optional[List[str]] = None,
+    skills_query: Optional[str] = None,
+    city: Optional[str] = None,
+    min_experience: Optional[Decimal] = None,
+    max_experience: Optional[Decimal] = None,
+    max_notice_period_days: Optional[int] = None,
+    max_current_ctc: Optional[Decimal] = None,
+    max_expected_ctc: Optional[Decimal] = None,
+    open_to_buyout: Optional[bool] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+):
+    """SELECT for one page of results; fetches limit + 1 rows to detect a next page"""
+    query = select(*RESULT_COLUMNS)
+
+    if skills:
+        query = query.where(*_skills_filter(dialect, skills))
+    if skills_query:
+        query = query.where(skills_query_filter(dialect, skills_query))
+    if city:
+        query = query.where(Candidate.city == city)
+    if min_experience is not None:
+        query = query.where(Candidate.experience_years >= min_experience)
+    if max_experience is not None:
+        query = query.where(Candidate.experience_years <= max_experience)
+    if max_notice_period_days is not None:
+        query = query.where(Candidate.notice_period_days <= max_notice_period_days)
+    if max_current_ctc is not None:
+        query = query.where(Candidate.current_ctc <= max_current_ctc)
+    if max_expected_ctc is not None:
+        query = query.where(Candidate.expected_ctc <= max_expected_ctc)
+    if open_to_buyout is not None:
+        query = query.where(Candidate.open_to_buyout.in_(BUYOUT_YES if open_to_buyout else BUYOUT_NO))
+
+    if cursor:
+        created_at, candidate_id = decode_cursor(cursor)
+        query = query.where(tuple_(Candidate.created_at, Candidate.id) < (created_at, candidate_id))
+
+    return query.order_by(Candidate.created_at.desc(), Candidate.id.desc()).limit(limit + 1)
+
+
+def page_from_rows(rows, limit: int) -> Tuple[list, Optional[str]]:
+    """Split limit + 1 fetched rows into the page and the cursor for the next one"""
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    return page, next_cursor
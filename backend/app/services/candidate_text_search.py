@@ -0,0 +1,113 @@
+"""
+Fuzzy search over candidate names, designations and companies
+
+On Postgres this uses pg_trgm: the WHERE clause matches the query against
+one concatenated document with the word-similarity operator, which is
+served by the trigram GIN index from migration 0003, and matches are
+ranked by a weighted word similarity per field. Trigrams make the search
+tolerant of typos and partial words ("devloper", "infos").
+
+SQLite (local and test runs) has no trigram support, so the same scoring
+is done in process over the candidates table.
+"""
+import heapq
+import re
+from typing import List, Set, Tuple
+
+from sqlalchemy import func, literal_column, select, text
+
+from app.core.config import settings
+from app.models import Candidate
+from app.services.candidate_search import RESULT_COLUMNS
+
+# Field weights for ranking; the best weighted field score is the result score
+FIELD_WEIGHTS = (
+    ("full_name", 1.0),
+    ("current_designation", 0.8),
+    ("current_company", 0.7),
+)
+
+# Must match the expression of ix_candidates_search_trgm (migration 0003) verbatim
+SEARCH_DOCUMENT = literal_column(
+    "(coalesce(candidates.full_name, '') || ' ' || "
+    "coalesce(candidates.current_designation, '') || ' ' || "
+    "coalesce(candidates.current_company, ''))"
+)
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: str) -> List[str]:
+    """Trigrams in document order, built like pg_trgm (words padded with two spaces before, one after)"""
+    result = []
+    for word in _WORD.findall((value or "").lower()):
+        padded = f"  {word} "
+        result.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def word_similarity(query_trigrams: Set[str], value: str) -> float:
+    """
+    pg_trgm word_similarity: best Jaccard similarity between the query's
+    trigrams and any continuous run of the value's trigrams.
+    """
+    if not query_trigrams:
+        return 0.0
+    sequence = trigrams(value)
+    hits = [index for index, trigram in enumerate(sequence) if trigram in query_trigrams]
+    best = 0.0
+    # The best run always starts and ends on a trigram shared with the query
+    for start_position, start in enumerate(hits):
+        for end in hits[start_position:]:
+            run = set(sequence[start:end + 1])
+            common = len(run & query_trigrams)
+            best = max(best, common / (len(query_trigrams) + len(run) - common))
+    return best
+
+
+def _score_row(query_trigrams: Set[str], row) -> float:
+    return max(
+        word_similarity(query_trigrams, getattr(row, field)) * weight
+        for field, weight in FIELD_WEIGHTS
+    )
+
+
+async def _search_postgres(db, query: str, limit: int) -> List[Tuple[object, float]]:
+    # The % operators use this threshold; SET LOCAL scope is the current transaction
+    await db.execute(
+        text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+        {"threshold": str(settings.CANDIDATE_TEXT_SEARCH_THRESHOLD)}
+    )
+    score = func.greatest(*(
+        func.word_similarity(query, func.coalesce(getattr(Candidate, field), "")) * weight
+        for field, weight in FIELD_WEIGHTS
+    )).label("score")
+    result = await db.execute(
+        select(*RESULT_COLUMNS, score)
+        .where(SEARCH_DOCUMENT.op("%>")(query))
+        .order_by(score.desc(), Candidate.created_at.desc())
+        .limit(limit)
+    )
+    return [(row, float(row.score)) for row in result.all()]
+
+
+async def _search_in_process(db, query: str, limit: int) -> List[Tuple[object, float]]:
+    query_trigrams = set(trigrams(query))
+    threshold = settings.CANDIDATE_TEXT_SEARCH_THRESHOLD
+    result = await db.stream(select(*RESULT_COLUMNS).execution_options(yield_per=1000))
+    scored = []
+    async for row in result:
+        # Same filter as Postgres: the whole document must clear the threshold
+        document = " ".join(filter(None, (row.full_name, row.current_designation, row.current_company)))
+        if word_similarity(query_trigrams, document) < threshold:
+            continue
+        scored.append((_score_row(query_trigrams, row), row.created_at, row))
+    top = heapq.nlargest(limit, scored, key=lambda item: (item[0], item[1]))
+    return [(row, score) for score, _, row in top]
+
+
+async def search_candidates_text(db, query: str, limit: int = 20) -> List[Tuple[object, float]]:
+    """Best-matching candidate rows with their scores, highest first"""
+    if db.bind.dialect.name == "postgresql":
+        return await _search_postgres(db, query, limit)
+    return await _search_in_process(db, query, limit)
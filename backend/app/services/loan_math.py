@@ -0,0 +1,209 @@
+"""
+Buyout and EMI arithmetic
+
+calculate_buyout and calculate_emi are the Decimal reference. The
+calculators work in integer paise (app.core.money) and agree with the
+reference to the paisa:
+
+- buyouts use exact integer arithmetic with the same round-half-even
+  rule; the reference divides before multiplying, which can land on the
+  other side of an exact half paisa, so those tie cases are recomputed
+  with the reference.
+- single EMIs are exact integer fractions; the reference carries 28
+  significant digits, so EMIs within 1e-12 (relative) of a half paisa are
+  recomputed with the reference.
+- batch EMIs use float64; rows whose unrounded EMI falls within float
+  error of a half paisa are recomputed with the reference.
+
+EMI = P x r x (1 + r)^n / ((1 + r)^n - 1), with r the monthly rate
+(annual percent / 1200), as in the spec appendix.
+"""
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from app.core.money import Paise
+
+DAYS_PER_MONTH = 30
+# EMI up to this share of monthly salary is considered affordable
+AFFORDABLE_EMI_RATIO = 0.3
+
+
+def calculate_buyout(monthly_salary: Decimal, notice_period_days: int) -> Tuple[Decimal, Decimal]:
+    """Buyout amount and daily salary, rounded to the paisa"""
+    daily_salary = monthly_salary / Decimal(DAYS_PER_MONTH)
+    buyout_amount = daily_salary * Decimal(str(notice_period_days))
+    return round(buyout_amount, 2), round(daily_salary, 2)
+
+
+def calculate_emi(principal: Decimal, annual_rate: Decimal, months: int) -> Decimal:
+    """Monthly instalment for a loan, rounded to the paisa"""
+    if months <= 0:
+        raise ValueError("Tenure must be at least one month")
+    monthly_rate = Decimal(annual_rate) / Decimal(1200)
+    if monthly_rate == 0:
+        return round(principal / Decimal(months), 2)
+    growth = (1 + monthly_rate) ** months
+    return round(principal * monthly_rate * growth / (growth - 1), 2)
+
+
+def to_paise(amount: Decimal) -> int:
+    """Paise in a Decimal already rounded to the paisa"""
+    return int(amount.scaleb(2))
+
+
+def from_paise(paise: int) -> Decimal:
+    return Decimal(int(paise)).scaleb(-2)
+
+
+def _divide_half_even_int(numerator: int, denominator: int) -> Tuple[int, bool]:
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    tie = twice == denominator
+    return quotient + (twice > denominator or (tie and quotient % 2 == 1)), tie
+
+
+def calculate_buyout_paise(monthly_salary: int, notice_period_days: int) -> Tuple[Paise, Paise]:
+    """calculate_buyout for a salary in paise; returns (buyout, daily salary)"""
+    daily, _ = _divide_half_even_int(monthly_salary, DAYS_PER_MONTH)
+    buyout, tie = _divide_half_even_int(monthly_salary * notice_period_days, DAYS_PER_MONTH)
+    if tie:
+        amount, _ = calculate_buyout(from_paise(monthly_salary), notice_period_days)
+        buyout = to_paise(amount)
+    return Paise(buyout), Paise(daily)
+
+
+def calculate_emi_paise(principal: int, annual_rate: Decimal, months: int) -> Paise:
+    """calculate_emi for a principal in paise, in exact integer arithmetic
+
+    With the monthly rate r = a / d as an exact fraction, the EMI in paise is
+    P x a x (d + a)^n / (d x ((d + a)^n - d^n)), divided once and rounded
+    half-even.
+    """
+    if months <= 0:
+        raise ValueError("Tenure must be at least one month")
+    rate, scale = Decimal(annual_rate).as_integer_ratio()
+    if rate == 0:
+        numerator, denominator = principal, months
+    else:
+        growth, base = (1200 * scale + rate) ** months, (1200 * scale) ** months
+        numerator, denominator = principal * rate * growth, 1200 * scale * (growth - base)
+    emi, remainder = divmod(numerator, denominator)
+    offset = 2 * remainder - denominator
+    # Within the reference's precision of a half paisa, round as it does
+    if abs(offset) * 10 ** 12 <= denominator * (emi + 1):
+        return Paise(to_paise(calculate_emi(from_paise(principal), annual_rate, months)))
+    return Paise(emi + (offset > 0))
+
+
+def _divide_half_even(numerator: np.ndarray, denominator: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Round-half-even integer division; also returns which rows were exact ties"""
+    quotient, remainder = np.divmod(numerator, denominator)
+    twice = 2 * remainder
+    tie = twice == denominator
+    up = (twice > denominator) | (tie & (quotient % 2 == 1))
+    return quotient + up, tie
+
+
+def buyout_batch(salary_paise: np.ndarray, notice_period_days: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized calculate_buyout over int64 paise; returns (buyout_paise, daily_paise)"""
+    salary_paise = salary_paise.astype(np.int64, copy=False)
+    days = notice_period_days.astype(np.int64, copy=False)
+    daily, _ = _divide_half_even(salary_paise, DAYS_PER_MONTH)
+    buyout, tie = _divide_half_even(salary_paise * days, DAYS_PER_MONTH)
+    for index in np.flatnonzero(tie):
+        amount, _ = calculate_buyout(from_paise(int(salary_paise[index])), int(days[index]))
+        buyout[index] = to_paise(amount)
+    return buyout, daily
+
+
+def _round_emi(exact: np.ndarray, reference) -> np.ndarray:
+    """Round unrounded EMIs (in paise) half-even; reference(i) prices row i exactly"""
+    whole = np.floor(exact)
+    fraction = exact - whole
+    emi = (whole + (fraction > 0.5)).astype(np.int64)
+
+    # float64 is good to ~1e-15 relative; near a half paisa defer to Decimal
+    close = np.abs(fraction - 0.5) <= 1e-12 * exact + 1e-9
+    for index in np.flatnonzero(close):
+        emi[index] = to_paise(reference(index))
+    return emi
+
+
+def emi_factor(monthly_rate, months: int):
+    """EMI per unit of principal at a nonzero monthly rate (floats or NumPy arrays)"""
+    growth = (1 + monthly_rate) ** months
+    return monthly_rate * growth / (growth - 1)
+
+
+def emi_batch(principal_paise: np.ndarray, annual_rate: Decimal, months: int) -> np.ndarray:
+    """Vectorized calculate_emi over int64 paise for one rate and tenure"""
+    if months <= 0:
+        raise ValueError("Tenure must be at least one month")
+    principal = principal_paise.astype(np.float64)
+    monthly_rate = float(annual_rate) / 1200
+    if monthly_rate == 0:
+        exact = principal / months
+    else:
+        exact = principal * emi_factor(monthly_rate, months)
+    return _round_emi(
+        exact,
+        lambda index: calculate_emi(from_paise(int(principal_paise[index])), annual_rate, months)
+    )
+
+
+def emi_rate_batch(principal: int, annual_rates: Sequence[Decimal], months: int) -> np.ndarray:
+    """Vectorized calculate_emi in paise for one principal (paise) and tenure over many rates"""
+    if months <= 0:
+        raise ValueError("Tenure must be at least one month")
+    monthly_rates = np.array([float(rate) for rate in annual_rates], dtype=np.float64) / 1200
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.where(monthly_rates > 0, emi_factor(monthly_rates, months), 1 / months)
+    return _round_emi(
+        float(principal) * factor,
+        lambda index: calculate_emi(from_paise(principal), annual_rates[index], months)
+    )
+
+
+_CENTS = [f"{paise:02d}" for paise in range(100)]
+
+
+def format_paise_array(paise: np.ndarray) -> List[str]:
+    """format_paise over an int64 array, splitting rupees and paise in NumPy"""
+    rupees, cents = np.divmod(np.abs(paise), 100)
+    strings = [f"{whole}.{_CENTS[part]}" for whole, part in zip(rupees.tolist(), cents.tolist())]
+    for index in np.flatnonzero(paise < 0).tolist():
+        strings[index] = "-" + strings[index]
+    return strings
+
+
+def buyout_quote_batch(
+    salary_paise: np.ndarray,
+    notice_period_days: np.ndarray,
+    tenures: Sequence[int],
+    annual_rate: Decimal,
+) -> Dict[str, np.ndarray]:
+    """Buyouts for many candidates plus the EMI of financing each buyout over every tenure
+
+    Returns int64 paise arrays buyout, daily and emi (rows x tenures), the
+    float64 emi_ratio of EMI to monthly salary (NaN for a zero salary) and
+    the boolean affordable mask.
+    """
+    salary_paise = np.asarray(salary_paise, dtype=np.int64)
+    buyout, daily = buyout_batch(salary_paise, np.asarray(notice_period_days, dtype=np.int64))
+
+    emi = np.empty((len(buyout), len(tenures)), dtype=np.int64)
+    for column, months in enumerate(tenures):
+        emi[:, column] = emi_batch(buyout, annual_rate, months)
+
+    salary = salary_paise.astype(np.float64)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(salary > 0, emi / salary, np.nan)
+    return {
+        "buyout": buyout,
+        "daily": daily,
+        "emi": emi,
+        "emi_ratio": ratio,
+        "affordable": ratio < AFFORDABLE_EMI_RATIO,
+    }
@@ -0,0 +1,222 @@
+"""
+Loan offer quoting over an in-memory NBFC product index
+
+Each active NBFC partner offers loans between its min and max loan amount
+(either bound may be open) over a range of tenures. OfferIndex answers
+"which partners lend this amount" with a stabbing query: the sorted
+distinct amount bounds cut the line into points and the gaps between
+them, and each of those slots holds the products covering it, so a
+lookup is one bisect. Quotes are priced at each partner's lowest rate,
+for all eligible partners in one vectorized pass (to the paisa of
+calculate_emi), and ranked by EMI, never touching the database.
+
+Like the other in-memory indexes the index is per worker: the NBFC profile
+handlers upsert the product they just wrote, and a background task reloads
+the whole table every LOAN_QUOTES_REFRESH_SECONDS to pick up other
+workers' writes and deletions.
+"""
+import asyncio
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import replica_router
+from app.core.money import Paise
+from app.models import NBFCPartner
+from app.services.loan_math import AFFORDABLE_EMI_RATIO, emi_rate_batch
+
+ACTIVE = ("yes", "true", "True", "1")
+DEFAULT_MIN_TENURE = 6
+DEFAULT_MAX_TENURE = 24
+
+
+class LoanProduct(NamedTuple):
+    nbfc_id: UUID
+    nbfc_name: str
+    annual_interest_rate: Decimal
+    min_amount: Optional[Paise]
+    max_amount: Optional[Paise]
+    min_tenure_months: int
+    max_tenure_months: int
+
+
+def tenure_or_default(value, default: int) -> int:
+    """A tenure column as months, or default when it is unset or not a number"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def product_of(nbfc) -> Optional[LoanProduct]:
+    """Loan product of an NBFC row, or None if it cannot be quoted"""
+    rate = nbfc.interest_rate_min if nbfc.interest_rate_min is not None else nbfc.interest_rate_max
+    if rate is None or str(nbfc.is_active) not in ACTIVE:
+        return None
+    return LoanProduct(
+        nbfc.id,
+        nbfc.nbfc_name,
+        Decimal(rate),
+        nbfc.min_loan_amount,
+        nbfc.max_loan_amount,
+        tenure_or_default(nbfc.min_tenure_months, DEFAULT_MIN_TENURE),
+        tenure_or_default(nbfc.max_tenure_months, DEFAULT_MAX_TENURE),
+    )
+
+
+class OfferIndex:
+    """Stabbing-query index from loan amount to the products that lend it"""
+
+    def __init__(self):
+        self.ready = False
+        self._products: Dict[UUID, LoanProduct] = {}
+        self._ordered: List[LoanProduct] = []
+        self._bounds: List[int] = []
+        # Positions in _ordered: _slots[2k] covers exactly _bounds[k], _slots[2k + 1]
+        # the gap above it, _before the amounts below _bounds[0]
+        self._slots: List[np.ndarray] = []
+        self._before = np.empty(0, dtype=np.int32)
+        # Rows upserted while a reload is reading the table, reapplied after it
+        self._pending: Optional[list] = None
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+    def begin_load(self) -> None:
+        self._pending = []
+
+    def load(self, nbfcs) -> None:
+        """Replace the contents with NBFC rows"""
+        products = (product_of(nbfc) for nbfc in nbfcs)
+        self._products = {product.nbfc_id: product for product in products if product is not None}
+        pending, self._pending = self._pending or [], None
+        for nbfc in pending:
+            self._apply(nbfc)
+        self._build()
+
+    def upsert(self, nbfc) -> None:
+        """Add, refresh or drop (if no longer quotable) one NBFC"""
+        if self._pending is not None:
+            self._pending.append(nbfc)
+        self._apply(nbfc)
+        self._build()
+
+    def _apply(self, nbfc) -> None:
+        product = product_of(nbfc)
+        if product is None:
+            self._products.pop(nbfc.id, None)
+        else:
+            self._products[nbfc.id] = product
+
+    def _build(self) -> None:
+        # Ordered by name so ties on EMI keep a stable, readable order
+        products = sorted(self._products.values(), key=lambda product: (product.nbfc_name, str(product.nbfc_id)))
+        bounds = sorted({
+            bound for product in products
+            for bound in (product.min_amount, product.max_amount) if bound is not None
+        })
+
+        def covering(low, high):
+            # Products lending every amount from low to high (None: unbounded above)
+            return np.array([
+                position for position, product in enumerate(products)
+                if (product.min_amount is None or product.min_amount <= low)
+                and (product.max_amount is None or (high is not None and product.max_amount >= high))
+            ], dtype=np.int32)
+
+        slots = []
+        for position, bound in enumerate(bounds):
+            above = bounds[position + 1] if position + 1 < len(bounds) else None
+            slots.extend((covering(bound, bound), covering(bound, above)))
+        self._before = np.array(
+            [position for position, product in enumerate(products) if product.min_amount is None], dtype=np.int32
+        )
+        self._min_tenure = np.array([product.min_tenure_months for product in products], dtype=np.int32)
+        self._max_tenure = np.array([product.max_tenure_months for product in products], dtype=np.int32)
+        self._ordered, self._bounds, self._slots = products, bounds, slots
+
+    def _lender_positions(self, amount: Paise) -> np.ndarray:
+        position = bisect_left(self._bounds, amount)
+        if position < len(self._bounds) and self._bounds[position] == amount:
+            return self._slots[2 * position]
+        if position == 0:
+            return self._before
+        return self._slots[2 * position - 1]
+
+    def lenders(self, amount: Paise) -> List[LoanProduct]:
+        """Products whose loan amount range contains amount"""
+        return [self._ordered[position] for position in self._lender_positions(amount).tolist()]
+
+    def quote(self, amount: Paise, tenure_months: int, monthly_salary: Optional[Paise] = None) -> List[dict]:
+        """Offers from every partner lending amount over tenure_months, lowest EMI first"""
+        positions = self._lender_positions(amount)
+        positions = positions[
+            (self._min_tenure[positions] <= tenure_months) & (tenure_months <= self._max_tenure[positions])
+        ]
+        if not len(positions):
+            return []
+        products = [self._ordered[position] for position in positions.tolist()]
+        emi = emi_rate_batch(amount, [product.annual_interest_rate for product in products], tenure_months)
+        # Stable sort: equal EMIs stay in name order
+        ranked = np.argsort(emi, kind="stable")
+        emi = emi[ranked]
+        repayment = emi * tenure_months
+        interest = repayment - int(amount)
+        if monthly_salary:
+            ratios = np.round(emi / int(monthly_salary), 4).tolist()
+            affordable = (np.array(ratios) < AFFORDABLE_EMI_RATIO).tolist()
+        else:
+            ratios = affordable = [None] * len(emi)
+
+        offers = []
+        for index, payment, total_interest, total_repayment, ratio, fits in zip(
+            ranked.tolist(), emi.tolist(), interest.tolist(), repayment.tolist(), ratios, affordable
+        ):
+            product = products[index]
+            offers.append({
+                "nbfc_id": product.nbfc_id,
+                "nbfc_name": product.nbfc_name,
+                "annual_interest_rate": product.annual_interest_rate,
+                "tenure_months": tenure_months,
+                "emi": Paise(payment),
+                "total_interest": Paise(total_interest),
+                "total_repayment": Paise(total_repayment),
+                "emi_to_salary": ratio,
+                "affordable": fits,
+            })
+        return offers
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "products": len(self._products),
+            "slots": len(self._slots),
+        }
+
+
+offer_index = OfferIndex()
+
+
+async def rebuild_offer_index(index: OfferIndex = offer_index) -> None:
+    """Load every NBFC product from the database"""
+    index.begin_load()
+    async with replica_router.session_maker()() as session:
+        result = await session.execute(select(NBFCPartner))
+        index.load(result.scalars().all())
+    index.ready = True
+
+
+async def run_offer_index() -> None:
+    """Background task started from the application lifespan"""
+    while True:
+        try:
+            await rebuild_offer_index()
+        except Exception as e:
+            print(f"Loan offer index rebuild failed: {e}")
+        await asyncio.sleep(settings.LOAN_QUOTES_REFRESH_SECONDS)
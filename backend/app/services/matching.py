@@ -0,0 +1,256 @@
+"""
+Candidate-to-job match scoring
+
+Candidate features are held in columnar NumPy arrays (one slot per
+candidate, aligned with the dense numbers of a private SkillsIndex), so a
+job is scored against the whole pool in a handful of vectorized passes and
+the top k are picked with argpartition instead of sorting everything.
+
+Each component scores 0..1 and is weighted by MATCH_WEIGHTS:
+  skills      share of the job's skills the candidate lists
+  ctc         expected CTC (current CTC if unset) inside the salary band,
+              decaying linearly to 0 at twice the band maximum above it
+              and at 0 below it
+  notice      1 within the job's notice limit, 0 at 90 days past it
+  experience  1 inside the band, 0 five years outside it
+  location    city or preferred location matches the job's city
+Unknown values score 0.5 for their component.
+
+Like the skills index, the pool is per worker: loaded in the background at
+startup, updated by the candidate profile handlers and caught up with other
+workers' writes every MATCHING_REFRESH_SECONDS.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.database import replica_router
+from app.core.money import Paise
+from app.core.skills import normalize_skill
+from app.models import Candidate
+from app.services.skills_index import SkillsIndex
+
+MATCH_WEIGHTS = {
+    "skills": 0.4,
+    "ctc": 0.2,
+    "notice": 0.15,
+    "experience": 0.15,
+    "location": 0.1,
+}
+
+UNKNOWN_SCORE = 0.5
+NOTICE_GRACE_DAYS = 90
+EXPERIENCE_GRACE_YEARS = 5
+
+FEATURE_COLUMNS = (
+    Candidate.id,
+    Candidate.skills,
+    Candidate.preferred_locations,
+    Candidate.city,
+    Candidate.experience_years,
+    Candidate.notice_period_days,
+    Candidate.current_ctc,
+    Candidate.expected_ctc,
+)
+
+_NUMERIC = ("experience_years", "notice_period_days", "current_ctc", "expected_ctc")
+
+
+def _number(value) -> float:
+    if value is None:
+        return np.nan
+    # CTCs load as Paise; score them in rupees
+    return float(value.to_rupees()) if isinstance(value, Paise) else float(value)
+
+
+class MatchPool:
+    """Columnar candidate features for vectorized scoring"""
+
+    def __init__(self, capacity: int = 1024):
+        self.ready = False
+        self.watermark: Optional[datetime] = None
+        self.skills = SkillsIndex()
+        self.locations = SkillsIndex()
+        self._city_codes: Dict[str, int] = {}
+        self._size = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        self._numeric = {name: np.full(capacity, np.nan, dtype=np.float32) for name in _NUMERIC}
+        self._city = np.full(capacity, -1, dtype=np.int32)
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self._city)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for name, column in self._numeric.items():
+            grown = np.full(capacity, np.nan, dtype=np.float32)
+            grown[:self._size] = column[:self._size]
+            self._numeric[name] = grown
+        city = np.full(capacity, -1, dtype=np.int32)
+        city[:self._size] = self._city[:self._size]
+        self._city = city
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _city_code(self, city: Optional[str]) -> int:
+        if not city:
+            return -1
+        return self._city_codes.setdefault(normalize_skill(city), len(self._city_codes))
+
+    def load(self, rows: List[tuple]) -> None:
+        """Replace the contents with rows of FEATURE_COLUMNS"""
+        skills, locations = SkillsIndex(), SkillsIndex()
+        skills.load((row.id, row.skills) for row in rows)
+        locations.load((row.id, row.preferred_locations) for row in rows)
+        self.skills, self.locations = skills, locations
+        self._city_codes = {}
+        self._size = 0
+        self._allocate(max(1024, len(rows)))
+        for name in _NUMERIC:
+            self._numeric[name][:len(rows)] = [_number(getattr(row, name)) for row in rows]
+        self._city[:len(rows)] = [self._city_code(row.city) for row in rows]
+        self._size = len(rows)
+
+    def upsert(self, row) -> None:
+        """Add or refresh one candidate from a row (or ORM object) with FEATURE_COLUMNS"""
+        number = self.skills.upsert(row.id, row.skills)
+        self.locations.upsert(row.id, row.preferred_locations)
+        self._grow(number + 1)
+        for name in _NUMERIC:
+            self._numeric[name][number] = _number(getattr(row, name))
+        self._city[number] = self._city_code(row.city)
+        self._size = max(self._size, number + 1)
+
+    def score(self, job) -> np.ndarray:
+        """Weighted match score (0..1) of every candidate for job"""
+        size = self._size
+        column = {name: values[:size] for name, values in self._numeric.items()}
+        total = np.zeros(size, dtype=np.float32)
+
+        job_skills = {normalize_skill(skill) for skill in job.skills or ()}
+        if job_skills:
+            overlap = np.zeros(size, dtype=np.float32)
+            for skill in job_skills:
+                overlap[self.skills.postings(skill)] += 1
+            total += MATCH_WEIGHTS["skills"] / len(job_skills) * overlap
+        else:
+            total += MATCH_WEIGHTS["skills"]
+
+        if job.min_ctc is not None or job.max_ctc is not None:
+            ctc = np.where(np.isnan(column["expected_ctc"]), column["current_ctc"], column["expected_ctc"])
+            fit = np.ones(size, dtype=np.float32)
+            if job.max_ctc is not None:
+                band_max = _number(job.max_ctc)
+                fit -= np.clip((ctc - band_max) / max(band_max, 1.0), 0, 1)
+            if job.min_ctc is not None:
+                band_min = _number(job.min_ctc)
+                fit -= np.clip((band_min - ctc) / max(band_min, 1.0), 0, 1)
+            total += MATCH_WEIGHTS["ctc"] * np.where(np.isnan(ctc), UNKNOWN_SCORE, fit)
+        else:
+            total += MATCH_WEIGHTS["ctc"]
+
+        if job.max_notice_period_days is not None:
+            notice = column["notice_period_days"]
+            late = np.clip((notice - job.max_notice_period_days) / NOTICE_GRACE_DAYS, 0, 1)
+            total += MATCH_WEIGHTS["notice"] * np.where(np.isnan(notice), UNKNOWN_SCORE, 1 - late)
+        else:
+            total += MATCH_WEIGHTS["notice"]
+
+        if job.min_experience is not None or job.max_experience is not None:
+            experience = column["experience_years"]
+            low = float(job.min_experience) if job.min_experience is not None else -np.inf
+            high = float(job.max_experience) if job.max_experience is not None else np.inf
+            distance = np.maximum(low - experience, 0) + np.maximum(experience - high, 0)
+            fit = 1 - np.clip(distance / EXPERIENCE_GRACE_YEARS, 0, 1)
+            total += MATCH_WEIGHTS["experience"] * np.where(np.isnan(experience), UNKNOWN_SCORE, fit)
+        else:
+            total += MATCH_WEIGHTS["experience"]
+
+        if job.city:
+            located = self._city[:size] == self._city_codes.get(normalize_skill(job.city), -2)
+            located[self.locations.postings(job.city)] = True
+            total += MATCH_WEIGHTS["location"] * located
+        else:
+            total += MATCH_WEIGHTS["location"]
+
+        return total
+
+    def top_k(self, job, k: int) -> List[Tuple[UUID, float]]:
+        """The k best (candidate_id, score) pairs, best first"""
+        if not self._size:
+            return []
+        scores = self.score(job)
+        k = min(k, self._size)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        ids = self.skills.candidate_ids(best)
+        return list(zip(ids, scores[best].tolist()))
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "candidates": self._size,
+            "feature_bytes": sum(column.nbytes for column in self._numeric.values()) + self._city.nbytes,
+            "skills": self.skills.stats()["skills"],
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+
+
+match_pool = MatchPool()
+
+
+async def rebuild_match_pool(pool: MatchPool = match_pool) -> None:
+    """Load every candidate's features from the database"""
+    started = datetime.now(timezone.utc)
+    async with replica_router.session_maker()() as session:
+        result = await session.stream(
+            select(*FEATURE_COLUMNS).order_by(Candidate.created_at, Candidate.id)
+            .execution_options(yield_per=10000)
+        )
+        rows = []
+        async for partition in result.partitions():
+            rows.extend(partition)
+    pool.load(rows)
+    pool.watermark = started
+    pool.ready = True
+
+
+async def refresh_match_pool(pool: MatchPool = match_pool) -> int:
+    """Apply rows created or updated since the last watermark; returns how many"""
+    started = datetime.now(timezone.utc)
+    changed_at = func.coalesce(Candidate.updated_at, Candidate.created_at)
+    overlap = timedelta(seconds=settings.REFRESH_OVERLAP_SECONDS)
+    async with replica_router.session_maker()() as session:
+        result = await session.execute(
+            select(*FEATURE_COLUMNS).where(changed_at >= pool.watermark - overlap)
+        )
+        rows = result.all()
+    for row in rows:
+        pool.upsert(row)
+    pool.watermark = started
+    return len(rows)
+
+
+async def run_match_pool() -> None:
+    """Background task started from the application lifespan"""
+    while not match_pool.ready:
+        try:
+            await rebuild_match_pool()
+            print(f"Match pool loaded: {len(match_pool)} candidates")
+        except Exception as e:
+            print(f"Match pool rebuild failed, retrying: {e}")
+            await asyncio.sleep(settings.MATCHING_REFRESH_SECONDS)
+    while True:
+        await asyncio.sleep(settings.MATCHING_REFRESH_SECONDS)
+        try:
+            await refresh_match_pool()
+        except Exception as e:
+            print(f"Match pool refresh failed: {e}")
@@ -0,0 +1,314 @@
+"""
+NBFC portfolio analytics from daily rollups
+
+GET /nbfc/portfolio-analytics reports default rate, recovery rate, interest
+income and portfolio health. Computing them over loans and loan_repayments
+touches every loan and EMI of the lender, so nbfc_portfolio_daily keeps one
+row per NBFC and day instead:
+
+- loan columns count the loans disbursed that day, by current status, and
+  the principal repaid on them so far, whenever their EMIs fall due
+- repayment columns total the EMIs due that day: amount due, collected,
+  still outstanding, the principal and interest parts of collections
+  (payments settle an EMI's interest first) and the EMIs of defaulted loans
+
+The endpoint sums a lender's rows in one indexed query; whether an EMI is
+overdue is decided at read time from its day, so rows never age.
+
+Refresh is incremental. Every PORTFOLIO_ROLLUP_REFRESH_SECONDS a background
+task reads the loans and repayments changed since the watermark in
+rollup_watermarks, finds the (NBFC, day) rows they fall on (a loan's status
+also moves its EMIs' defaulted totals, a payment its loan's principal
+repaid) and recomputes just those rows from
+the source tables in one transaction. Recomputing is idempotent, so the
+watermark overlap and several workers refreshing are harmless; on Postgres
+an advisory lock lets one refresh run at a time. Analytics lag writes by at
+most the refresh interval.
+
+A row is found through its current values only: editing a loan's lender or
+disbursement date, or an EMI's due date, leaves the old day's totals stale
+until a full rebuild (`python init_db.py --rebuild-portfolio` or
+POST /admin/portfolio/rebuild).
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import case, delete, func, insert, select, text, tuple_, type_coerce
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.money import Money, Paise
+from app.models import Loan, LoanRepayment, NBFCPortfolioDaily, RollupWatermark
+
+ROLLUP_NAME = "nbfc_portfolio"
+# Postgres advisory lock key serializing refreshes across workers
+ROLLUP_LOCK_ID = 5_320_001
+KEY_CHUNK = 1000
+INSERT_BATCH = 5000
+
+# Spec success metric: loan default rate under 5%; at twice a target a portfolio is at risk
+DEFAULT_RATE_TARGET = 0.05
+OVERDUE_RATIO_TARGET = 0.05
+AT_RISK_MULTIPLE = 2
+
+Key = Tuple[UUID, date]
+
+_paid = func.coalesce(LoanRepayment.amount_paid, 0)
+_interest_paid = case((_paid >= LoanRepayment.interest_due, LoanRepayment.interest_due), else_=_paid)
+_defaulted = Loan.status == "defaulted"
+_payable = LoanRepayment.status != "waived"
+
+
+def _sum(expression):
+    # Money sums load as Paise, stored as integer paise
+    return type_coerce(func.coalesce(func.sum(expression), 0), Money)
+
+
+LOAN_TOTALS = {
+    "loans_disbursed": func.count(),
+    "loans_closed": func.count(case((Loan.status == "closed", 1))),
+    "loans_defaulted": func.count(case((_defaulted, 1))),
+    "principal_disbursed": _sum(Loan.principal_amount),
+    "principal_defaulted": _sum(case((_defaulted, Loan.principal_amount), else_=0)),
+}
+
+# Repayments totalled onto their loan's disbursement day
+LOAN_REPAYMENT_TOTALS = {
+    "principal_repaid": _sum(_paid - _interest_paid),
+}
+
+REPAYMENT_TOTALS = {
+    "amount_due": _sum(case((_payable, LoanRepayment.amount_due), else_=0)),
+    "amount_collected": _sum(_paid),
+    "amount_outstanding": _sum(
+        case((LoanRepayment.status.in_(("pending", "overdue")), LoanRepayment.amount_due - _paid), else_=0)
+    ),
+    "principal_collected": _sum(_paid - _interest_paid),
+    "interest_income": _sum(_interest_paid),
+    "defaulted_due": _sum(case((_defaulted & _payable, LoanRepayment.amount_due), else_=0)),
+    "defaulted_collected": _sum(case((_defaulted, _paid), else_=0)),
+}
+
+EMPTY_ROW = {column: 0 for column in (*LOAN_TOTALS, *LOAN_REPAYMENT_TOTALS, *REPAYMENT_TOTALS)}
+
+
+async def _compute(db, loan_filters=(), repayment_filters=()) -> Dict[Key, dict]:
+    """Rollup rows computed from the source tables, keyed by (NBFC, day)"""
+    rows: Dict[Key, dict] = {}
+    result = await db.execute(
+        select(Loan.nbfc_id, Loan.disbursement_date, *LOAN_TOTALS.values())
+        .where(Loan.disbursement_date.isnot(None), *loan_filters)
+        .group_by(Loan.nbfc_id, Loan.disbursement_date)
+    )
+    for nbfc_id, day, *values in result.all():
+        rows.setdefault((nbfc_id, day), dict(EMPTY_ROW)).update(zip(LOAN_TOTALS, map(int, values)))
+
+    result = await db.execute(
+        select(Loan.nbfc_id, Loan.disbursement_date, *LOAN_REPAYMENT_TOTALS.values())
+        .join(LoanRepayment, LoanRepayment.loan_id == Loan.id)
+        .where(Loan.disbursement_date.isnot(None), *loan_filters)
+        .group_by(Loan.nbfc_id, Loan.disbursement_date)
+    )
+    for nbfc_id, day, *values in result.all():
+        rows.setdefault((nbfc_id, day), dict(EMPTY_ROW)).update(zip(LOAN_REPAYMENT_TOTALS, map(int, values)))
+
+    result = await db.execute(
+        select(Loan.nbfc_id, LoanRepayment.due_date, *REPAYMENT_TOTALS.values())
+        .join(Loan, LoanRepayment.loan_id == Loan.id)
+        .where(*repayment_filters)
+        .group_by(Loan.nbfc_id, LoanRepayment.due_date)
+    )
+    for nbfc_id, day, *values in result.all():
+        rows.setdefault((nbfc_id, day), dict(EMPTY_ROW)).update(zip(REPAYMENT_TOTALS, map(int, values)))
+    return rows
+
+
+async def _insert(db, rows: Dict[Key, dict]) -> None:
+    values = [{"nbfc_id": nbfc_id, "day": day, **totals} for (nbfc_id, day), totals in rows.items()]
+    for start in range(0, len(values), INSERT_BATCH):
+        await db.execute(insert(NBFCPortfolioDaily), values[start:start + INSERT_BATCH])
+
+
+async def _set_watermark(db, watermark: datetime) -> None:
+    row = await db.get(RollupWatermark, ROLLUP_NAME)
+    if row is None:
+        db.add(RollupWatermark(name=ROLLUP_NAME, watermark=watermark))
+    else:
+        row.watermark = watermark
+
+
+async def rebuild_portfolio_rollups(db) -> int:
+    """Recompute every rollup row from the source tables; returns the number of rows"""
+    if db.bind.dialect.name == "postgresql":
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_ID})
+    started = datetime.now(timezone.utc)
+    rows = await _compute(db)
+    await db.execute(delete(NBFCPortfolioDaily))
+    await _insert(db, rows)
+    await _set_watermark(db, started)
+    await db.commit()
+    return len(rows)
+
+
+async def _changed_keys(db, since: datetime) -> Set[Key]:
+    changed_loans = select(Loan.id).where(Loan.updated_at >= since)
+    paid_loans = select(LoanRepayment.loan_id).where(LoanRepayment.updated_at >= since)
+    keys = set()
+    # Separate statements so each filter can use its index
+    for changed in (Loan.id.in_(changed_loans), Loan.id.in_(paid_loans)):
+        result = await db.execute(
+            select(Loan.nbfc_id, Loan.disbursement_date).distinct()
+            .where(changed, Loan.disbursement_date.isnot(None))
+        )
+        keys.update(map(tuple, result.all()))
+    for changed in (LoanRepayment.updated_at >= since, LoanRepayment.loan_id.in_(changed_loans)):
+        result = await db.execute(
+            select(Loan.nbfc_id, LoanRepayment.due_date).distinct()
+            .join(Loan, LoanRepayment.loan_id == Loan.id)
+            .where(changed)
+        )
+        keys.update(map(tuple, result.all()))
+    return keys
+
+
+def _chunks(keys: Iterable[Key], size: int):
+    keys = sorted(keys)
+    for start in range(0, len(keys), size):
+        yield keys[start:start + size]
+
+
+async def recompute_portfolio_rows(db, keys: Iterable[Key]) -> int:
+    """Replace the rollup rows at keys with fresh totals (in db's transaction); returns rows written"""
+    written = 0
+    for chunk in _chunks(keys, KEY_CHUNK):
+        nbfc_ids = {nbfc_id for nbfc_id, _ in chunk}
+        days = {day for _, day in chunk}
+        # Filters cover the cross product of lenders and days; keep only the requested keys
+        rows = await _compute(
+            db,
+            loan_filters=(Loan.nbfc_id.in_(nbfc_ids), Loan.disbursement_date.in_(days)),
+            repayment_filters=(LoanRepayment.due_date.in_(days), Loan.nbfc_id.in_(nbfc_ids)),
+        )
+        wanted = set(chunk)
+        rows = {key: totals for key, totals in rows.items() if key in wanted}
+        await db.execute(
+            delete(NBFCPortfolioDaily)
+            .where(tuple_(NBFCPortfolioDaily.nbfc_id, NBFCPortfolioDaily.day).in_(chunk))
+        )
+        await _insert(db, rows)
+        written += len(rows)
+    return written
+
+
+async def refresh_portfolio_rollups(db) -> Optional[int]:
+    """Apply loans and repayments changed since the watermark; returns rows written
+
+    Builds the rollups from scratch when there is no watermark yet, and
+    returns None if another worker is already refreshing.
+    """
+    if db.bind.dialect.name == "postgresql":
+        locked = await db.scalar(text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": ROLLUP_LOCK_ID})
+        if not locked:
+            return None
+    watermark = await db.scalar(select(RollupWatermark.watermark).where(RollupWatermark.name == ROLLUP_NAME))
+    if watermark is None:
+        await db.rollback()
+        return await rebuild_portfolio_rollups(db)
+
+    started = datetime.now(timezone.utc)
+    overlap = timedelta(seconds=settings.REFRESH_OVERLAP_SECONDS)
+    keys = await _changed_keys(db, watermark - overlap)
+    written = await recompute_portfolio_rows(db, keys)
+    await _set_watermark(db, started)
+    await db.commit()
+    return written
+
+
+async def run_portfolio_rollups() -> None:
+    """Background task started from the application lifespan"""
+    while True:
+        try:
+            async with async_session_maker() as session:
+                await refresh_portfolio_rollups(session)
+        except Exception as e:
+            print(f"Portfolio rollup refresh failed: {e}")
+        await asyncio.sleep(settings.PORTFOLIO_ROLLUP_REFRESH_SECONDS)
+
+
+def _ratio(numerator: int, denominator: int) -> Optional[float]:
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def portfolio_health(default_rate: Optional[float], overdue_ratio: Optional[float]) -> str:
+    """healthy, watch or at_risk against the default and overdue targets; no_data without loans"""
+    if default_rate is None:
+        return "no_data"
+    overdue_ratio = overdue_ratio or 0.0
+    if default_rate >= AT_RISK_MULTIPLE * DEFAULT_RATE_TARGET or overdue_ratio >= AT_RISK_MULTIPLE * OVERDUE_RATIO_TARGET:
+        return "at_risk"
+    if default_rate >= DEFAULT_RATE_TARGET or overdue_ratio >= OVERDUE_RATIO_TARGET:
+        return "watch"
+    return "healthy"
+
+
+async def get_portfolio_analytics(
+    db,
+    nbfc_id: UUID,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    today: Optional[date] = None,
+) -> Optional[dict]:
+    """Portfolio analytics of one NBFC from its rollup rows, or None before the first build
+
+    Loan figures cover loans disbursed between from_date and to_date, and
+    outstanding principal is theirs less the principal repaid on them so
+    far. Repayment figures cover the EMIs due between the dates; amounts
+    due, collected and overdue count only EMIs due by today.
+    """
+    today = today or date.today()
+    daily = NBFCPortfolioDaily
+    filters = [daily.nbfc_id == nbfc_id]
+    if from_date is not None:
+        filters.append(daily.day >= from_date)
+    if to_date is not None:
+        filters.append(daily.day <= to_date)
+
+    due = daily.day <= today
+    totals = {
+        **{column: func.sum(getattr(daily, column)) for column in EMPTY_ROW},
+        "due_to_date": func.sum(case((due, daily.amount_due), else_=0)),
+        "collected_to_date": func.sum(case((due, daily.amount_collected), else_=0)),
+        "overdue_amount": func.sum(case((daily.day < today, daily.amount_outstanding), else_=0)),
+    }
+    as_of = select(RollupWatermark.watermark).where(RollupWatermark.name == ROLLUP_NAME).scalar_subquery()
+    result = await db.execute(select(as_of, *totals.values()).where(*filters))
+    watermark, *values = result.one()
+    if watermark is None:
+        return None
+    row = {column: int(value or 0) for column, value in zip(totals, values)}
+
+    disbursed = row["loans_disbursed"]
+    default_rate = _ratio(row["loans_defaulted"], disbursed)
+    overdue_ratio = _ratio(row["overdue_amount"], row["due_to_date"])
+    return {
+        "nbfc_id": nbfc_id,
+        "from_date": from_date,
+        "to_date": to_date,
+        "as_of": watermark,
+        "loans_disbursed": disbursed,
+        "active_loans": disbursed - row["loans_closed"] - row["loans_defaulted"],
+        "loans_closed": row["loans_closed"],
+        "loans_defaulted": row["loans_defaulted"],
+        "principal_disbursed": Paise(row["principal_disbursed"]),
+        "outstanding_principal": Paise(max(row["principal_disbursed"] - row["principal_repaid"], 0)),
+        "interest_income": Paise(row["interest_income"]),
+        "amount_due": Paise(row["due_to_date"]),
+        "amount_collected": Paise(row["collected_to_date"]),
+        "overdue_amount": Paise(max(row["overdue_amount"], 0)),
+        "default_rate": default_rate,
+        "recovery_rate": _ratio(row["defaulted_collected"], row["defaulted_due"]),
+        "collection_efficiency": _ratio(row["collected_to_date"], row["due_to_date"]),
+        "health": portfolio_health(default_rate, overdue_ratio),
+    }
@@ -0,0 +1,357 @@
+"""
+Monte Carlo credit-loss simulation for NBFC loan portfolios
+
+Defaults follow a one-factor Gaussian copula (the Vasicek model behind the
+Basel IRB formulas): each scenario draws a systemic factor z shared by every
+loan, and loan i defaults when
+
+    sqrt(rho) * z + sqrt(1 - rho) * e_i < inverse_normal_cdf(PD_i)
+
+with PD_i its probability of defaulting over its tenure, e_i its own standard
+normal draw and rho the asset correlation. A defaulting loan stops paying in
+a month drawn uniformly over its tenure and loses LGD_i of the balance its
+EMI schedule has outstanding then. The scenario losses give expected loss,
+value at risk and expected shortfall.
+
+Scenarios run in shards, each vectorized over scenarios x loans in NumPy, on
+a pool of RISK_SIMULATION_WORKERS processes. Every shard seeds its own
+generator from SeedSequence(seed).spawn and the shard sizes depend only on
+the scenario count, so a seed gives the same losses however many processes
+run it. Jobs run in the background of the API worker that accepted them and
+record their progress shard by shard in a job store (memory, or redis so
+that any worker can answer polls).
+"""
+import asyncio
+import math
+import os
+import time
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timezone
+from statistics import NormalDist
+from typing import Awaitable, Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.cache import create_cache
+from app.core.config import settings
+from app.core.money import Paise
+from app.schemas.nbfc import RiskSimulationResult
+from app.services.loan_math import emi_factor
+from app.services.loan_offers import DEFAULT_MAX_TENURE, DEFAULT_MIN_TENURE, tenure_or_default
+
+SHARD_SCENARIOS = 5000  # smallest shard; progress is reported per shard
+MAX_SHARDS = 64  # larger runs use larger shards so the portfolio is pickled fewer times
+CHUNK_DRAWS = 2_000_000  # scenario x loan draws a process holds in memory at once
+CONFIDENCE_LEVELS = (0.95, 0.99, 0.999)
+HISTOGRAM_BINS = 40
+
+
+class RiskSimulationBusy(Exception):
+    """Raised when too many simulations are already queued on this worker"""
+    pass
+
+
+class Portfolio(NamedTuple):
+    """Loans prepared for simulation, one array entry per loan"""
+    principal: np.ndarray  # float64 paise
+    monthly_rate: np.ndarray  # float64
+    emi: np.ndarray  # float64 paise, unrounded
+    tenure: np.ndarray  # int64 months
+    threshold: np.ndarray  # float32 inverse normal CDF of the lifetime default probability
+    loss_given_default: np.ndarray  # float64, 0-1
+    exposure: int  # total principal, paise
+
+
+def build_portfolio(
+    principal: Sequence[int],
+    annual_rate: Sequence[float],
+    tenure_months: Sequence[int],
+    default_probability: Sequence[float],
+    loss_given_default: Sequence[float],
+) -> Portfolio:
+    """Portfolio of loans given in paise, annual percent rates and months"""
+    principal = np.asarray(principal, dtype=np.int64)
+    monthly_rate = np.asarray(annual_rate, dtype=np.float64) / 1200
+    tenure = np.asarray(tenure_months, dtype=np.int64)
+    if tenure.size == 0 or tenure.min() <= 0:
+        raise ValueError("Every loan needs a tenure of at least one month")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = np.where(monthly_rate > 0, emi_factor(monthly_rate, tenure), 1 / tenure)
+
+    inverse_cdf = NormalDist().inv_cdf
+    thresholds = {}
+    for probability in default_probability:
+        if probability not in thresholds:
+            if probability <= 0:
+                thresholds[probability] = -math.inf
+            elif probability >= 1:
+                thresholds[probability] = math.inf
+            else:
+                thresholds[probability] = inverse_cdf(probability)
+
+    return Portfolio(
+        principal=principal.astype(np.float64),
+        monthly_rate=monthly_rate,
+        emi=principal * factor,
+        tenure=tenure,
+        threshold=np.array([thresholds[p] for p in default_probability], dtype=np.float32),
+        loss_given_default=np.asarray(loss_given_default, dtype=np.float64),
+        exposure=int(principal.sum()),
+    )
+
+
+def sample_loan_terms(nbfc, count: int, seed: int) -> Tuple[List[int], List[float], List[int]]:
+    """
+    Principal (paise), annual rate and tenure of `count` loans drawn uniformly
+    from an NBFC's loan amount, interest rate and tenure ranges
+    """
+    if nbfc.max_loan_amount is None:
+        raise ValueError("Set max_loan_amount on the NBFC profile to simulate a sampled portfolio")
+    low_rate = nbfc.interest_rate_min if nbfc.interest_rate_min is not None else nbfc.interest_rate_max
+    high_rate = nbfc.interest_rate_max if nbfc.interest_rate_max is not None else nbfc.interest_rate_min
+    if low_rate is None:
+        raise ValueError("Set interest rates on the NBFC profile to simulate a sampled portfolio")
+
+    low_amount = int(nbfc.min_loan_amount or 0)
+    high_amount = max(int(nbfc.max_loan_amount), low_amount)
+    low_tenure = max(1, tenure_or_default(nbfc.min_tenure_months, DEFAULT_MIN_TENURE))
+    high_tenure = max(low_tenure, tenure_or_default(nbfc.max_tenure_months, DEFAULT_MAX_TENURE))
+    rng = np.random.default_rng(seed)
+    # Whole rupees, at least one
+    principal = rng.integers(max(low_amount, 100) // 100, high_amount // 100 + 1, size=count) * 100
+    rates = rng.uniform(float(low_rate), float(max(low_rate, high_rate)), size=count).round(2)
+    tenure = rng.integers(low_tenure, high_tenure + 1, size=count)
+    return principal.tolist(), rates.tolist(), tenure.tolist()
+
+
+def _outstanding(portfolio: Portfolio, loan: np.ndarray, month: np.ndarray) -> np.ndarray:
+    """Balance (paise) of each loan at the start of month (0-based) of its schedule"""
+    rate = portfolio.monthly_rate[loan]
+    emi = portfolio.emi[loan]
+    growth = (1 + rate) ** month
+    with np.errstate(divide="ignore", invalid="ignore"):
+        repaid = np.where(rate > 0, emi * (growth - 1) / rate, emi * month)
+    return np.maximum(portfolio.principal[loan] * growth - repaid, 0)
+
+
+def simulate_shard(portfolio: Portfolio, correlation: float, scenarios: int, seed) -> np.ndarray:
+    """Loss in paise of each of `scenarios` scenarios; runs in a pool process"""
+    rng = np.random.default_rng(seed)
+    losses = np.empty(scenarios, dtype=np.float64)
+    loans = portfolio.tenure.size
+    systemic = np.float32(math.sqrt(correlation))
+    scale = np.float32(1 / math.sqrt(1 - correlation))
+    step = max(1, CHUNK_DRAWS // loans)
+    for start in range(0, scenarios, step):
+        rows = min(step, scenarios - start)
+        z = rng.standard_normal(rows, dtype=np.float32)
+        bound = (portfolio.threshold - systemic * z[:, None]) * scale
+        scenario, loan = np.nonzero(rng.standard_normal((rows, loans), dtype=np.float32) < bound)
+        month = (rng.random(loan.size) * portfolio.tenure[loan]).astype(np.int64)
+        loss = _outstanding(portfolio, loan, month) * portfolio.loss_given_default[loan]
+        losses[start:start + rows] = np.bincount(scenario, weights=loss, minlength=rows)
+    return losses
+
+
+def shard_plan(scenarios: int, seed: int) -> List[Tuple[int, np.random.SeedSequence]]:
+    """Scenario count and seed of each shard; independent of the number of processes"""
+    size = max(SHARD_SCENARIOS, math.ceil(scenarios / MAX_SHARDS))
+    counts = [min(size, scenarios - start) for start in range(0, scenarios, size)]
+    return list(zip(counts, np.random.SeedSequence(seed).spawn(len(counts))))
+
+
+async def simulate(
+    portfolio: Portfolio,
+    correlation: float,
+    scenarios: int,
+    seed: int,
+    pool: Executor,
+    workers: int,
+    on_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> np.ndarray:
+    """
+    Loss of every scenario, in shard order. Keeps two shards per process in
+    flight so the pool stays busy without pickling every shard up front;
+    on_progress is awaited with the scenarios finished so far.
+    """
+    loop = asyncio.get_running_loop()
+    limit = asyncio.Semaphore(2 * workers)
+    done = 0
+
+    async def run_shard(count, shard_seed):
+        nonlocal done
+        async with limit:
+            losses = await loop.run_in_executor(pool, simulate_shard, portfolio, correlation, count, shard_seed)
+        done += count
+        if on_progress is not None:
+            await on_progress(done)
+        return losses
+
+    shards = await asyncio.gather(*(run_shard(count, shard_seed) for count, shard_seed in shard_plan(scenarios, seed)))
+    return np.concatenate(shards)
+
+
+def _paise(amount: float) -> Paise:
+    return Paise(int(round(float(amount))))
+
+
+def summarize(losses: np.ndarray, exposure: int) -> dict:
+    """Loss distribution of the scenario losses (paise)"""
+    ordered = np.sort(losses)
+    count = ordered.size
+    tail = []
+    for level in CONFIDENCE_LEVELS:
+        index = min(count - 1, max(0, math.ceil(level * count) - 1))
+        tail.append({
+            "confidence": level,
+            "value_at_risk": _paise(ordered[index]),
+            "expected_shortfall": _paise(ordered[index:].mean()),
+        })
+    frequency, edges = np.histogram(ordered, bins=HISTOGRAM_BINS, range=(0, max(float(ordered[-1]), 1.0)))
+    expected = float(ordered.mean())
+    return {
+        "exposure": Paise(exposure),
+        "expected_loss": _paise(expected),
+        "loss_std_dev": _paise(ordered.std()),
+        "expected_loss_rate": round(expected / exposure, 6) if exposure else None,
+        "max_loss": _paise(ordered[-1]),
+        "tail": tail,
+        "histogram": [
+            {"loss_from": _paise(low), "loss_to": _paise(high), "scenarios": int(scenarios)}
+            for low, high, scenarios in zip(edges[:-1], edges[1:], frequency)
+        ],
+    }
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class RiskSimulator:
+    """Runs simulations as background jobs on a process pool, tracked in a job store"""
+
+    def __init__(self, workers: int = 0, max_jobs: int = 1, max_queue: int = 4, jobs=None):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_jobs = max(1, max_jobs)
+        self.max_queue = max(0, max_queue)
+        self.jobs = jobs if jobs is not None else create_cache("memory", prefix="risk-job", max_size=1000, ttl_seconds=3600)
+        self._pool: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks = set()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_jobs)
+        return self._semaphore
+
+    async def submit(self, owner, portfolio: Portfolio, correlation: float, scenarios: int, seed: int) -> dict:
+        """Queue a simulation and return its job record"""
+        if len(self._tasks) >= self.max_jobs + self.max_queue:
+            self.rejected += 1
+            raise RiskSimulationBusy("Too many risk simulations queued")
+
+        job = {
+            "id": str(uuid.uuid4()),
+            "owner": str(owner),
+            "status": "queued",
+            "loans": int(portfolio.tenure.size),
+            "scenarios": scenarios,
+            "scenarios_done": 0,
+            "progress": 0.0,
+            "seed": seed,
+            "correlation": correlation,
+            "created_at": _now(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "result": None,
+        }
+        await self.jobs.set(job["id"], dict(job))
+        task = asyncio.create_task(self._run(job, portfolio))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return job
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        return await self.jobs.get(job_id)
+
+    async def _save(self, job: dict) -> None:
+        # Store a copy so the memory backend never hands out a record still being updated
+        await self.jobs.set(job["id"], dict(job))
+
+    async def _run(self, job: dict, portfolio: Portfolio) -> None:
+        async with self._get_semaphore():
+            job.update(status="running", started_at=_now())
+            await self._save(job)
+
+            async def report(done: int) -> None:
+                job.update(scenarios_done=done, progress=round(done / job["scenarios"], 4))
+                await self._save(job)
+
+            start = time.perf_counter()
+            try:
+                losses = await simulate(
+                    portfolio, job["correlation"], job["scenarios"], job["seed"],
+                    self._get_pool(), self.workers, on_progress=report
+                )
+                result = RiskSimulationResult(
+                    **summarize(losses, portfolio.exposure),
+                    elapsed_seconds=round(time.perf_counter() - start, 3),
+                    workers=self.workers,
+                )
+                job.update(status="completed", result=result.model_dump(mode="json"))
+                self.completed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                job.update(status="failed", error=str(exc) or type(exc).__name__)
+                self.failed += 1
+            job["finished_at"] = _now()
+            await self._save(job)
+
+    def stats(self) -> dict:
+        """Current job and pool statistics"""
+        running = 0
+        if self._semaphore is not None:
+            running = self.max_jobs - self._semaphore._value
+        return {
+            "workers": self.workers,
+            "max_jobs": self.max_jobs,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": len(self._tasks) - running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Cancel running jobs and stop the pool (called on application shutdown)"""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self._semaphore = None
+
+
+risk_simulator = RiskSimulator(
+    workers=settings.RISK_SIMULATION_WORKERS,
+    max_jobs=settings.RISK_SIMULATION_MAX_JOBS,
+    max_queue=settings.RISK_SIMULATION_MAX_QUEUE,
+    jobs=create_cache(
+        settings.RISK_SIMULATION_JOB_BACKEND,
+        prefix="risk-job",
+        max_size=1000,
+        ttl_seconds=settings.RISK_SIMULATION_JOB_TTL_SECONDS,
+    ),
+)
@@ -0,0 +1,277 @@
+"""
+In-memory inverted index over candidate skills
+
+Maps each normalized skill to the sorted array of dense candidate numbers
+(uint32) that list it, so boolean skill queries such as
+"Python AND Kafka OR Go" or "React AND NOT Angular" are answered with
+array intersections and unions instead of scanning and parsing every
+row's JSON.
+
+Every worker holds its own copy. It is rebuilt from the database in the
+background at startup, updated in place by the candidate profile
+handlers of the same worker, and caught up with other workers' writes
+every SKILLS_INDEX_REFRESH_SECONDS from the created_at/updated_at
+watermark. Until the first rebuild finishes, `ready` is False and
+callers fall back to SQL.
+"""
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.skills import normalize_skill, normalize_skills
+from app.core.database import replica_router
+from app.models import Candidate
+
+EMPTY = np.empty(0, dtype=np.uint32)
+
+_TOKEN = re.compile(r'\s*(\(|\)|"[^"]*"|\bAND\b|\bOR\b|\bNOT\b)\s*')
+
+
+class InvalidSkillsQuery(ValueError):
+    pass
+
+
+def parse_skills_query(query: str):
+    """
+    Parse a boolean skills query into a tree.
+
+    Operators are upper-case AND, OR and NOT (NOT binds tightest, then AND,
+    then OR) with parentheses for grouping. Skill names may contain spaces;
+    quote them if they contain a keyword. Nodes are ("skill", name),
+    ("not", node), ("and", [nodes]) and ("or", [nodes]).
+    """
+    tokens = [token for token in _TOKEN.split(query) if token and token.strip()]
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        nodes = [parse_and()]
+        while peek() == "OR":
+            take()
+            nodes.append(parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and():
+        nodes = [parse_not()]
+        while peek() == "AND":
+            take()
+            nodes.append(parse_not())
+        return nodes[0] if len(nodes) == 1 else ("and", nodes)
+
+    def parse_not():
+        token = peek()
+        if token is None:
+            raise InvalidSkillsQuery("Unexpected end of skills query")
+        if token == "NOT":
+            take()
+            return ("not", parse_not())
+        if token == "(":
+            take()
+            node = parse_or()
+            if peek() != ")":
+                raise InvalidSkillsQuery("Missing closing parenthesis in skills query")
+            take()
+            return node
+        if token in ("AND", "OR", ")"):
+            raise InvalidSkillsQuery(f"Unexpected '{token}' in skills query")
+        take()
+        name = token.strip().strip('"').strip()
+        if not name:
+            raise InvalidSkillsQuery("Empty skill in skills query")
+        return ("skill", name)
+
+    node = parse_or()
+    if peek() is not None:
+        raise InvalidSkillsQuery(f"Unexpected '{peek()}' in skills query")
+    return node
+
+
+class SkillsIndex:
+    """Skill -> sorted uint32 array of dense candidate numbers"""
+
+    def __init__(self):
+        self.ready = False
+        self.watermark: Optional[datetime] = None
+        self._dense: Dict[UUID, int] = {}
+        self._ids: List[UUID] = []
+        self._skills_of: List[Tuple[str, ...]] = []
+        self._postings: Dict[str, np.ndarray] = {}
+        # Incremental changes, merged into _postings when a skill is queried
+        self._added: Dict[str, Set[int]] = {}
+        self._removed: Dict[str, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def load(self, rows: Iterable[Tuple[UUID, Optional[list]]]) -> None:
+        """Replace the contents with (candidate_id, skills) rows"""
+        dense, ids, skills_of = {}, [], []
+        lists: Dict[str, list] = {}
+        for candidate_id, skills in rows:
+            number = len(ids)
+            dense[candidate_id] = number
+            ids.append(candidate_id)
+            normalized = tuple(normalize_skills(skills))
+            skills_of.append(normalized)
+            for skill in normalized:
+                lists.setdefault(skill, []).append(number)
+
+        self._dense, self._ids, self._skills_of = dense, ids, skills_of
+        # Numbers were handed out in increasing order, so each list is already sorted
+        self._postings = {skill: np.array(numbers, dtype=np.uint32) for skill, numbers in lists.items()}
+        self._added, self._removed = {}, {}
+
+    def upsert(self, candidate_id: UUID, skills: Optional[list]) -> int:
+        """Add a candidate or replace its skills; returns its dense number"""
+        normalized = tuple(normalize_skills(skills))
+        number = self._dense.get(candidate_id)
+        if number is None:
+            number = len(self._ids)
+            self._dense[candidate_id] = number
+            self._ids.append(candidate_id)
+            self._skills_of.append(())
+
+        old = set(self._skills_of[number])
+        new = set(normalized)
+        for skill in old - new:
+            self._added.get(skill, set()).discard(number)
+            self._removed.setdefault(skill, set()).add(number)
+        for skill in new - old:
+            self._removed.get(skill, set()).discard(number)
+            self._added.setdefault(skill, set()).add(number)
+        self._skills_of[number] = normalized
+        return number
+
+    def postings(self, skill: str) -> np.ndarray:
+        """Sorted dense numbers of candidates with skill"""
+        skill = normalize_skill(skill)
+        added = self._added.pop(skill, None)
+        removed = self._removed.pop(skill, None)
+        base = self._postings.get(skill, EMPTY)
+        if added or removed:
+            if removed:
+                base = np.setdiff1d(base, np.fromiter(removed, dtype=np.uint32), assume_unique=True)
+            if added:
+                base = np.union1d(base, np.fromiter(added, dtype=np.uint32)).astype(np.uint32)
+            if len(base):
+                self._postings[skill] = base
+            else:
+                self._postings.pop(skill, None)
+        return base
+
+    def evaluate(self, node) -> np.ndarray:
+        """Sorted dense numbers matching a parsed query"""
+        kind = node[0]
+        if kind == "skill":
+            return self.postings(node[1])
+        if kind == "not":
+            mask = np.ones(len(self._ids), dtype=bool)
+            mask[self.evaluate(node[1])] = False
+            return np.flatnonzero(mask).astype(np.uint32)
+
+        results = [self.evaluate(child) for child in node[1]]
+        if kind == "or":
+            mask = np.zeros(len(self._ids), dtype=bool)
+            for result in results:
+                mask[result] = True
+            return np.flatnonzero(mask).astype(np.uint32)
+
+        # AND: start from the shortest array; probe the others by binary search
+        # while it is small and through a bitmap once it is a sizeable share
+        results.sort(key=len)
+        result = results[0]
+        for other in results[1:]:
+            if not len(result) or not len(other):
+                return EMPTY
+            if len(result) * 32 > len(self._ids):
+                mask = np.zeros(len(self._ids), dtype=bool)
+                mask[other] = True
+                result = result[mask[result]]
+            else:
+                positions = np.minimum(np.searchsorted(other, result), len(other) - 1)
+                result = result[other[positions] == result]
+        return result
+
+    def search(self, query: str) -> np.ndarray:
+        return self.evaluate(parse_skills_query(query))
+
+    def candidate_ids(self, numbers: np.ndarray) -> List[UUID]:
+        ids = self._ids
+        return [ids[number] for number in numbers.tolist()]
+
+    def stats(self) -> dict:
+        postings_bytes = sum(array.nbytes for array in self._postings.values())
+        return {
+            "ready": self.ready,
+            "candidates": len(self._ids),
+            "skills": len(self._postings),
+            "postings_bytes": postings_bytes,
+            "pending_changes": sum(map(len, self._added.values())) + sum(map(len, self._removed.values())),
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+
+
+skills_index = SkillsIndex()
+
+_changed_at = func.coalesce(Candidate.updated_at, Candidate.created_at)
+
+
+async def rebuild_skills_index(index: SkillsIndex = skills_index) -> None:
+    """Load every candidate's skills from the database"""
+    started = datetime.now(timezone.utc)
+    async with replica_router.session_maker()() as session:
+        result = await session.stream(
+            select(Candidate.id, Candidate.skills).order_by(Candidate.created_at, Candidate.id)
+            .execution_options(yield_per=10000)
+        )
+        rows = []
+        async for partition in result.partitions():
+            rows.extend(partition)
+    index.load(rows)
+    index.watermark = started
+    index.ready = True
+
+
+async def refresh_skills_index(index: SkillsIndex = skills_index) -> int:
+    """Apply rows created or updated since the last watermark; returns how many"""
+    started = datetime.now(timezone.utc)
+    overlap = timedelta(seconds=settings.REFRESH_OVERLAP_SECONDS)
+    async with replica_router.session_maker()() as session:
+        result = await session.execute(
+            select(Candidate.id, Candidate.skills).where(_changed_at >= index.watermark - overlap)
+        )
+        rows = result.all()
+    for candidate_id, skills in rows:
+        index.upsert(candidate_id, skills)
+    index.watermark = started
+    return len(rows)
+
+
+async def run_skills_index() -> None:
+    """Background task started from the application lifespan"""
+    while not skills_index.ready:
+        try:
+            await rebuild_skills_index()
+            print(f"Skills index loaded: {len(skills_index)} candidates")
+        except Exception as e:
+            print(f"Skills index rebuild failed, searching skills in SQL until it succeeds: {e}")
+            await asyncio.sleep(settings.SKILLS_INDEX_REFRESH_SECONDS)
+    while True:
+        await asyncio.sleep(settings.SKILLS_INDEX_REFRESH_SECONDS)
+        try:
+            await refresh_skills_index()
+        except Exception as e:
+            print(f"Skills index refresh failed: {e}")
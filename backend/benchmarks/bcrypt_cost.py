@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+bcrypt cost factor vs. throughput and login latency
+
+For each cost it reports single-core hashes per second and the p50/p99
+latency of password verification when --concurrency logins arrive at once
+and are served by the password pool (PASSWORD_HASH_WORKERS threads), which
+is what a login request spends on bcrypt. Use it to pick BCRYPT_ROUNDS per
+environment.
+
+Usage:
+    python benchmarks/bcrypt_cost.py --costs 10 11 12 13 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from passlib.context import CryptContext  # noqa: E402
+
+from app.core.executor import PasswordExecutor  # noqa: E402
+from app.core.config import settings  # noqa: E402
+
+PASSWORD = "Benchmark123"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def hashes_per_second(context: CryptContext, seconds: float) -> float:
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        context.hash(PASSWORD)
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+async def login_latencies(context: CryptContext, hashed: str, concurrency: int, workers: int) -> list:
+    executor = PasswordExecutor(kind="thread", workers=workers, max_queue=concurrency)
+
+    async def login():
+        start = time.perf_counter()
+        await executor.run(context.verify, PASSWORD, hashed)
+        return (time.perf_counter() - start) * 1000
+
+    try:
+        return await asyncio.gather(*(login() for _ in range(concurrency)))
+    finally:
+        executor.shutdown()
+
+
+def main(args):
+    print(f"cores={os.cpu_count()} pool workers={args.workers} concurrent logins={args.concurrency}")
+    print(f"{'cost':>4}  {'hashes/s/core':>13}  {'login p50 ms':>12}  {'login p99 ms':>12}")
+    for cost in args.costs:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=cost)
+        rate = hashes_per_second(context, args.seconds)
+        hashed = context.hash(PASSWORD)
+        samples = asyncio.run(login_latencies(context, hashed, args.concurrency, args.workers))
+        print(f"{cost:>4}  {rate:>13.1f}  {statistics.median(samples):>12.1f}  {percentile(samples, 99):>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--costs", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Time spent measuring hash rate per cost")
+    main(parser.parse_args())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Candidate search latency at scale
+
+Optionally seeds --seed synthetic candidates straight into DATABASE_URL
+(users and candidate rows, in batches), then registers a company user and
+runs random filter combinations against GET /companies/candidates/search,
+following next_cursor for --pages pages each time. Reports p50/p95 per page
+depth, which should stay flat with keyset pagination (target p95 < 50 ms
+at 1M rows).
+
+Usage:
+    python benchmarks/candidate_search.py --seed 1000000
+    python benchmarks/candidate_search.py --base-url http://localhost:8000 --queries 500
+"""
+import argparse
+import asyncio
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+SKILLS = ["Python", "Java", "Go", "React", "SQL", "AWS", "Kubernetes", "Sales", "Excel", "Figma"]
+CITIES = ["Bengaluru", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Noida", "Gurugram"]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def seed(count: int, batch_size: int):
+    from sqlalchemy import insert
+
+    from app.core.database import engine
+    from app.models import Candidate, User, UserType
+
+    password_hash = "$2b$12$" + "x" * 53  # never logged in with
+    for offset in range(0, count, batch_size):
+        users, candidates = [], []
+        for i in range(offset, min(count, offset + batch_size)):
+            user_id = uuid.uuid4()
+            users.append({
+                "id": user_id, "email": f"seed-{i}-{user_id.hex[:6]}@90tozero.com",
+                "password_hash": password_hash, "user_type": UserType.CANDIDATE,
+                "is_verified": False, "is_active": True,
+            })
+            experience = round(random.uniform(0, 20), 1)
+            current_ctc = random.randrange(300_000, 5_000_000, 10_000)
+            candidates.append({
+                "id": uuid.uuid4(), "user_id": user_id, "full_name": f"Candidate {i}",
+                "phone": "9999999999", "city": random.choice(CITIES),
+                "skills": random.sample(SKILLS, random.randint(1, 4)),
+                "experience_years": experience,
+                "notice_period_days": random.choice([0, 15, 30, 60, 90]),
+                "current_ctc": current_ctc,
+                "expected_ctc": int(current_ctc * random.uniform(1.0, 1.5)),
+                "open_to_buyout": random.choice(["True", "False"]),
+            })
+        async with engine.begin() as conn:
+            await conn.execute(insert(User), users)
+            await conn.execute(insert(Candidate), candidates)
+        print(f"  seeded {offset + len(candidates)}/{count}", end="\r", flush=True)
+    print()
+    await engine.dispose()
+
+
+def random_filters() -> dict:
+    params = {}
+    if random.random() < 0.7:
+        params["skills"] = random.sample(SKILLS, random.randint(1, 2))
+    if random.random() < 0.5:
+        params["city"] = random.choice(CITIES)
+    if random.random() < 0.4:
+        params["min_experience"] = random.randint(0, 10)
+    if random.random() < 0.4:
+        params["max_notice_period_days"] = random.choice([30, 60, 90])
+    if random.random() < 0.3:
+        params["max_expected_ctc"] = random.randrange(1_000_000, 6_000_000, 500_000)
+    if random.random() < 0.2:
+        params["open_to_buyout"] = "true"
+    return params
+
+
+async def main(args):
+    if args.seed:
+        print(f"seeding {args.seed} candidates...")
+        await seed(args.seed, args.batch_size)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        response = await client.post("/api/v1/auth/register", json={
+            "email": f"bench-{uuid.uuid4().hex[:8]}@90tozero.com",
+            "password": "Bench12345",
+            "user_type": "company",
+        })
+        response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        by_page = [[] for _ in range(args.pages)]
+        for _ in range(args.queries):
+            params = {**random_filters(), "limit": args.limit}
+            for page in range(args.pages):
+                start = time.perf_counter()
+                response = await client.get("/api/v1/companies/candidates/search", params=params, headers=headers)
+                by_page[page].append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+                cursor = response.json()["next_cursor"]
+                if not cursor:
+                    break
+                params["cursor"] = cursor
+
+    print(f"search latency over {args.queries} queries (limit {args.limit}):")
+    for page, samples in enumerate(by_page, start=1):
+        if samples:
+            print(f"  page {page:2d}  n={len(samples):5d}  p50 {percentile(samples, 50):7.1f} ms  p95 {percentile(samples, 95):7.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--seed", type=int, default=0, help="Insert this many synthetic candidates first")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
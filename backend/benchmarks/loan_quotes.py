@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Loan offer quoting latency
+
+Loads --partners synthetic NBFC products into an OfferIndex, times
+quoting random buyout amounts (target under 1 ms per quote) and checks
+every offer's EMI against calculate_emi. Runs in-process; no database or
+server is needed.
+
+Usage:
+    python benchmarks/loan_quotes.py --partners 500 --quotes 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-0123456789")
+
+from app.core.money import Paise  # noqa: E402
+from app.services.loan_math import calculate_emi  # noqa: E402
+from app.services.loan_offers import OfferIndex  # noqa: E402
+
+
+def synthetic_partners(count: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(count):
+        low = rng.choice([None, 25_000, 50_000, 100_000, 200_000])
+        high = rng.choice([None, 500_000, 1_000_000, 2_500_000, 5_000_000])
+        yield SimpleNamespace(
+            id=uuid.uuid4(),
+            nbfc_name=f"Partner {i}",
+            interest_rate_min=Decimal(rng.randrange(900, 1800)) / 100,
+            interest_rate_max=Decimal("24"),
+            min_loan_amount=Paise.from_rupees(low) if low else None,
+            max_loan_amount=Paise.from_rupees(high) if high else None,
+            min_tenure_months=str(rng.choice([3, 6])),
+            max_tenure_months=str(rng.choice([12, 24, 36])),
+            is_active="yes",
+        )
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+def run(index: OfferIndex, amounts, salary: Paise):
+    samples, offers = [], 0
+    for amount, tenure in amounts:
+        start = time.perf_counter()
+        offers += len(index.quote(amount, tenure, salary))
+        samples.append((time.perf_counter() - start) * 1e6)
+    return samples, offers / len(amounts)
+
+
+def main(args):
+    index = OfferIndex()
+    start = time.perf_counter()
+    index.load(synthetic_partners(args.partners, args.seed))
+    print(f"{args.partners} partners: build {(time.perf_counter() - start) * 1000:.1f} ms, {index.stats()['slots']} slots")
+
+    rng = random.Random(args.seed)
+    amounts = [
+        (Paise.from_rupees(rng.randrange(10_000, 6_000_000, 500)), rng.choice([6, 12, 18, 24, 36]))
+        for _ in range(args.quotes)
+    ]
+    salary = Paise.from_rupees(120_000)
+    samples, offers = run(index, amounts, salary)
+    print(f"  quote p50 {percentile(samples, 0.5):7.1f} us  p95 {percentile(samples, 0.95):7.1f} us"
+          f"  p99 {percentile(samples, 0.99):7.1f} us  ({offers:.0f} offers per quote)")
+
+    mismatches = 0
+    for amount, tenure in amounts[:args.check]:
+        for offer in index.quote(amount, tenure):
+            expected = calculate_emi(amount.to_rupees(), offer["annual_interest_rate"], tenure)
+            mismatches += offer["emi"].to_rupees() != expected
+    print(f"parity: {mismatches} mismatched EMIs in {min(args.check, len(amounts))} quotes")
+    return 1 if mismatches else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--partners", type=int, default=500)
+    parser.add_argument("--quotes", type=int, default=20_000)
+    parser.add_argument("--check", type=int, default=1000, help="quotes to check against calculate_emi")
+    parser.add_argument("--seed", type=int, default=7)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Profile-read latency while a burst of logins hits the API
+
+Measures GET /auth/me p50/p99 on its own and again while N logins run
+concurrently. With bcrypt on the password pool the second number should
+stay close to the first instead of stalling behind the hashes.
+
+Logins are spread over --accounts users, but they all come from one IP, so
+start the server with the login throttle off or most of them are rejected
+with 429 before bcrypt runs (the run fails if any are).
+
+Usage (against a running server):
+    LOGIN_THROTTLE_BACKEND=none uvicorn app.main:app &
+    python benchmarks/login_storm.py --base-url http://localhost:8000 --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+
+import httpx
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def read_profile_loop(client, headers, stop: asyncio.Event, samples: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        response = await client.get("/api/v1/auth/me", headers=headers)
+        samples.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+
+
+async def measure_reads(client, headers, duration: float, readers: int) -> list:
+    samples = []
+    stop = asyncio.Event()
+    tasks = [
+        asyncio.create_task(read_profile_loop(client, headers, stop, samples))
+        for _ in range(readers)
+    ]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+    return samples
+
+
+async def main(args):
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"bench-{run_id}-{i}@90tozero.com" for i in range(args.accounts)]
+    password = "Bench12345"
+    limits = httpx.Limits(max_connections=args.logins + args.readers)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120) as client:
+        for email in emails:
+            response = await client.post("/api/v1/auth/register", json={
+                "email": email, "password": password, "user_type": "candidate"
+            })
+            response.raise_for_status()
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        baseline = await measure_reads(client, headers, args.duration, args.readers)
+
+        samples = []
+        stop = asyncio.Event()
+        readers = [
+            asyncio.create_task(read_profile_loop(client, headers, stop, samples))
+            for _ in range(args.readers)
+        ]
+        start = time.perf_counter()
+        logins = await asyncio.gather(*[
+            client.post("/api/v1/auth/login", json={"email": emails[i % len(emails)], "password": password})
+            for i in range(args.logins)
+        ])
+        login_elapsed = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*readers)
+
+    codes = {}
+    for login in logins:
+        codes[login.status_code] = codes.get(login.status_code, 0) + 1
+
+    print(f"Profile reads (idle):       n={len(baseline):5d}  "
+          f"p50={statistics.median(baseline):7.1f} ms  p99={percentile(baseline, 99):7.1f} ms")
+    print(f"Profile reads (under load): n={len(samples):5d}  "
+          f"p50={statistics.median(samples):7.1f} ms  p99={percentile(samples, 99):7.1f} ms")
+    print(f"{args.logins} concurrent logins finished in {login_elapsed:.2f}s, status codes: {codes}")
+    if codes.get(429):
+        print("Logins were throttled, so bcrypt did not run for all of them; "
+              "restart the server with LOGIN_THROTTLE_BACKEND=none")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--accounts", type=int, default=20, help="Users the logins are spread over")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=3.0, help="Idle baseline duration in seconds")
+    sys.exit(asyncio.run(main(parser.parse_args())))
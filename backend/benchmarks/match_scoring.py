@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Candidate-to-job match scoring latency
+
+Loads --candidates synthetic candidates into a MatchPool and times
+scoring a job against the whole pool plus top-k selection (target under
+100 ms for 500k candidates on one core), then the same after a burst of
+incremental updates. Runs in-process; no database or server is needed.
+
+Usage:
+    python benchmarks/match_scoring.py --candidates 500000 --k 50
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-0123456789")
+
+from app.schemas.candidate import JobMatchRequest  # noqa: E402
+from app.services.matching import MatchPool  # noqa: E402
+
+Row = namedtuple("Row", [
+    "id", "skills", "preferred_locations", "city", "experience_years",
+    "notice_period_days", "current_ctc", "expected_ctc",
+])
+
+SKILLS = [f"Skill {i}" for i in range(500)]
+CITIES = ["Bengaluru", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Noida", "Gurugram"]
+
+
+def synthetic_rows(count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    weights = 1 / np.arange(1, len(SKILLS) + 1)
+    weights /= weights.sum()
+    sizes = rng.integers(1, 9, size=count).tolist()
+    picks = rng.choice(len(SKILLS), size=sum(sizes), p=weights).tolist()
+    cities = rng.integers(0, len(CITIES), size=count).tolist()
+    experience = rng.uniform(0, 20, size=count).round(1).tolist()
+    notice = rng.choice([0, 15, 30, 60, 90], size=count).tolist()
+    ctc = rng.integers(300_000, 5_000_000, size=count).tolist()
+    offset = 0
+    for i, size in enumerate(sizes):
+        yield Row(
+            uuid.uuid4(), [SKILLS[pick] for pick in picks[offset:offset + size]],
+            [CITIES[(cities[i] + 1) % len(CITIES)]], CITIES[cities[i]], experience[i],
+            notice[i], ctc[i], int(ctc[i] * 1.2) if i % 3 else None,
+        )
+        offset += size
+
+
+def time_job(pool: MatchPool, job, k: int, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pool.top_k(job, k)
+        samples.append((time.perf_counter() - start) * 1000)
+    ordered = sorted(samples)
+    return statistics.median(samples), ordered[int(0.95 * (len(ordered) - 1))]
+
+
+def main(args):
+    print(f"loading {args.candidates} candidates...")
+    rows = list(synthetic_rows(args.candidates, args.seed))
+    pool = MatchPool()
+    start = time.perf_counter()
+    pool.load(rows)
+    print(f"  load time {time.perf_counter() - start:6.2f} s, features {pool.stats()['feature_bytes'] / 2**20:.1f} MiB")
+
+    jobs = {
+        "skills only": JobMatchRequest(skills=SKILLS[:3]),
+        "full profile": JobMatchRequest(
+            skills=[SKILLS[0], SKILLS[10], SKILLS[100]], min_ctc=800_000, max_ctc=2_000_000,
+            max_notice_period_days=30, min_experience=3, max_experience=8, city="Pune",
+        ),
+    }
+    print(f"score + top {args.k}:")
+    for label, job in jobs.items():
+        p50, p95 = time_job(pool, job, args.k, args.repeat)
+        print(f"  {label:14s} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms")
+
+    print(f"applying {args.updates} incremental updates...")
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        row = random.choice(rows)
+        pool.upsert(row._replace(skills=random.sample(SKILLS[:20], 3), notice_period_days=random.choice([0, 30, 60])))
+    print(f"  upsert {(time.perf_counter() - start) / args.updates * 1e6:7.1f} us each")
+    for label, job in jobs.items():
+        p50, p95 = time_job(pool, job, args.k, args.repeat)
+        print(f"  {label:14s} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=500_000)
+    parser.add_argument("--k", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
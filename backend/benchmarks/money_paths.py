@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Integer-paise money path timings
+
+Times the integer-paise calculators against the Decimal reference they
+replaced, over randomized salaries (a tenth of them exact half-paisa
+buyouts, which fall back to the reference) and loan terms:
+
+- calculate_buyout_paise and buyout_batch against calculate_buyout
+- calculate_emi_paise and emi_batch against calculate_emi
+
+tests/test_money.py checks that the paths agree to the paisa. Runs
+in-process; no database or server is needed.
+
+Usage:
+    python benchmarks/money_paths.py --cases 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-0123456789")
+
+import numpy as np  # noqa: E402
+
+from app.services.loan_math import (  # noqa: E402
+    buyout_batch,
+    calculate_buyout,
+    calculate_buyout_paise,
+    calculate_emi,
+    calculate_emi_paise,
+    emi_batch,
+    from_paise,
+)
+
+NOTICE_DAYS = [0, 1, 7, 15, 30, 45, 60, 75, 90, 180]
+TENURES = [3, 6, 12, 24, 36, 60]
+
+
+def timed(label: str, cases: int, func) -> None:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:28s} {elapsed * 1000:9.1f} ms  {cases / elapsed:12,.0f} cases/s")
+
+
+def time_buyouts(rng: random.Random, cases: int) -> None:
+    salaries = [rng.randrange(0, 10 ** 10) for _ in range(cases)]
+    # salary x days an odd multiple of 15 puts the buyout on an exact half paisa
+    salaries += [15 * (2 * rng.randrange(0, 10 ** 8) + 1) for _ in range(cases // 10)]
+    days = [rng.choice(NOTICE_DAYS) for _ in salaries]
+    salary_array, days_array = np.array(salaries), np.array(days)
+
+    timed("calculate_buyout_paise", len(salaries), lambda: [
+        calculate_buyout_paise(salary, day) for salary, day in zip(salaries, days)
+    ])
+    timed("buyout_batch", len(salaries), lambda: buyout_batch(salary_array, days_array))
+    timed("calculate_buyout (Decimal)", len(salaries), lambda: [
+        calculate_buyout(from_paise(salary), day) for salary, day in zip(salaries, days)
+    ])
+
+
+def time_emis(rng: random.Random, cases: int) -> None:
+    principals = [rng.randrange(0, 10 ** 9) for _ in range(cases)]
+    rate = Decimal("14.50")
+    months = rng.choice(TENURES)
+    principal_array = np.array(principals, dtype=np.int64)
+
+    timed("calculate_emi_paise", cases, lambda: [
+        calculate_emi_paise(principal, rate, months) for principal in principals
+    ])
+    timed("emi_batch", cases, lambda: emi_batch(principal_array, rate, months))
+    timed("calculate_emi (Decimal)", cases, lambda: [
+        calculate_emi(from_paise(principal), rate, months) for principal in principals
+    ])
+
+
+def main(args):
+    rng = random.Random(args.seed)
+    print("buyouts:")
+    time_buyouts(rng, args.cases)
+    print("EMIs:")
+    time_emis(rng, args.cases)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--cases", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
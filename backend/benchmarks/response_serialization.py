@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Response serialization CPU per profile GET
+
+Serves the company, candidate and NBFC profile responses through two
+otherwise identical FastAPI apps - one with FastAPI's stock APIRoute and
+JSONResponse, one with the FastJSONRoute and FastJSONResponse the routers
+use - and reports CPU time per request for a cache miss (handler validates
+an ORM row) and a cache hit (handler validates the cached dict). Requests
+go straight to the ASGI app, so the difference is the serialization
+pipeline. Also checks both apps send byte-identical bodies.
+
+Usage:
+    python benchmarks/response_serialization.py --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-0123456789")
+
+from fastapi import APIRouter, FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import APIRoute  # noqa: E402
+
+from app.core.money import Paise  # noqa: E402
+from app.core.responses import FastJSONResponse, FastJSONRoute  # noqa: E402
+from app.models import Candidate, Company, CompanySize, NBFCPartner  # noqa: E402
+from app.schemas import CandidateResponse, CompanyResponse, NBFCResponse  # noqa: E402
+
+NOW = datetime(2026, 10, 18, 9, 30, tzinfo=timezone.utc)
+
+ROWS = {
+    "company": (CompanyResponse, Company(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), company_name="Acme Technologies Pvt Ltd", industry="Software",
+        size=CompanySize.MEDIUM, website="https://acme.example", phone="02067000000", address="Baner Road",
+        city="Pune", state="Maharashtra", gstin="27AAACA1234A1Z5", cin="U72200PN2010PTC123456",
+        verified_at=NOW, created_at=NOW,
+    )),
+    "candidate": (CandidateResponse, Candidate(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), full_name="Asha Kulkarni", phone="9876543210",
+        current_company="Globex", current_designation="Senior Backend Engineer", current_ctc=Paise(24_00_000_00),
+        notice_period_days=90, experience_years=Decimal("6.5"), city="Bengaluru", state="Karnataka",
+        date_of_birth=date(1994, 3, 14), skills=["python", "fastapi", "postgresql", "redis", "aws", "kubernetes"],
+        highest_education="B.Tech", expected_ctc=Paise(32_00_000_00), preferred_locations=["Bengaluru", "Pune"],
+        kyc_verified_at=None, created_at=NOW,
+    )),
+    "nbfc": (NBFCResponse, NBFCPartner(
+        id=uuid.uuid4(), user_id=uuid.uuid4(), nbfc_name="Lakshmi Finance Ltd", license_number="N-14.03412",
+        website="https://lakshmi.example", contact_person="R. Iyer", phone="02240000000",
+        address="Nariman Point", city="Mumbai", state="Maharashtra", interest_rate_min=Decimal("10.50"),
+        interest_rate_max=Decimal("18.00"), max_loan_amount=Paise(5_00_000_00), min_loan_amount=Paise(25_000_00),
+        verified_at=NOW, is_active=True, created_at=NOW,
+    )),
+}
+
+
+def build_app(route_class, response_class) -> FastAPI:
+    """Profile GETs shaped like the real handlers, minus auth and the database"""
+    router = APIRouter(route_class=route_class)
+    for kind, (schema, row) in ROWS.items():
+        cached = schema.model_validate(row).model_dump(mode="json")
+
+        def add(kind=kind, schema=schema, row=row, cached=cached):
+            @router.get(f"/{kind}/miss", response_model=schema)
+            async def miss():
+                return schema.model_validate(row)
+
+            @router.get(f"/{kind}/hit", response_model=schema)
+            async def hit():
+                return schema.model_validate(cached)
+
+        add()
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(router)
+    return app
+
+
+async def request(app: FastAPI, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def cpu_per_request(app: FastAPI, path: str, count: int) -> float:
+    start = time.process_time()
+    for _ in range(count):
+        await request(app, path)
+    return (time.process_time() - start) / count * 1e6
+
+
+async def compare(stock: FastAPI, fast: FastAPI, path: str, count: int, rounds: int):
+    """Best CPU per request of each app over alternating rounds"""
+    await cpu_per_request(stock, path, 200)
+    await cpu_per_request(fast, path, 200)
+    before, after = [], []
+    for _ in range(rounds):
+        before.append(await cpu_per_request(stock, path, count // rounds))
+        after.append(await cpu_per_request(fast, path, count // rounds))
+    return min(before), min(after)
+
+
+async def main(args):
+    stock = build_app(APIRoute, JSONResponse)
+    fast = build_app(FastJSONRoute, FastJSONResponse)
+
+    mismatches = 0
+    print(f"{'profile GET':24s} {'stock us':>10s} {'fast us':>10s} {'saved us':>10s} {'saved':>7s}")
+    for kind in ROWS:
+        for case in ("miss", "hit"):
+            path = f"/{kind}/{case}"
+            if await request(stock, path) != await request(fast, path):
+                mismatches += 1
+            before, after = await compare(stock, fast, path, args.requests, args.rounds)
+            print(f"{kind + ' (' + case + ')':24s} {before:10.1f} {after:10.1f} {before - after:10.1f} "
+                  f"{(before - after) / before:7.1%}")
+    print(f"parity: {mismatches} responses differ between the two pipelines")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000, help="Per app and path, split over --rounds")
+    parser.add_argument("--rounds", type=int, default=5)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Memory footprint and query latency of the in-memory skills index
+
+Builds a SkillsIndex over --candidates synthetic candidates whose skills
+follow a Zipf-like popularity curve over --skills distinct skills, then
+times boolean queries of several shapes and a burst of incremental
+updates. Runs in-process; no database or server is needed.
+
+Usage:
+    python benchmarks/skills_index.py --candidates 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-only-secret-key-0123456789")
+
+from app.services.skills_index import SkillsIndex  # noqa: E402
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def synthetic_rows(count: int, skill_count: int, seed: int):
+    rng = np.random.default_rng(seed)
+    names = [f"Skill {i}" for i in range(skill_count)]
+    weights = 1 / np.arange(1, skill_count + 1)
+    weights /= weights.sum()
+    sizes = rng.integers(1, 9, size=count)
+    picks = rng.choice(skill_count, size=int(sizes.sum()), p=weights).tolist()
+    offset = 0
+    for size in sizes.tolist():
+        yield uuid.uuid4(), [names[pick] for pick in picks[offset:offset + size]]
+        offset += size
+
+
+def time_queries(index: SkillsIndex, queries, repeat: int):
+    for label, query in queries:
+        samples = []
+        matches = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            matches = len(index.search(query))
+            samples.append((time.perf_counter() - start) * 1000)
+        print(
+            f"  {label:28s} matches {matches:9d}  p50 {statistics.median(samples):7.2f} ms"
+            f"  p95 {percentile(samples, 95):7.2f} ms"
+        )
+
+
+def main(args):
+    print(f"building index over {args.candidates} candidates, {args.skills} skills...")
+    rows = list(synthetic_rows(args.candidates, args.skills, args.seed))
+
+    index = SkillsIndex()
+    tracemalloc.start()
+    start = time.perf_counter()
+    index.load(rows)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = index.stats()
+    print(f"  load time            {elapsed:8.2f} s")
+    print(f"  postings arrays      {stats['postings_bytes'] / 2**20:8.1f} MiB")
+    print(f"  total retained       {current / 2**20:8.1f} MiB (id map and per-candidate skill tuples included)")
+    print(f"  peak during load     {peak / 2**20:8.1f} MiB")
+
+    queries = [
+        ("popular", "Skill 0"),
+        ("rare", f"Skill {args.skills - 1}"),
+        ("popular AND popular", "Skill 0 AND Skill 1"),
+        ("popular AND rare", f"Skill 0 AND Skill {args.skills // 2}"),
+        ("(a AND b) OR c", "(Skill 2 AND Skill 3) OR Skill 4"),
+        ("a AND NOT b", "Skill 1 AND NOT Skill 0"),
+        ("three-way OR", "Skill 5 OR Skill 6 OR Skill 7"),
+    ]
+    print("query latency:")
+    time_queries(index, queries, args.repeat)
+
+    print(f"applying {args.updates} incremental updates...")
+    ids = [row[0] for row in rows]
+    names = [f"Skill {i}" for i in range(args.skills)]
+    start = time.perf_counter()
+    for _ in range(args.updates):
+        index.upsert(random.choice(ids), random.sample(names[:50], 3))
+    print(f"  upsert               {(time.perf_counter() - start) / args.updates * 1e6:8.1f} us each")
+    print("query latency with pending updates merged on first use:")
+    time_queries(index, queries[:4], args.repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--skills", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--updates", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=7)
+    main(parser.parse_args())
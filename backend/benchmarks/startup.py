@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Boot-to-first-request time for the API
+
+Starts uvicorn as a subprocess (using the current environment, so
+DATABASE_URL and friends must be set), polls GET /health until it answers
+200 and reports how long that took. Repeats for --runs cold starts.
+
+Usage:
+    python benchmarks/startup.py --runs 5 --workers 1
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def boot_once(port: int, workers: int, timeout: float) -> float:
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning",
+    ]
+    start = time.perf_counter()
+    process = subprocess.Popen(command, cwd=BACKEND_DIR, env=os.environ.copy())
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {process.returncode}")
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=0.5).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.TransportError:
+                pass
+            time.sleep(0.01)
+        raise TimeoutError(f"Server did not answer within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(args):
+    timings = [boot_once(args.port, args.workers, args.timeout) for _ in range(args.runs)]
+    print(f"boot to first request over {args.runs} runs ({args.workers} worker(s)):")
+    print(f"  min {min(timings) * 1000:8.1f} ms")
+    print(f"  p50 {statistics.median(timings) * 1000:8.1f} ms")
+    print(f"  max {max(timings) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60)
+    main(parser.parse_args())
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 """
-Database initialization and seeding script
-Run this to create tables and optionally add sample data
+Database migration and seeding script
+Run this to apply schema migrations and optionally add sample data
+
+    python init_db.py              # migrate, then ask about sample data
+    python init_db.py --no-seed    # migrate only (used by start.sh)
+    python init_db.py --seed       # migrate and create sample data
+    python init_db.py --status     # show current and latest schema revision
+    python init_db.py --rebuild-facets  # recount candidate facet counts
+    python init_db.py --rebuild-portfolio  # recompute NBFC portfolio rollups
 """
+import argparse
 import asyncio
 import sys
 from pathlib import Path
@@ -10,10 +18,13 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from app.core.database import init_db, async_session_maker
+from app.core.database import async_session_maker
+from app.core.migrations import current_revision, head_revision, upgrade_database
 from app.core.security import get_password_hash
 from app.models import User, Company, Candidate, NBFCPartner, UserType
 from app.models.company import CompanySize
+from app.services.candidate_facets import rebuild_facet_counts
+from app.services.portfolio_rollups import rebuild_portfolio_rollups
 
 
 async def create_sample_data():
@@ -284,24 +295,44 @@ async def create_sample_data():
             raise
 
 
-async def main():
-    """Main function to initialize database"""
+async def main(args):
+    """Main function to migrate the database"""
+    if args.status:
+        print(f"Current revision: {await current_revision()}")
+        print(f"Latest revision:  {head_revision()}")
+        return
+    
+    if args.rebuild_facets:
+        async with async_session_maker() as session:
+            rows = await rebuild_facet_counts(session)
+        print(f"✅ Rebuilt candidate facet counts ({rows} rows)")
+        return
+    
+    if args.rebuild_portfolio:
+        async with async_session_maker() as session:
+            rows = await rebuild_portfolio_rollups(session)
+        print(f"✅ Rebuilt NBFC portfolio rollups ({rows} rows)")
+        return
+    
     print("🗄️  Initializing 90toZero Database")
     print("=" * 50)
     
     try:
-        # Create all tables
-        print("\n📊 Creating database tables...")
-        await init_db()
-        print("✅ Database tables created successfully!")
+        # Apply schema migrations
+        print(f"\n📊 Migrating database schema ({await current_revision()} -> {head_revision()})...")
+        await upgrade_database()
+        print("✅ Database schema is up to date!")
         
-        # Ask if user wants sample data
-        print("\n❓ Do you want to create sample data for testing? (y/n): ", end="")
-        response = input().strip().lower()
+        if args.seed is None:
+            # Ask if user wants sample data
+            print("\n❓ Do you want to create sample data for testing? (y/n): ", end="")
+            args.seed = input().strip().lower() == 'y'
         
-        if response == 'y':
+        if args.seed:
             print("\n🌱 Creating sample data...")
             await create_sample_data()
+            async with async_session_maker() as session:
+                await rebuild_facet_counts(session)
         else:
             print("\n✅ Database initialized without sample data")
             
@@ -315,4 +346,12 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Apply database migrations and optionally seed sample data")
+    seed_group = parser.add_mutually_exclusive_group()
+    seed_group.add_argument("--seed", dest="seed", action="store_true", default=None, help="Create sample data without asking")
+    seed_group.add_argument("--no-seed", dest="seed", action="store_false", help="Only apply migrations")
+    parser.add_argument("--status", action="store_true", help="Show current and latest schema revision")
+    parser.add_argument("--rebuild-facets", action="store_true", help="Recount candidate facet counts from the candidates table")
+    parser.add_argument("--rebuild-portfolio", action="store_true", help="Recompute NBFC portfolio rollups from the loans and repayments tables")
+    parser.set_defaults(seed=None)
+    asyncio.run(main(parser.parse_args()))
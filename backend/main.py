@@ -1,11 +1,22 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import os
 
 from app.core.config import settings
-from app.core.database import init_db
-from app.api import auth, companies, candidates, nbfc, admin
+from app.core.database import replica_router
+from app.core.migrations import check_schema_version
+from app.core.executor import password_executor, PasswordHashQueueFull
+from app.core.responses import FastJSONResponse
+from app.core.sql_log import QueryRouteMiddleware
+from app.services.loan_offers import run_offer_index
+from app.services.matching import run_match_pool
+from app.services.portfolio_rollups import run_portfolio_rollups
+from app.services.risk_simulation import risk_simulator
+from app.services.skills_index import run_skills_index
+from app.api import auth, companies, candidates, loans, nbfc, admin
 
 
 @asynccontextmanager
@@ -13,17 +24,47 @@ async def lifespan(app: FastAPI):
     """Lifecycle events for the application"""
     # Startup
     print("Starting 90toZero API...")
-    await init_db()
-    print("Database initialized")
+    await check_schema_version()
+    print("Database schema is up to date")
+    health_task = None
+    if replica_router.engines:
+        health_task = asyncio.create_task(replica_router.run_health_checks())
+        print(f"Routing reads to {len(replica_router.engines)} replica(s)")
+    skills_task = None
+    if settings.SKILLS_INDEX_ENABLED:
+        skills_task = asyncio.create_task(run_skills_index())
+    match_task = None
+    if settings.MATCHING_ENABLED:
+        match_task = asyncio.create_task(run_match_pool())
+    offers_task = None
+    if settings.LOAN_QUOTES_ENABLED:
+        offers_task = asyncio.create_task(run_offer_index())
+    rollup_task = None
+    if settings.PORTFOLIO_ROLLUP_ENABLED:
+        rollup_task = asyncio.create_task(run_portfolio_rollups())
     yield
     # Shutdown
     print("Shutting down 90toZero API...")
+    password_executor.shutdown()
+    risk_simulator.shutdown()
+    if health_task is not None:
+        health_task.cancel()
+    if skills_task is not None:
+        skills_task.cancel()
+    if match_task is not None:
+        match_task.cancel()
+    if offers_task is not None:
+        offers_task.cancel()
+    if rollup_task is not None:
+        rollup_task.cancel()
+    await replica_router.dispose()
 
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -51,11 +92,25 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Attribute SQL timings in the slow-query log to the route that issued them
+app.add_middleware(QueryRouteMiddleware)
+
+@app.exception_handler(PasswordHashQueueFull)
+async def password_queue_full_handler(request: Request, exc: PasswordHashQueueFull):
+    """Shed load when the password hashing pool is saturated"""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(companies.router, prefix=settings.API_V1_STR)
 app.include_router(candidates.router, prefix=settings.API_V1_STR)
 app.include_router(nbfc.router, prefix=settings.API_V1_STR)
+app.include_router(loans.router, prefix=settings.API_V1_STR)
 app.include_router(admin.router, prefix=settings.API_V1_STR)
 
 
@@ -7,17 +7,10 @@ echo "Database URL: ${DATABASE_URL:0:20}..." # Show first 20 chars only for secu
 
 # Run database migrations
 echo "Running database migrations..."
-python -c "
-import asyncio
-from app.core.database import init_db
+python init_db.py --no-seed
 
-async def setup():
-    await init_db()
-    print('Database initialized successfully')
-
-asyncio.run(setup())
-"
-
-# Start the server
+# Start the server. Requests reach us only through Render's proxy, so take
+# the client IP (which keys the login throttle) from its X-Forwarded-For.
 echo "Starting FastAPI server..."
-exec python -m uvicorn main:app --host 0.0.0.0 --port $PORT --workers 1
\ No newline at end of file
+exec python -m uvicorn main:app --host 0.0.0.0 --port $PORT --workers 1 \
+    --proxy-headers --forwarded-allow-ips "${FORWARDED_ALLOW_IPS:-*}"
\ No newline at end of file
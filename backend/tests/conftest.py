@@ -0,0 +1,52 @@
+"""
+Shared test setup
+
+Settings get throwaway values before the app is imported, and database
+tests run against an in-memory SQLite database built from the models.
+Postgres is the production database; the postgresql UUID columns are
+stored as CHAR(32) here.
+"""
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite://")
+os.environ.setdefault("SECRET_KEY", "test-only-secret-key-0123456789")
+
+import pytest  # noqa: E402
+from sqlalchemy.dialects.postgresql import UUID  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.core.database import Base  # noqa: E402
+import app.models  # noqa: E402,F401  (register models on Base.metadata)
+
+
+@compiles(UUID, "sqlite")
+def _uuid_on_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a loop private to the test"""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def session_maker(run):
+    """Session factory over a fresh in-memory database with every table"""
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    run(create_tables())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    run(engine.dispose())
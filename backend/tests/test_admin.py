@@ -0,0 +1,22 @@
+"""Admin-only maintenance and stats endpoints"""
+import pytest
+from fastapi import HTTPException
+
+from app.api import admin
+from app.models import User, UserType
+
+ADMIN_ONLY = [
+    (admin.rebuild_candidate_facets, {"db": None}),
+    (admin.rebuild_nbfc_portfolio_rollups, {"db": None}),
+    (admin.get_cache_stats, {}),
+    (admin.get_throttle_stats, {}),
+    (admin.get_db_pool_stats, {}),
+]
+
+
+@pytest.mark.parametrize("endpoint, kwargs", ADMIN_ONLY, ids=lambda value: getattr(value, "__name__", ""))
+@pytest.mark.parametrize("user_type", [UserType.COMPANY, UserType.CANDIDATE, UserType.NBFC])
+def test_endpoint_requires_admin(run, endpoint, kwargs, user_type):
+    with pytest.raises(HTTPException) as excinfo:
+        run(endpoint(current_user=User(user_type=user_type), **kwargs))
+    assert excinfo.value.status_code == 403
@@ -0,0 +1,105 @@
+"""Memoized amortization schedules and the loan schedule endpoints"""
+import json
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.loans import get_portfolio_schedule, get_stored_loan_schedule
+from app.core.money import Paise
+from app.models import Candidate, Loan, NBFCPartner, User, UserType
+from app.schemas.loan import LoanPortfolioRequest
+from app.services import amortization
+from app.services.amortization import ScheduleCache, aggregate_schedules, amortization_schedule
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ScheduleCache(max_rows=100)
+    monkeypatch.setattr(amortization, "schedule_cache", cache)
+    return cache
+
+
+def test_cache_is_bounded_by_rows(cache):
+    for principal in range(1, 11):
+        list(amortization_schedule(Paise(principal * 100_000), Decimal("12"), 36))
+    assert cache.rows <= 100 and cache.stats()["size"] == 2
+
+    # Longer than the whole budget: served, never memoized
+    assert len(list(amortization_schedule(Paise(1_000_000), Decimal("12"), 360))) == 360
+    assert cache.rows == 72
+
+
+def test_memoized_schedule_is_replayed(cache):
+    first = list(amortization_schedule(Paise(5_000_000), Decimal("10.5"), 24))
+    assert list(amortization_schedule(Paise(5_000_000), Decimal("10.50"), 24)) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_portfolio_reuses_but_never_fills_the_memo(cache):
+    quote = (Paise(5_000_000), Decimal("10.5"), 24)
+    list(amortization_schedule(*quote))
+    loans = [quote] + [(Paise(principal), Decimal("11"), 12) for principal in range(100_000, 100_050)]
+
+    totals = list(aggregate_schedules(loans))
+    assert len(totals) == 24 and totals[0].active_loans == 51
+    assert cache.stats()["size"] == 1 and cache.hits == 1
+
+
+def portfolio(*loans):
+    return LoanPortfolioRequest(loans=[
+        {"principal": principal, "annual_interest_rate": rate, "tenure_months": months}
+        for principal, rate, months in loans
+    ])
+
+
+def test_portfolio_requires_nbfc_or_admin(run):
+    with pytest.raises(HTTPException) as excinfo:
+        run(get_portfolio_schedule(portfolio((100_000, "12", 12)), "ndjson", User(user_type=UserType.CANDIDATE)))
+    assert excinfo.value.status_code == 403
+
+
+def test_portfolio_work_is_capped_by_distinct_loans(run, monkeypatch):
+    monkeypatch.setattr("app.core.config.settings.LOAN_PORTFOLIO_MAX_MONTHS", 360)
+    nbfc = User(user_type=UserType.NBFC)
+
+    # 1,000 identical loans are one 360-month walk
+    run(get_portfolio_schedule(portfolio(*[(100_000, "12", 360)] * 1000), "ndjson", nbfc))
+    with pytest.raises(HTTPException) as excinfo:
+        run(get_portfolio_schedule(portfolio((100_000, "12", 360), (100_001, "12", 1)), "ndjson", nbfc))
+    assert excinfo.value.status_code == 413
+
+
+def test_stored_loan_schedule_is_visible_to_its_parties_only(run, session_maker):
+    users = {kind: User(email=f"{kind.value}@example.com", password_hash="x", user_type=kind) for kind in UserType}
+    stranger = User(email="other-nbfc@example.com", password_hash="x", user_type=UserType.NBFC)
+
+    async def setup():
+        async with session_maker() as db:
+            db.add_all([*users.values(), stranger])
+            await db.flush()
+            candidate = Candidate(user_id=users[UserType.CANDIDATE].id, full_name="A", phone="1")
+            nbfc = NBFCPartner(user_id=users[UserType.NBFC].id, nbfc_name="N", license_number="L1")
+            db.add_all([candidate, nbfc])
+            await db.flush()
+            loan = Loan(nbfc_id=nbfc.id, candidate_id=candidate.id, principal_amount=Paise(5_000_000),
+                        interest_rate=Decimal("10.5"), tenure_months=24)
+            db.add(loan)
+            await db.commit()
+            return loan.id
+
+    async def schedule(loan_id, user):
+        async with session_maker() as db:
+            response = await get_stored_loan_schedule(loan_id, "ndjson", user, db)
+            return [json.loads(line) async for chunk in response.body_iterator for line in chunk.splitlines()]
+
+    loan_id = run(setup())
+    expected = list(amortization_schedule(Paise(5_000_000), Decimal("10.5"), 24))
+    for kind in (UserType.CANDIDATE, UserType.NBFC, UserType.ADMIN):
+        rows = run(schedule(loan_id, users[kind]))
+        assert [row["closing_balance"] for row in rows] == [str(row.closing_balance) for row in expected]
+
+    for user in (stranger, users[UserType.COMPANY]):
+        with pytest.raises(HTTPException) as excinfo:
+            run(schedule(loan_id, user))
+        assert excinfo.value.status_code == 404
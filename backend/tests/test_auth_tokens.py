@@ -0,0 +1,119 @@
+"""Registration, access token revocation and principal resolution"""
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, update
+
+from app.api import auth
+from app.core import revocation
+from app.core.revocation import MemoryRevocations
+from app.core.security import create_access_token
+from app.models import User, UserType
+from app.schemas.user import UserCreate
+
+
+def test_revocations_are_never_evicted_early(run, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(revocation.time, "monotonic", lambda: now[0])
+    revocations = MemoryRevocations(ttl_seconds=1800)
+    for number in range(200_000):
+        revocations.set_nowait(f"user-{number}", number)
+    assert run(revocations.get("user-0")) == 0 and len(revocations) == 200_000
+
+    now[0] += 1800
+    assert run(revocations.get("user-0")) is None
+    revocations.set_nowait("user-0", 1)
+    assert len(revocations) == 1 and run(revocations.get("user-0")) == 1
+
+
+def test_revoking_again_extends_the_watermark(run, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(revocation.time, "monotonic", lambda: now[0])
+    revocations = MemoryRevocations(ttl_seconds=10)
+    revocations.set_nowait("user", 1)
+    now[0] = 5
+    revocations.set_nowait("user", 2)
+    now[0] = 12
+    revocations.set_nowait("other", 3)
+    assert run(revocations.get("user")) == 2
+
+
+@pytest.fixture
+def revocations(monkeypatch):
+    revocations = MemoryRevocations(ttl_seconds=1800)
+    monkeypatch.setattr(revocation, "token_revocations", revocations)
+    return revocations
+
+
+def test_changes_are_revoked_on_commit(run, session_maker, revocations):
+    users = [User(id=uuid.uuid4(), email=f"u{i}@example.com", password_hash="x", user_type=UserType.CANDIDATE)
+             for i in range(4)]
+    ids = [user.id for user in users]
+
+    async def scenario():
+        async with session_maker() as db:
+            db.add_all(users)
+            await db.commit()
+
+            users[0].is_active = False
+            await db.flush()
+            flushed = len(revocations)
+            await db.commit()
+
+            await db.execute(update(User).where(User.email.in_(["u1@example.com", "u2@example.com"]))
+                             .values(is_active=False))
+            await db.rollback()
+            rolled_back = len(revocations)
+
+            await db.execute(update(User).where(User.email == "u1@example.com").values(is_active=False))
+            await db.execute(delete(User).where(User.id == ids[3]))
+            await db.commit()
+        return flushed, rolled_back
+
+    assert run(scenario()) == (0, 1)
+    revoked = [run(revocations.get(str(user_id))) is not None for user_id in ids]
+    assert revoked == [True, True, False, True]
+
+
+def test_principal_without_claims_decodes_once(run, session_maker, monkeypatch):
+    user = User(id=uuid.uuid4(), email="a@example.com", password_hash="x", user_type=UserType.CANDIDATE)
+
+    async def create():
+        async with session_maker() as db:
+            db.add(user)
+            await db.commit()
+
+    run(create())
+    decodes = []
+    decode = auth.decode_token
+    monkeypatch.setattr(auth, "decode_token", lambda token: decodes.append(token) or decode(token))
+    token = create_access_token({"sub": str(user.id)})
+
+    async def resolve():
+        async with session_maker() as db:
+            return await auth.get_current_principal(token, db)
+
+    assert run(resolve()).id == user.id
+    assert decodes == [token]
+
+
+def test_duplicate_registration_skips_bcrypt(run, session_maker, monkeypatch):
+    hashed = []
+
+    async def fake_hash(password):
+        hashed.append(password)
+        return "hash:" + password
+
+    monkeypatch.setattr(auth, "get_password_hash_async", fake_hash)
+    user_data = UserCreate(email="new@example.com", password="Secret123", user_type=UserType.CANDIDATE)
+
+    async def register():
+        async with session_maker() as db:
+            return await auth.register(user_data, db)
+
+    assert run(register()).user.email == "new@example.com"
+    with pytest.raises(HTTPException) as excinfo:
+        run(register())
+    assert excinfo.value.status_code == 400
+    assert hashed == ["Secret123"]
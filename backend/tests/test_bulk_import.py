@@ -0,0 +1,46 @@
+"""Bulk user import"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+
+from app.api.admin import bulk_import_users
+from app.core.executor import PasswordHashQueueFull
+from app.models import User, UserType
+from app.services import bulk_import
+from app.services.bulk_import import import_users, parse_ndjson
+
+
+def ndjson(count: int) -> str:
+    return "\n".join(
+        f'{{"email": "user{i}@example.com", "password": "Secret123", "user_type": "candidate"}}'
+        for i in range(count)
+    )
+
+
+def test_queue_full_fails_only_that_batch(run, session_maker, monkeypatch):
+    calls = []
+
+    async def hash_or_shed(passwords):
+        calls.append(len(passwords))
+        if len(calls) == 2:
+            raise PasswordHashQueueFull("Too many concurrent password operations")
+        return [f"hash:{password}" for password in passwords]
+
+    monkeypatch.setattr(bulk_import, "get_password_hashes_async", hash_or_shed)
+
+    async def scenario():
+        async with session_maker() as db:
+            summary = await import_users(db, parse_ndjson(ndjson(5)), batch_size=2)
+            created = await db.scalar(select(func.count(User.id)))
+        return summary, created
+
+    summary, created = run(scenario())
+    assert calls == [2, 2, 1]
+    assert (summary["created"], summary["failed"], created) == (3, 2, 3)
+    assert [error["line"] for error in summary["errors"]] == [3, 4]
+
+
+def test_bulk_endpoint_requires_admin(run):
+    with pytest.raises(HTTPException) as excinfo:
+        run(bulk_import_users(request=None, current_user=User(user_type=UserType.COMPANY), db=None))
+    assert excinfo.value.status_code == 403
@@ -0,0 +1,49 @@
+"""MatchPool CTC scoring against the job's salary band"""
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.money import Paise
+from app.schemas import JobMatchRequest
+from app.services.matching import MATCH_WEIGHTS, MatchPool
+
+# Expected CTC in rupees per candidate
+CTCS = [5_00_000, 9_00_000, 10_00_000, 15_00_000, 20_00_000, 30_00_000, 40_00_000, None]
+
+
+@pytest.fixture
+def pool():
+    pool = MatchPool()
+    pool.load([
+        SimpleNamespace(
+            id=uuid.uuid4(), skills=[], preferred_locations=[], city=None, experience_years=None,
+            notice_period_days=None, current_ctc=None,
+            expected_ctc=Paise.from_rupees(ctc) if ctc is not None else None,
+        )
+        for ctc in CTCS
+    ])
+    return pool
+
+
+def ctc_scores(pool, **band):
+    """The CTC component of every candidate's score"""
+    rest = sum(weight for name, weight in MATCH_WEIGHTS.items() if name != "ctc")
+    scores = (pool.score(JobMatchRequest(**band)) - rest) / MATCH_WEIGHTS["ctc"]
+    return [round(float(score), 3) for score in scores]
+
+
+def test_band_penalizes_both_sides(pool):
+    assert ctc_scores(pool, min_ctc=10_00_000, max_ctc=20_00_000) == [0.5, 0.9, 1.0, 1.0, 1.0, 0.5, 0.0, 0.5]
+
+
+def test_min_ctc_alone_is_honoured(pool):
+    assert ctc_scores(pool, min_ctc=10_00_000) == [0.5, 0.9, 1.0, 1.0, 1.0, 1.0, 1.0, 0.5]
+
+
+def test_max_ctc_alone(pool):
+    assert ctc_scores(pool, max_ctc=20_00_000) == [1.0, 1.0, 1.0, 1.0, 1.0, 0.5, 0.0, 0.5]
+
+
+def test_no_band_scores_everyone_fully(pool):
+    assert ctc_scores(pool) == [1.0] * len(CTCS)
@@ -0,0 +1,51 @@
+"""Startup schema check"""
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core import migrations
+
+
+@pytest.fixture
+def use_engine(run, monkeypatch):
+    engines = []
+
+    def use(url: str, **kwargs):
+        engine = create_async_engine(url, **kwargs)
+        engines.append(engine)
+        monkeypatch.setattr(migrations, "engine", engine)
+        return engine
+
+    yield use
+    for engine in engines:
+        run(engine.dispose())
+
+
+def test_never_migrated_database_has_no_revision(run, use_engine):
+    use_engine("sqlite+aiosqlite://")
+    assert run(migrations.current_revision()) is None
+
+
+def test_stored_revision_is_returned(run, use_engine):
+    engine = use_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def stamp():
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+            await conn.execute(text("INSERT INTO alembic_version VALUES ('0006')"))
+
+    run(stamp())
+    assert run(migrations.current_revision()) == "0006"
+
+
+def test_other_database_errors_are_raised(run, use_engine):
+    engine = use_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def break_version_table():
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (revision VARCHAR(32))"))
+
+    run(break_version_table())
+    with pytest.raises(exc.DBAPIError):
+        run(migrations.current_revision())
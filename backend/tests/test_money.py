@@ -0,0 +1,248 @@
+"""
+Integer-paise money paths agree with the Decimal reference to the paisa
+
+Randomized (seeded) and adversarial cases: exact half-paisa buyouts, rupee
+amounts at the limits of a NUMERIC(12, 2) column, and the Money column and
+JSON round-trips. The same cases go through /calculate-buyout/batch, which
+must agree with /calculate-buyout row for row. benchmarks/money_paths.py
+times the same paths.
+"""
+import json
+import random
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import candidates
+from app.api.auth import get_current_principal
+from app.core.money import MAX_PAISE, Money, Paise, format_paise
+from app.core.responses import FastJSONResponse
+from app.models import User, UserType
+from app.schemas.candidate import BuyoutCalculationResponse
+from app.services.amortization import _amortize
+from app.services.loan_math import (
+    AFFORDABLE_EMI_RATIO,
+    DAYS_PER_MONTH,
+    buyout_batch,
+    calculate_buyout,
+    calculate_buyout_paise,
+    calculate_emi,
+    calculate_emi_paise,
+    emi_batch,
+    emi_rate_batch,
+    from_paise,
+    to_paise,
+)
+
+NOTICE_DAYS = [0, 1, 7, 15, 30, 45, 60, 75, 90, 180]
+TENURES = [1, 3, 6, 12, 24, 36, 60, 120, 240, 360]
+
+
+def salary_cases(rng: random.Random, count: int):
+    """(salary paise, notice days) pairs, a tenth of them exact half-paisa buyouts"""
+    salaries = [rng.randrange(0, 10 ** 10) for _ in range(count)]
+    # salary x days an odd multiple of 15 puts the buyout on an exact half paisa
+    ties = [(15 * (2 * rng.randrange(0, 10 ** 8) + 1), rng.choice([1, 7, 15, 45, 75])) for _ in range(count // 10)]
+    return [(salary, rng.choice(NOTICE_DAYS)) for salary in salaries] + ties
+
+
+def reference_buyout(salary: int, days: int):
+    buyout, daily = calculate_buyout(from_paise(salary), days)
+    return Paise.from_rupees(buyout), Paise.from_rupees(daily)
+
+
+def test_from_rupees_round_trips_every_amount():
+    rng = random.Random(1)
+    for paise in [0, 1, 99, 100, MAX_PAISE] + [rng.randrange(0, MAX_PAISE + 1) for _ in range(20000)]:
+        rupees = Decimal(paise).scaleb(-2)
+        inputs = [rupees, str(rupees)] + ([float(rupees)] if paise < 2 ** 50 else [])
+        for value in inputs:
+            assert Paise.from_rupees(value) == paise
+        assert Paise(paise).to_rupees() == rupees
+        assert str(Paise(paise)) == f"{rupees:.2f}"
+
+
+@pytest.mark.parametrize("value", [
+    "0.001", "1.005", "-0.01", "1e-3", str(Decimal(MAX_PAISE + 1).scaleb(-2)), "nan", "inf", "x", True,
+])
+def test_from_rupees_rejects_instead_of_rounding(value):
+    with pytest.raises(ValueError):
+        Paise.from_rupees(value)
+
+
+def test_buyouts_match_reference():
+    cases = salary_cases(random.Random(2), 20000)
+    assert sum((salary * days) % DAYS_PER_MONTH * 2 == DAYS_PER_MONTH for salary, days in cases) >= 2000
+
+    expected = [reference_buyout(salary, days) for salary, days in cases]
+    assert [calculate_buyout_paise(salary, days) for salary, days in cases] == expected
+
+    buyout, daily = buyout_batch(np.array([c[0] for c in cases]), np.array([c[1] for c in cases]))
+    assert list(zip(buyout.tolist(), daily.tolist())) == expected
+
+
+def test_emis_match_reference():
+    rng = random.Random(3)
+    cases = [
+        (rng.randrange(0, 10 ** 11), Decimal(rng.randrange(0, 36000)).scaleb(-rng.choice([1, 2, 3])),
+         rng.choice(TENURES))
+        for _ in range(5000)
+    ]
+    # The exact EMI is a hair over a half paisa; the reference's 28 digits round it down
+    cases.append((42541983500, Decimal("1098"), 120))
+    for principal, rate, months in cases:
+        assert calculate_emi_paise(principal, rate, months) == to_paise(
+            calculate_emi(from_paise(principal), rate, months)
+        )
+
+
+def test_emi_batches_match_reference():
+    rng = random.Random(4)
+    principals = np.array([rng.randrange(0, 10 ** 9) for _ in range(2000)], dtype=np.int64)
+    rates = [Decimal(rng.randrange(0, 3600)).scaleb(-2) for _ in range(50)] + [Decimal(0)]
+    for months in TENURES:
+        rate = rng.choice(rates)
+        assert emi_batch(principals, rate, months).tolist() == [
+            calculate_emi_paise(int(principal), rate, months) for principal in principals
+        ]
+        principal = int(principals[months])
+        assert emi_rate_batch(principal, rates, months).tolist() == [
+            calculate_emi_paise(principal, rate, months) for rate in rates
+        ]
+
+
+def reference_schedule(principal: Decimal, annual_rate: Decimal, months: int):
+    """The Decimal schedule the paise walk replaced"""
+    emi = calculate_emi(principal, annual_rate, months)
+    monthly_rate = annual_rate / Decimal(1200)
+    balance = principal
+    for month in range(1, months + 1):
+        interest = round(balance * monthly_rate, 2)
+        repaid = balance if month == months else min(emi - interest, balance)
+        closing = balance - repaid
+        yield month, balance, repaid + interest, repaid, interest, closing
+        balance = closing
+
+
+def test_schedules_match_reference():
+    rng = random.Random(5)
+    for _ in range(300):
+        principal = rng.randrange(0, 10 ** 9)
+        rate = Decimal(rng.randrange(0, 3600)).scaleb(-2)
+        months = rng.choice(TENURES[:8])
+        expected = [
+            (month, *(Paise.from_rupees(amount) for amount in amounts))
+            for month, *amounts in reference_schedule(from_paise(principal), rate, months)
+        ]
+        assert [tuple(row) for row in _amortize(Paise(principal), rate, months)] == expected
+
+
+def test_money_column_and_json_round_trip():
+    rng = random.Random(6)
+    column = Money()
+    for paise in [0, 1, MAX_PAISE] + [rng.randrange(0, MAX_PAISE + 1) for _ in range(2000)]:
+        paise = Paise(paise)
+        bound = column.process_bind_param(paise, None)
+        assert bound == paise.to_rupees()
+        loaded = column.process_result_value(bound, None)
+        assert loaded == paise and isinstance(loaded, Paise)
+
+        response = BuyoutCalculationResponse(
+            buyout_amount=paise, notice_period_days=30, monthly_salary=paise, daily_salary=paise
+        )
+        assert BuyoutCalculationResponse.model_validate_json(response.model_dump_json()) == response
+        assert json.loads(response.model_dump_json())["buyout_amount"] == str(paise)
+
+
+def test_money_column_passes_rupees_through():
+    column = Money()
+    assert column.process_bind_param(Decimal("12.50"), None) == Decimal("12.50")
+    assert column.process_bind_param(None, None) is None
+    assert column.process_result_value(None, None) is None
+
+
+def test_paise_arithmetic_stays_paise():
+    a, b = Paise(150), Paise(250)
+    for amount in (a + b, b - a, a - b, a + 1, 1 + a, sum([a, b]), a * 3, 3 * a, b // 2, b % a, -a, abs(-a)):
+        assert type(amount) is Paise
+    assert Money().process_bind_param(a + b, None) == Decimal("4.00")
+    # Not amounts of money
+    assert type(a * b) is int and type(b // a) is int
+    assert a / 2 == 75.0 and a * Decimal("1.5") == Decimal("225.0")
+
+
+@pytest.fixture(scope="module")
+def app():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.include_router(candidates.router)
+    app.dependency_overrides[get_current_principal] = lambda: User(user_type=UserType.COMPANY)
+    return app
+
+
+@pytest.fixture(scope="module")
+def client(app):
+    with TestClient(app) as client:
+        yield client
+
+
+def boundary_cases():
+    """Salary and notice extremes: zero, one paisa, the column maximum, 0 and 365 days"""
+    return [(salary, days) for salary in (0, 1, 29, 31, MAX_PAISE) for days in (0, 1, 364, 365)]
+
+
+@pytest.mark.parametrize("rate, tenures", [
+    (Decimal("12"), [6, 12, 18, 24, 36]),
+    # At 0% an odd buyout over an even tenure is an exact half-paisa EMI
+    (Decimal("0"), [2, 4, 6, 10]),
+    (Decimal("100"), [1, 360]),
+])
+def test_batch_endpoint_matches_single_endpoint(client, rate, tenures):
+    cases = boundary_cases() + salary_cases(random.Random(7), 300)
+    response = client.post("/candidates/calculate-buyout/batch", json={
+        "rows": [
+            {"ref": str(index), "current_monthly_salary": str(from_paise(salary)), "notice_period_days": days}
+            for index, (salary, days) in enumerate(cases)
+        ],
+        "tenures": tenures,
+        "annual_interest_rate": str(rate),
+    })
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["ref"] for line in lines] == [str(index) for index in range(len(cases))]
+
+    half_paisa_emis = 0
+    for (salary, days), line in zip(cases, lines):
+        single = client.post("/candidates/calculate-buyout", json={
+            "current_monthly_salary": str(from_paise(salary)), "notice_period_days": days
+        })
+        assert single.status_code == 200
+        assert {key: line[key] for key in single.json()} == single.json()
+
+        # Buyouts of top salaries exceed what a Money column holds, so no Paise.from_rupees
+        buyout = to_paise(Decimal(line["buyout_amount"]))
+        for months, option in zip(tenures, line["emi_options"]):
+            emi = calculate_emi_paise(buyout, rate, months)
+            half_paisa_emis += rate == 0 and buyout % months * 2 == months
+            assert option["tenure_months"] == months
+            assert to_paise(Decimal(option["emi"])) == emi
+            # Negative at 0% when the EMI rounds down
+            assert option["total_interest"] == format_paise(emi * months - buyout)
+            if salary:
+                assert option["emi_to_salary"] == round(emi / salary, 4)
+                assert option["affordable"] == (emi / salary < AFFORDABLE_EMI_RATIO)
+            else:
+                assert option["emi_to_salary"] is None and option["affordable"] is False
+    assert rate != 0 or half_paisa_emis
+
+
+def test_batch_endpoint_is_for_companies_and_admins(app, client, monkeypatch):
+    monkeypatch.setitem(app.dependency_overrides, get_current_principal, lambda: User(user_type=UserType.CANDIDATE))
+    response = client.post("/candidates/calculate-buyout/batch", json={
+        "rows": [{"ref": "0", "current_monthly_salary": "50000", "notice_period_days": 30}],
+        "tenures": [12],
+        "annual_interest_rate": "12",
+    })
+    assert response.status_code == 403
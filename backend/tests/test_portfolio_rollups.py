@@ -0,0 +1,51 @@
+"""NBFC portfolio analytics from daily rollups"""
+from datetime import date
+from decimal import Decimal
+
+from app.core.money import Paise
+from app.models import Candidate, Loan, LoanRepayment, NBFCPartner, User, UserType
+from app.services.portfolio_rollups import get_portfolio_analytics, rebuild_portfolio_rollups
+
+
+def test_outstanding_principal_nets_repayments_of_the_same_loans(run, session_maker):
+    async def scenario():
+        async with session_maker() as db:
+            borrower = User(email="c@example.com", password_hash="x", user_type=UserType.CANDIDATE)
+            lender = User(email="n@example.com", password_hash="x", user_type=UserType.NBFC)
+            db.add_all([borrower, lender])
+            await db.flush()
+            candidate = Candidate(user_id=borrower.id, full_name="A", phone="1")
+            nbfc = NBFCPartner(user_id=lender.id, nbfc_name="N", license_number="L1")
+            db.add_all([candidate, nbfc])
+            await db.flush()
+
+            def loan(principal, disbursed):
+                return Loan(nbfc_id=nbfc.id, candidate_id=candidate.id, principal_amount=Paise(principal),
+                            interest_rate=Decimal("12"), tenure_months=12, status="active",
+                            disbursement_date=disbursed)
+
+            january, march = loan(1_000_000, date(2026, 1, 10)), loan(500_000, date(2026, 3, 10))
+            db.add_all([january, march])
+            await db.flush()
+            # One EMI of each loan, both due after January: 90,000 and 40,000 paise of principal
+            db.add_all([
+                LoanRepayment(loan_id=january.id, emi_number=1, due_date=date(2026, 4, 10),
+                              amount_due=Paise(100_000), interest_due=Paise(10_000),
+                              amount_paid=Paise(100_000), status="paid"),
+                LoanRepayment(loan_id=march.id, emi_number=1, due_date=date(2026, 1, 20),
+                              amount_due=Paise(45_000), interest_due=Paise(5_000),
+                              amount_paid=Paise(45_000), status="paid"),
+            ])
+            await db.commit()
+
+            await rebuild_portfolio_rollups(db)
+            january_only = await get_portfolio_analytics(
+                db, nbfc.id, date(2026, 1, 1), date(2026, 1, 31), today=date(2026, 6, 1)
+            )
+            everything = await get_portfolio_analytics(db, nbfc.id, today=date(2026, 6, 1))
+            return january_only, everything
+
+    january_only, everything = run(scenario())
+    assert january_only["principal_disbursed"] == 1_000_000
+    assert january_only["outstanding_principal"] == 1_000_000 - 90_000
+    assert everything["outstanding_principal"] == 1_500_000 - 90_000 - 40_000
@@ -0,0 +1,68 @@
+"""Principal cache entries are dropped when the change commits, not at flush"""
+import uuid
+
+import pytest
+from sqlalchemy import update
+
+from app.core import principal_cache as cache_module
+from app.core.principal_cache import cache_user, get_cached_user
+from app.models import User, UserType
+
+
+@pytest.fixture
+def users(run, session_maker):
+    """Two committed, cached users"""
+    async def create():
+        async with session_maker() as db:
+            rows = [
+                User(id=uuid.uuid4(), email=f"user{i}@example.com", password_hash="x", user_type=UserType.CANDIDATE)
+                for i in range(2)
+            ]
+            db.add_all(rows)
+            await db.commit()
+        for user in rows:
+            await cache_user(user)
+        return [user.id for user in rows]
+
+    assert cache_module.principal_cache is not None
+    return run(create())
+
+
+def cached(run, user_id) -> bool:
+    return run(get_cached_user(user_id)) is not None
+
+
+def test_deactivation_drops_entry_on_commit(run, session_maker, users):
+    async def deactivate():
+        async with session_maker() as db:
+            user = await db.get(User, users[0])
+            user.is_active = False
+            await db.flush()
+            flushed = await get_cached_user(users[0])
+            await db.commit()
+        return flushed
+
+    assert run(deactivate()) is not None
+    assert not cached(run, users[0]) and cached(run, users[1])
+
+
+def test_rollback_keeps_entry(run, session_maker, users):
+    async def deactivate_then_roll_back():
+        async with session_maker() as db:
+            user = await db.get(User, users[0])
+            user.user_type = UserType.COMPANY
+            await db.flush()
+            await db.rollback()
+
+    run(deactivate_then_roll_back())
+    assert cached(run, users[0])
+
+
+def test_bulk_update_empties_cache_on_commit(run, session_maker, users):
+    async def bulk_deactivate():
+        async with session_maker() as db:
+            await db.execute(update(User).where(User.id == users[1]).values(is_active=False))
+            await db.commit()
+
+    run(bulk_deactivate())
+    assert not cached(run, users[0]) and not cached(run, users[1])
@@ -0,0 +1,104 @@
+"""The SQL and in-memory skills index paths of a skills search must agree"""
+import uuid
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.models import Candidate
+from app.services import candidate_search
+from app.services.candidate_search import build_search_query, skills_query_filter
+from app.services.skills_index import SkillsIndex
+
+SKILLS = [
+    ["Python", "Kafka"],
+    ["python ", "Go"],
+    ["  PYTHON  ", "react"],
+    None,
+    [],
+    ["React", "Angular"],
+    ["Machine   Learning", "python"],
+    ["GO", "kafka", "KAFKA"],
+]
+
+QUERIES = [
+    "python",
+    "PYTHON",
+    "Python AND kafka",
+    "NOT python",
+    "NOT Python AND NOT react",
+    "react AND NOT angular",
+    "go OR Kafka",
+    "machine learning",
+    '"Machine Learning" OR NOT (python OR react)',
+    "rust",
+    "NOT rust",
+]
+
+
+@pytest.fixture
+def candidates(run, session_maker):
+    rows = [
+        {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "full_name": f"Candidate {n}", "phone": "9999999999",
+         "skills": skills}
+        for n, skills in enumerate(SKILLS)
+    ]
+
+    async def seed():
+        async with session_maker() as session:
+            await session.execute(insert(Candidate), rows)
+            await session.commit()
+
+    run(seed())
+    index = SkillsIndex()
+    index.load((row["id"], row["skills"]) for row in rows)
+    index.ready = True
+    return index
+
+
+def _matching_ids(run, session_maker, clause):
+    async def query():
+        async with session_maker() as session:
+            return set((await session.execute(select(Candidate.id).where(clause))).scalars())
+
+    return run(query())
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_index_and_sql_paths_agree(run, session_maker, candidates, monkeypatch, query):
+    monkeypatch.setattr(candidate_search, "skills_index", candidates)
+    monkeypatch.setattr(settings, "SKILLS_INDEX_ENABLED", True)
+
+    monkeypatch.setattr(settings, "SKILLS_INDEX_MAX_IDS", len(SKILLS))
+    from_index = _matching_ids(run, session_maker, skills_query_filter("sqlite", query))
+    monkeypatch.setattr(settings, "SKILLS_INDEX_MAX_IDS", -1)
+    from_sql = _matching_ids(run, session_maker, skills_query_filter("sqlite", query))
+
+    assert from_index == from_sql
+
+
+def test_not_includes_candidates_without_skills(run, session_maker, candidates, monkeypatch):
+    monkeypatch.setattr(settings, "SKILLS_INDEX_ENABLED", False)
+    names = _matching_ids(run, session_maker, skills_query_filter("sqlite", "NOT python"))
+    assert len(names) == 4  # None, [], React/Angular and the Go/Kafka candidate
+
+
+def test_skills_list_filter_is_normalized(run, session_maker, candidates):
+    async def search():
+        async with session_maker() as session:
+            result = await session.execute(build_search_query("sqlite", skills=["PYTHON", " kafka"]))
+            return [row.full_name for row in result]
+
+    assert run(search()) == ["Candidate 0"]
+
+
+def test_orm_insert_fills_normalized_skills(run, session_maker):
+    async def create():
+        async with session_maker() as session:
+            candidate = Candidate(user_id=uuid.uuid4(), full_name="New", phone="9999999999",
+                                  skills=["Data  Science", "SQL", "sql"])
+            session.add(candidate)
+            await session.commit()
+            return candidate.skills_normalized
+
+    assert run(create()) == ["data science", "sql"]
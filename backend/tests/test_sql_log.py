@@ -0,0 +1,48 @@
+"""Sampled SQL traces reach a handler without any logging setup"""
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import sql_log
+from app.core.config import settings
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def unconfigured_logger(monkeypatch):
+    """sql_log.logger and the root logger without handlers; level and propagate restored after"""
+    logger = sql_log.logger
+    level, propagate = logger.level, logger.propagate
+    monkeypatch.setattr(logger, "handlers", [])
+    monkeypatch.setattr(logging.getLogger(), "handlers", [])
+    yield logger
+    logger.setLevel(level)
+    logger.propagate = propagate
+
+
+def test_sampled_traces_are_emitted(run, monkeypatch, unconfigured_logger):
+    monkeypatch.setattr(settings, "SQL_TRACE_SAMPLE_RATE", 1.0)
+    engine = create_async_engine("sqlite+aiosqlite://")
+    sql_log.install_query_logging(engine)
+    assert sql_log.logger.isEnabledFor(logging.INFO) and sql_log.logger.handlers
+
+    collect = Collect()
+    sql_log.logger.addHandler(collect)
+
+    async def query():
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT :value"), {"value": 1})
+        await engine.dispose()
+
+    run(query())
+    assert any(message.startswith("sql trace") and "params=1" in message for message in collect.messages)
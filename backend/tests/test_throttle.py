@@ -0,0 +1,34 @@
+"""Login throttle buckets"""
+from app.core.throttle import LoginThrottle, MemoryTokenBucket
+
+
+def make_throttle():
+    return LoginThrottle(MemoryTokenBucket(30, 0.5), MemoryTokenBucket(5, 5 / 60), MemoryTokenBucket(50, 20 / 60))
+
+
+def test_guessing_one_account_is_throttled(run):
+    throttle = make_throttle()
+    waits = [run(throttle.check("203.0.113.9", "Victim@example.com")) for _ in range(6)]
+    assert waits[:5] == [0.0] * 5 and waits[5] > 0
+    assert throttle.stats()["throttled_email"] == 1
+
+
+def test_attacker_cannot_lock_out_the_owner(run):
+    throttle = make_throttle()
+    for _ in range(20):
+        run(throttle.check("203.0.113.9", "victim@example.com"))
+    assert run(throttle.check("198.51.100.4", "victim@example.com")) == 0.0
+
+
+def test_account_bucket_caps_attempts_from_every_ip(run):
+    throttle = make_throttle()
+    waits = [run(throttle.check(f"203.0.113.{i}", "victim@example.com")) for i in range(51)]
+    assert waits[:50] == [0.0] * 50 and waits[50] > 0
+    assert throttle.stats()["throttled_account"] == 1
+
+
+def test_ip_bucket_spans_emails(run):
+    throttle = make_throttle()
+    waits = [run(throttle.check("203.0.113.9", f"user{i}@example.com")) for i in range(31)]
+    assert waits[:30] == [0.0] * 30 and waits[30] > 0
+    assert throttle.stats()["throttled_ip"] == 1